@@ -57,7 +57,7 @@ def _set_random_seed(config):
     return config
 
 
-def optimize(config, X, Y, X_busy=None, random=True, batch_size=None):
+def optimize(config, X, Y, X_busy=None, random=True, batch_size=None, C=None):
     '''
     Optimize on existing designs and performance to propose next designs to evaluate.
 
@@ -73,6 +73,10 @@ def optimize(config, X, Y, X_busy=None, random=True, batch_size=None):
         Designs under evaluation.
     random: bool
         Whether to set random seeds before optimization.
+    batch_size: int
+        Number of designs to propose (if None then use the batch size in config).
+    C: np.array
+        Evaluation costs (in seconds) of the given designs, used by cost-aware selection.
 
     Returns
     -------
@@ -88,7 +92,7 @@ def optimize(config, X, Y, X_busy=None, random=True, batch_size=None):
     # solve for best X_next
     if batch_size is None:
         batch_size = config['experiment']['batch_size']
-    X_next = optimizer.optimize(X, Y, X_busy, batch_size)
+    X_next = optimizer.optimize(X, Y, X_busy, batch_size, C)
 
     return X_next
 
@@ -124,7 +128,7 @@ def predict(config, X, Y, X_next):
     return Y_next_mean, Y_next_std
 
 
-def optimize_predict(config, X, Y, X_busy=None, random=True, batch_size=None):
+def optimize_predict(config, X, Y, X_busy=None, random=True, batch_size=None, C=None):
     '''
     Optimize on existing designs and performance to propose next designs to evaluate along with the predicted performance.
 
@@ -140,6 +144,10 @@ def optimize_predict(config, X, Y, X_busy=None, random=True, batch_size=None):
         Designs under evaluation.
     random: bool
         Whether to set random seeds before optimization.
+    batch_size: int
+        Number of designs to propose (if None then use the batch size in config).
+    C: np.array
+        Evaluation costs (in seconds) of the given designs, used by cost-aware selection.
 
     Returns
     -------
@@ -157,7 +165,7 @@ def optimize_predict(config, X, Y, X_busy=None, random=True, batch_size=None):
     # solve for best X_next
     if batch_size is None:
         batch_size = config['experiment']['batch_size']
-    X_next = optimizer.optimize(X, Y, X_busy, batch_size)
+    X_next = optimizer.optimize(X, Y, X_busy, batch_size, C)
 
     # predict performance of X_next
     Y_next_mean, Y_next_std = optimizer.predict(X, Y, X_next)
@@ -165,7 +173,7 @@ def optimize_predict(config, X, Y, X_busy=None, random=True, batch_size=None):
     return X_next, (Y_next_mean, Y_next_std)
 
 
-def evaluate(name, x_next):
+def evaluate(name, x_next, problem=None):
     '''
     Evaluate performance of a given design.
 
@@ -175,6 +183,8 @@ def evaluate(name, x_next):
         Name of the problem.
     x_next: np.array
         Design to be evaluated.
+    problem: autooed.problem.Problem
+        Pre-built problem (if None then build the problem from name).
 
     Returns
     -------
@@ -182,9 +192,38 @@ def evaluate(name, x_next):
         Performance of the given design.
     '''
     # build problem
-    problem = build_problem(name)
+    if problem is None:
+        problem = build_problem(name)
 
     # evaluate x_next with real problem
     y_next = np.array(problem.evaluate_objective(x_next))
 
     return y_next
+
+
+def evaluate_batch(name, X_next, problem=None):
+    '''
+    Evaluate performance of a batch of designs.
+
+    Parameters
+    ----------
+    name: str
+        Name of the problem.
+    X_next: np.array
+        Designs to be evaluated.
+    problem: autooed.problem.Problem
+        Pre-built problem (if None then build the problem from name).
+
+    Returns
+    -------
+    Y_next: np.array
+        Performance of the given designs.
+    '''
+    # build problem
+    if problem is None:
+        problem = build_problem(name)
+
+    # evaluate X_next with real problem
+    Y_next = np.array(problem.evaluate_objective_batch(X_next))
+
+    return Y_next
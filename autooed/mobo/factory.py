@@ -76,6 +76,7 @@ def get_selection(name):
     selection_map = {
         'direct': Direct,
         'hvi': HypervolumeImprovement,
+        'hvi_cost': CostAwareHypervolumeImprovement,
         'random': Random,
         'uncertainty': Uncertainty,
     }
@@ -58,11 +58,13 @@ solver_hyperparams = {
         '__name__': 'NSGA-II',
         'n_gen': dict(dtype=int, default=200, constr=lambda x: x > 0),
         'pop_size': dict(dtype=int, default=200, constr=lambda x: x > 0),
+        'warm_start': dict(dtype=bool, default=False),
     },
     'moead': {
         '__name__': 'MOEA/D',
         'n_gen': dict(dtype=int, default=100, constr=lambda x: x > 0),
         'pop_size': dict(type=int, default=100, constr=lambda x: x > 0),
+        'warm_start': dict(dtype=bool, default=False),
     },
     'parego': {
         '__name__': 'ParEGO',
@@ -73,6 +75,8 @@ solver_hyperparams = {
         'n_gen': dict(dtype=int, default=10, constr=lambda x: x > 0),
         'pop_size': dict(dtype=int, default=100, constr=lambda x: x > 0),
         'n_process': dict(dtype=int, default=cpu_count(), constr=lambda x: x > 0),
+        'hessian': dict(dtype=str, default='exact', choices=['exact', 'hvp']),
+        'warm_start': dict(dtype=bool, default=False),
     },
     # single-objective
     'ga': {
@@ -95,6 +99,9 @@ selection_hyperparams = {
     'hvi': {
         '__name__': 'Hypervolume Improvement',
     },
+    'hvi_cost': {
+        '__name__': 'Cost-Aware Hypervolume Improvement',
+    },
     'uncertainty': {
         '__name__': 'Uncertainty',
     },
@@ -67,7 +67,7 @@ class MOBO:
         else:
             self.async_strategy = None
 
-    def optimize(self, X, Y, X_busy, batch_size):
+    def optimize(self, X, Y, X_busy, batch_size, C=None):
         '''
         Optimize for the next batch of samples given the initial data.
 
@@ -81,6 +81,8 @@ class MOBO:
             Design variables currently being evaluated.
         batch_size: int
             Batch size.
+        C: np.array
+            Evaluation costs (in seconds) of the initial design variables (if None then costs are not considered).
 
         Returns
         -------
@@ -90,6 +92,10 @@ class MOBO:
         # convert maximization to minimization
         Y = convert_minimization(Y, self.obj_type)
 
+        # fit evaluation cost for cost-aware selection
+        if C is not None:
+            self.selection.fit_cost(X, C)
+
         if self.async_strategy is None or X_busy is None:
             return self._optimize(X, Y, batch_size)
         else:
@@ -1,3 +1,4 @@
+from autooed.mobo.selection.cost import CostAwareHypervolumeImprovement
 from autooed.mobo.selection.direct import Direct
 from autooed.mobo.selection.hvi import HypervolumeImprovement
 from autooed.mobo.selection.random import Random
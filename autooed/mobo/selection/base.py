@@ -20,6 +20,19 @@ class Selection(ABC):
         self.surrogate_model = surrogate_model
         self.transformation = surrogate_model.transformation
 
+    def fit_cost(self, X, C):
+        '''
+        Fit the evaluation cost of existing design samples, only used by cost-aware selection methods.
+
+        Parameters
+        ----------
+        X: np.array
+            Current design samples (raw).
+        C: np.array
+            Evaluation costs (in seconds) of current design samples, invalid ones are NaN.
+        '''
+        pass
+
     def select(self, X_candidate, Y_candidate, X, Y, batch_size):
         '''
         Select the next batch of design samples to evaluate from proposed candidates.
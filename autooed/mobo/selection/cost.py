@@ -0,0 +1,36 @@
+'''
+Cost-aware hypervolume improvement selection.
+'''
+
+import numpy as np
+
+from autooed.utils.pareto import find_pareto_front
+from autooed.utils.hypervolume import greedy_hypervolume_selection
+from autooed.mobo.selection.base import Selection
+from autooed.mobo.surrogate_model.cost import CostModel
+
+
+class CostAwareHypervolumeImprovement(Selection):
+    '''
+    Selection based on hypervolume improvement per unit of predicted evaluation cost.
+    '''
+    def __init__(self, surrogate_model, **kwargs):
+        super().__init__(surrogate_model, **kwargs)
+        self.cost_model = CostModel(surrogate_model.problem)
+
+    def fit_cost(self, X, C):
+        self.cost_model.fit(X, C)
+
+    def _select(self, X_candidate, Y_candidate, X, Y, batch_size):
+
+        pred_pset, pred_pfront = X_candidate, Y_candidate
+        pred_cost = self.cost_model.predict(X_candidate, dtype='continuous')
+        curr_pfront = find_pareto_front(Y)
+        ref_point = np.max(np.vstack([Y_candidate, Y]), axis=0)
+
+        # greedily select indices that maximize hypervolume contribution per unit cost
+        next_batch_indices = greedy_hypervolume_selection(curr_pfront, pred_pfront, ref_point, batch_size, costs=pred_cost)
+        next_batch_indices = np.array(next_batch_indices)
+
+        X_next = pred_pset[next_batch_indices]
+        return X_next
@@ -2,6 +2,7 @@
 Multi-objective solver for finding the Pareto front of the surrogate problem.
 '''
 
+import os
 from abc import ABC, abstractmethod
 import numpy as np
 
@@ -13,16 +14,24 @@ class Solver(ABC):
     '''
     Base class of multi-objective solver.
     '''
-    def __init__(self, problem, **kwargs):
+    def __init__(self, problem, warm_start=False, state_path=None, **kwargs):
         '''
         Initialize a solver.
 
         Parameters
         ----------
+        problem: autooed.problem.Problem
+            The optimization problem.
+        warm_start: bool
+            Whether to seed the initial population with the final population of the previous solve.
+        state_path: str
+            Path of the file storing the final population between solves (set per experiment by the agent).
         '''
         self.real_problem = problem # real problem
         self.problem = None # surrogate problem
         self.transformation = problem.transformation
+        self.warm_start = warm_start
+        self.state_path = state_path
 
     def solve(self, X, Y, batch_size, acquisition):
         '''
@@ -48,6 +57,58 @@ class Solver(ABC):
         X_candidate = self.transformation.undo(X_candidate)
         return X_candidate, Y_candidate
 
+    def _load_population(self, n_var, max_size=None):
+        '''
+        Load the final population (Pareto set first) of the previous solve for warm start.
+
+        Parameters
+        ----------
+        n_var: int
+            Number of design variables (continuous), populations of other dimensions are discarded.
+        max_size: int
+            Maximum size of the loaded population.
+
+        Returns
+        -------
+        np.array
+            Previous population (continuous), None if not available.
+        '''
+        if not self.warm_start or self.state_path is None or not os.path.exists(self.state_path):
+            return None
+        try:
+            with np.load(self.state_path) as state:
+                X_prev = np.vstack([state['X_opt'], state['X']])
+        except Exception:
+            return None
+        if X_prev.ndim != 2 or X_prev.shape[1] != n_var or len(X_prev) == 0:
+            return None
+
+        # remove duplicates while keeping the Pareto set in front
+        _, indices = np.unique(X_prev, axis=0, return_index=True)
+        X_prev = X_prev[np.sort(indices)]
+        X_prev = np.clip(X_prev, self.problem.xl, self.problem.xu)
+        return X_prev[:max_size]
+
+    def _save_population(self, X, X_opt):
+        '''
+        Save the final population and Pareto set of the current solve for warm start.
+
+        Parameters
+        ----------
+        X: np.array
+            Final population (continuous).
+        X_opt: np.array
+            Pareto set of the final population (continuous).
+        '''
+        if not self.warm_start or self.state_path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        # write to a temporary file first, so concurrent solves never read a partial file
+        tmp_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fp:
+            np.savez(fp, X=np.atleast_2d(X), X_opt=np.atleast_2d(X_opt).reshape(-1, np.atleast_2d(X).shape[1]))
+        os.replace(tmp_path, self.state_path)
+
     @abstractmethod
     def _solve(self, X, Y):
         '''
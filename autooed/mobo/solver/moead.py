@@ -11,6 +11,7 @@ from pymoo.optimize import minimize
 from autooed.utils.sampling import lhs
 from autooed.utils.pareto import find_pareto_front
 from autooed.mobo.solver.base import Solver
+from autooed.mobo.solver.mutation import get_solver_mutation
 
 
 class MOEAD(Solver):
@@ -19,18 +20,22 @@ class MOEAD(Solver):
     NOTE: only compatible with Direct selection.
     '''
     def __init__(self, problem, n_gen=100, pop_size=100, **kwargs):
-        super().__init__(problem)
+        super().__init__(problem, **kwargs)
         self.n_gen = n_gen
         self.pop_size = pop_size
 
         # generate direction vectors by random sampling
         self.ref_dirs = np.random.random((pop_size, problem.n_obj))
         self.ref_dirs /= np.expand_dims(np.sum(self.ref_dirs, axis=1), 1)
-        self.algo = MOEADAlgo(pop_size=pop_size, ref_dirs=self.ref_dirs, eliminate_duplicates=False)
+        self.algo = MOEADAlgo(pop_size=pop_size, ref_dirs=self.ref_dirs, eliminate_duplicates=False, mutation=get_solver_mutation(self.transformation))
 
     def _solve(self, X, Y, batch_size):
 
-        # initialize population
+        # initialize population, filled by the final population of the previous solve if warm started
+        if len(X) < self.pop_size:
+            X_prev = self._load_population(X.shape[1], self.pop_size - len(X))
+            if X_prev is not None:
+                X = np.vstack([X, X_prev])
         if len(X) < self.pop_size:
             X = np.vstack([X, lhs(X.shape[1], self.pop_size - len(X))])
         elif len(X) > self.pop_size:
@@ -39,6 +44,7 @@ class MOEAD(Solver):
         self.algo.initialization.sampling = X
 
         res = minimize(self.problem, self.algo, ('n_gen', self.n_gen))
+        self._save_population(res.pop.get('X'), res.opt.get('X'))
 
         X_candidate, Y_candidate, algo = res.pop.get('X'), res.pop.get('F'), res.algorithm
         G = Y_candidate
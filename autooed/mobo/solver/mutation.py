@@ -0,0 +1,56 @@
+'''
+Mutation operators for the evolutionary solvers.
+'''
+
+import numpy as np
+from pymoo.factory import get_mutation
+from pymoo.model.mutation import Mutation
+
+
+class CategoricalMutation(Mutation):
+    '''
+    Polynomial mutation on continuous variables and random reset on integer-coded categorical variables.
+    '''
+    def __init__(self, cat_idx, cat_n_choices, eta=20, prob=None):
+        '''
+        Initialize the mutation operator.
+
+        Parameters
+        ----------
+        cat_idx: np.array
+            Indices of integer-coded categorical variables.
+        cat_n_choices: np.array
+            Number of choices of each categorical variable.
+        eta: float
+            Distribution index of the polynomial mutation.
+        prob: float
+            Mutation probability of each variable (if None then 1 / n_var).
+        '''
+        super().__init__()
+        self.cat_idx = np.array(cat_idx, dtype=int)
+        self.cat_n_choices = np.array(cat_n_choices, dtype=int)
+        self.prob = prob
+        self.real_mutation = get_mutation('real_pm', eta=eta, prob=prob)
+
+    def _do(self, problem, X, **kwargs):
+        Y = self.real_mutation._do(problem, X, **kwargs)
+
+        # reset categorical variables to a random choice
+        X_cat = np.clip(np.round(X[:, self.cat_idx]), 0, self.cat_n_choices - 1)
+        prob = self.prob if self.prob is not None else 1.0 / problem.n_var
+        reset = np.random.random(X_cat.shape) < prob
+        random_choices = np.floor(np.random.random(X_cat.shape) * self.cat_n_choices)
+        X_cat[reset] = random_choices[reset]
+        Y[:, self.cat_idx] = X_cat
+
+        return Y
+
+
+def get_solver_mutation(transformation, eta=20):
+    '''
+    Get the mutation operator matching the variable encoding of the transformation.
+    '''
+    if len(transformation.cat_idx) > 0:
+        return CategoricalMutation(transformation.cat_idx, transformation.cat_n_choices, eta=eta)
+    else:
+        return get_mutation('real_pm', eta=eta)
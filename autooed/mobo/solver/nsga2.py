@@ -8,6 +8,7 @@ from pymoo.optimize import minimize
 
 from autooed.utils.sampling import lhs
 from autooed.mobo.solver.base import Solver
+from autooed.mobo.solver.mutation import get_solver_mutation
 
 
 class NSGA2(Solver):
@@ -15,16 +16,21 @@ class NSGA2(Solver):
     Solver based on NSGA-II.
     '''
     def __init__(self, problem, n_gen=200, pop_size=200, **kwargs):
-        super().__init__(problem)
+        super().__init__(problem, **kwargs)
         self.n_gen = n_gen
-        self.algo = NSGA2Algo(pop_size=pop_size)
+        self.pop_size = pop_size
+        self.algo = NSGA2Algo(pop_size=pop_size, mutation=get_solver_mutation(self.transformation))
 
     def _solve(self, X, Y, batch_size):
 
-        # initialize population
+        # initialize population, merged with the final population of the previous solve if warm started
+        X_prev = self._load_population(X.shape[1], self.pop_size)
+        if X_prev is not None:
+            X = np.vstack([X, X_prev])
         X = np.vstack([X, lhs(X.shape[1], batch_size)])
         self.algo.initialization.sampling = X
         
         res = minimize(self.problem, self.algo, ('n_gen', self.n_gen))
+        self._save_population(res.pop.get('X'), res.opt.get('X'))
 
         return res.pop.get('X'), res.pop.get('F')
@@ -5,21 +5,22 @@ ParEGO multi-objective solver.
 import numpy as np
 from pymoo.optimize import minimize
 from pymoo.algorithms.so_cmaes import CMAES
-from multiprocess import Process, Queue, cpu_count
+from multiprocess import cpu_count
 
 from autooed.utils.sampling import lhs
 from autooed.mobo.solver.base import Solver
+from autooed.mobo.solver.pool import SolverPool
 from autooed.mobo.solver.parego.evaluator import ScalarizedEvaluator
 from autooed.mobo.solver.parego.decomposition import augmented_tchebicheff, AugmentedTchebicheff
 
 
-def optimization(problem, x, weights, queue):
+def optimization(problem, x, weights):
     '''
     Parallel worker for single-objective CMA-ES optimization.
     '''
     evaluator = ScalarizedEvaluator(decomposition=AugmentedTchebicheff(), weights=weights)
     res = minimize(problem, CMAES(x), evaluator=evaluator)
-    queue.put([res.X[0], res.F[0]])
+    return res.X[0], res.F[0]
 
 
 class ParEGO(Solver):
@@ -44,23 +45,9 @@ class ParEGO(Solver):
         F = self.problem.evaluate(X, return_values_of=['F'])
 
         # optimization
-        xs, ys = [], []
-        queue = Queue()
-        n_active_process = 0
-        for i in range(batch_size):
-            x0 = X[np.argmin(augmented_tchebicheff(F, weights[i]))]
-            Process(target=optimization, args=(self.problem, x0, weights[i], queue)).start()
-            n_active_process += 1
-            if n_active_process >= self.n_process:
-                x, y = queue.get()
-                xs.append(x)
-                ys.append(y)
-                n_active_process -= 1
-
-        # gather result
-        for _ in range(n_active_process):
-            x, y = queue.get()
-            xs.append(x)
-            ys.append(y)
+        args_list = [(X[np.argmin(augmented_tchebicheff(F, weights[i]))], weights[i]) for i in range(batch_size)]
+        with SolverPool(self.problem, self.n_process) as pool:
+            results = pool.map(optimization, args_list)
+        xs, ys = zip(*results)
 
         return np.array(xs), np.array(ys)
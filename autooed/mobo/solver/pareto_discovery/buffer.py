@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 import numpy as np
-from scipy.spatial import Delaunay
-from copy import deepcopy
+from scipy.spatial import Delaunay, cKDTree
+from scipy.special import comb
 from pygco import cut_from_graph
 
 from autooed.mobo.solver.pareto_discovery.utils import generate_weights_batch
@@ -11,7 +11,7 @@ class BufferBase(ABC):
     '''
     Base class of performance buffer.
     '''
-    def __init__(self, cell_num, cell_size=None, origin=None, origin_constant=1e-2, delta_b=0.2, label_cost=0):
+    def __init__(self, cell_num, cell_size=None, origin=None, origin_constant=1e-2, delta_b=0.2, label_cost=0, label_top_k=3):
         '''
         Initialize a performance buffer.
 
@@ -29,6 +29,8 @@ class BufferBase(ABC):
             Normalization constaint for calculating unary energy in sparse approximation (NOTE: in the paper they also use this to determine appending to buffer or rejection).
         label_cost: float, default=0
             For reducing number of unique labels in sparse approximation.
+        label_top_k: int, default=3
+            Only patches that are among the k closest samples of some cell are labels in sparse approximation, None means no pruning.
         '''
         self.cell_num = cell_num
         self.cell_size = cell_size if cell_size is not None and cell_size > 0 else None
@@ -39,16 +41,20 @@ class BufferBase(ABC):
         self.C_inf = 10
         self.delta_b = delta_b
         self.label_cost = label_cost
+        self.label_top_k = label_top_k
         
-        # buffer element arrays
-        # NOTE: below initializations without prior size could be inefficient in memory access
-        self.buffer_x = [[] for _ in range(self.cell_num)]
-        self.buffer_y = [[] for _ in range(self.cell_num)]
-        self.buffer_dist = [[] for _ in range(self.cell_num)] # stores distance to origin for each sample, exactly the same size as self.buffer
-        self.buffer_patch_id = [[] for _ in range(self.cell_num)] # stores the index of manifold (patch) that each sample belongs to
+        # buffer element arrays, preallocated with growing capacity and sorted by (cell index, distance to origin),
+        # so that the samples of each cell are contiguous in range [cell_start[i], cell_start[i + 1])
+        self.capacity = 0
+        self.buffer_x = None
+        self.buffer_y = None
+        self.buffer_dist = None # stores distance to origin for each sample
+        self.buffer_cell_id = None # stores the cell index of each sample
+        self.buffer_patch_id = None # stores the index of manifold (patch) that each sample belongs to
+        self.cell_start = np.zeros(self.cell_num + 1, dtype=int)
         
         self.sample_count = 0
-        
+
     @abstractmethod
     def _find_cell_id(self, F):
         '''
@@ -66,6 +72,46 @@ class BufferBase(ABC):
         '''
         pass
 
+    def _reserve(self, n_var, n_obj, size):
+        '''
+        Make sure the buffer element arrays can hold the given number of samples, grow the capacity geometrically otherwise.
+        '''
+        if size <= self.capacity: return
+        capacity = max(size, 2 * self.capacity, 1024)
+        n = self.sample_count
+
+        def grow(array, shape, dtype):
+            new_array = np.empty(shape, dtype=dtype)
+            if array is not None:
+                new_array[:n] = array[:n]
+            return new_array
+
+        self.buffer_x = grow(self.buffer_x, (capacity, n_var), float)
+        self.buffer_y = grow(self.buffer_y, (capacity, n_obj), float)
+        self.buffer_dist = grow(self.buffer_dist, capacity, float)
+        self.buffer_cell_id = grow(self.buffer_cell_id, capacity, int)
+        self.buffer_patch_id = grow(self.buffer_patch_id, capacity, int)
+        self.capacity = capacity
+
+    def _update_cells(self):
+        '''
+        Sort all cells according to distance to origin, and only keep self.cell_size samples in each cell.
+        '''
+        n = self.sample_count
+        idx = np.lexsort((self.buffer_dist[:n], self.buffer_cell_id[:n]))
+
+        if self.cell_size is not None:
+            # rank of each sample inside its cell after sorting
+            sorted_cell_id = self.buffer_cell_id[idx]
+            rank = np.arange(n) - np.searchsorted(sorted_cell_id, sorted_cell_id, side='left')
+            idx = idx[rank < self.cell_size]
+
+        n = len(idx)
+        for array in [self.buffer_x, self.buffer_y, self.buffer_dist, self.buffer_cell_id, self.buffer_patch_id]:
+            array[:n] = array[idx]
+        self.sample_count = n
+        self.cell_start = np.searchsorted(self.buffer_cell_id[:n], np.arange(self.cell_num + 1), side='left')
+
     def insert(self, X, Y, patch_ids):
         '''
         Insert samples into the buffer along with manifold (patch) indices.
@@ -79,26 +125,30 @@ class BufferBase(ABC):
         patch_ids: np.array
             Patch indices.
         '''
+        X, Y = np.atleast_2d(X), np.atleast_2d(Y)
+        if len(X) == 0: return
+
         # normalize performance
-        X, Y = np.array(X), np.array(Y)
         self.move_origin(np.min(Y, axis=0))
         F = Y - self.origin
 
-        # calculate corresponding cell index
-        dists = np.linalg.norm(F, axis=1)
-        cell_ids = self._find_cell_id(F)
+        # append to the end of buffer arrays, then sort and truncate all cells at once
+        n, n_new = self.sample_count, len(X)
+        self._reserve(X.shape[1], Y.shape[1], n + n_new)
+        self.buffer_x[n:n + n_new] = X
+        self.buffer_y[n:n + n_new] = Y
+        self.buffer_dist[n:n + n_new] = np.linalg.norm(F, axis=1)
+        self.buffer_cell_id[n:n + n_new] = self._find_cell_id(F)
+        self.buffer_patch_id[n:n + n_new] = patch_ids
+        self.sample_count += n_new
 
-        # insert into buffer
-        for x, y, cell_id, dist, patch_id in zip(X, Y, cell_ids, dists, patch_ids):
-            self.buffer_x[cell_id].append(x)
-            self.buffer_y[cell_id].append(y)
-            self.buffer_dist[cell_id].append(dist)
-            self.buffer_patch_id[cell_id].append(patch_id)
-        self.sample_count += len(X)
+        self._update_cells()
 
-        # update cells
-        for cell_id in np.unique(cell_ids):
-            self._update_cell(cell_id)
+    def _get_cell_count(self):
+        '''
+        Get the number of samples in each cell.
+        '''
+        return np.diff(self.cell_start)
 
     def sample(self, n):
         '''
@@ -114,29 +164,34 @@ class BufferBase(ABC):
         np.array
             Selected samples.
         '''
-        nonempty_cell_ids = [i for i in range(self.cell_num) if len(self.buffer_dist[i]) > 0]
+        cell_count = self._get_cell_count()
+        nonempty_cell_ids = np.where(cell_count > 0)[0]
 
         # when n is less than number of non-empty cells, randomly pick the 1st samples in cells
         if n <= len(nonempty_cell_ids):
             selected_cell_ids = np.random.choice(nonempty_cell_ids, size=n, replace=False)
-            selected_samples = np.array([self.buffer_x[i][0] for i in selected_cell_ids])
+            selected_samples = self.buffer_x[self.cell_start[selected_cell_ids]].copy()
         
         # when n is greater, pick samples in cells round by round (1st, 2nd, ...)
         else:
             k = 0
             selected_samples = []
-            while len(selected_samples) < n:
+            n_selected = 0
+            while n_selected < n:
                 # find cells need to be sampled in current round
-                nonempty_cell_ids = [i for i in range(self.cell_num) if len(self.buffer_dist[i]) > k]
+                nonempty_cell_ids = np.where(cell_count > k)[0]
 
                 if len(nonempty_cell_ids) == 0: # when total number of samples in buffer is less than sample number
+                    selected_samples = np.vstack(selected_samples)
                     random_indices = np.random.choice(np.arange(len(selected_samples)), size=(n - len(selected_samples)))
-                    selected_samples = np.vstack([selected_samples, np.array(selected_samples)[random_indices]])
+                    selected_samples = np.vstack([selected_samples, selected_samples[random_indices]])
                     break
                 
-                curr_selected_samples = [self.buffer_x[i][k] for i in nonempty_cell_ids]
-                selected_samples.extend(np.random.permutation(curr_selected_samples))
-            selected_samples = np.array(selected_samples[:n])
+                curr_selected_samples = self.buffer_x[self.cell_start[nonempty_cell_ids] + k]
+                selected_samples.append(np.random.permutation(curr_selected_samples))
+                n_selected += len(curr_selected_samples)
+                k += 1
+            selected_samples = np.vstack(selected_samples)[:n]
         return selected_samples
 
     def move_origin(self, y_min):
@@ -152,35 +207,13 @@ class BufferBase(ABC):
 
         self.origin = np.minimum(self.origin, y_min) - self.origin_constant
 
-        old_buffer_x, old_buffer_y = deepcopy(self.buffer_x), deepcopy(self.buffer_y)
-        old_buffer_patch_id = deepcopy(self.buffer_patch_id)
-        self.buffer_x, self.buffer_y, self.buffer_dist, self.buffer_patch_id = [[[] for _ in range(self.cell_num)] for _ in range(4)]
-        self.sample_count = 0
-
-        for cell_x, cell_y, cell_patch_id in zip(old_buffer_x, old_buffer_y, old_buffer_patch_id):
-            if len(cell_x) > 0:
-                self.insert(cell_x, cell_y, cell_patch_id)
-
-    def _update_cell(self, cell_id):
-        '''
-        Sort particular cell according to distance to origin, and only keep self.cell_size samples in the cell.
-
-        Parameters
-        ----------
-        cell_id: int
-            Index of the cell.
-        '''
-        if len(self.buffer_dist[cell_id]) == 0: return
-
-        idx = np.argsort(self.buffer_dist[cell_id])
-        if self.cell_size is not None:
-            self.sample_count -= max(len(idx) - self.cell_size, 0)
-            idx = idx[:self.cell_size]
-
-        # TODO: check if time-consuming here
-        self.buffer_x[cell_id], self.buffer_y[cell_id], self.buffer_dist[cell_id], self.buffer_patch_id[cell_id] = \
-            map(lambda x: list(np.array(x)[idx]), 
-                [self.buffer_x[cell_id], self.buffer_y[cell_id], self.buffer_dist[cell_id], self.buffer_patch_id[cell_id]])
+        # recompute distances and cell indices of all samples in bulk
+        n = self.sample_count
+        if n == 0: return
+        F = self.buffer_y[:n] - self.origin
+        self.buffer_dist[:n] = np.linalg.norm(F, axis=1)
+        self.buffer_cell_id[:n] = self._find_cell_id(F)
+        self._update_cells()
 
     @abstractmethod
     def _get_graph_edges(self, valid_cells):
@@ -213,30 +246,43 @@ class BufferBase(ABC):
             approx_y: np.array
                 The labeled performance values, shape = (n_label, n_obj).
         '''
-        # update patch ids, remove non-existing ids previously removed from buffer
-        mapping = {}
-        patch_id_count = 0
-        for cell_id in range(self.cell_num):
-            if self.buffer_patch_id[cell_id] == []: continue
-            curr_patches = self.buffer_patch_id[cell_id]
-            for i in range(len(curr_patches)):
-                if curr_patches[i] not in mapping:
-                    mapping[curr_patches[i]] = patch_id_count
-                    patch_id_count += 1
-                self.buffer_patch_id[cell_id][i] = mapping[curr_patches[i]]
-
-        # construct unary and pairwise energy (cost) matrix for graph-cut
-        # NOTE: delta_b should be set properly
-        valid_cells = np.where([self.buffer_dist[cell_id] != [] for cell_id in range(self.cell_num)])[0] # non-empty cells
+        n = self.sample_count
+        patch_ids, dists = self.buffer_patch_id[:n], self.buffer_dist[:n]
+        cell_count = self._get_cell_count()
+        valid_cells = np.where(cell_count > 0)[0] # non-empty cells
         n_node = len(valid_cells)
-        n_label = patch_id_count
-        unary_cost = self.C_inf * np.ones((n_node, n_label))
+
+        # node index of each sample and its rank in the cell, since all samples are sorted by cell and distance to origin
+        node_ids = np.repeat(np.arange(n_node), cell_count[valid_cells])
+        ranks = np.arange(n) - np.repeat(self.cell_start[valid_cells], cell_count[valid_cells])
+
+        # label pruning: a patch is a candidate label only if it is among the top-k samples of some cell,
+        # since every local expansion creates a new patch and the number of patches keeps growing with generations
+        if self.label_top_k is not None:
+            candidate = np.isin(patch_ids, np.unique(patch_ids[ranks < self.label_top_k]))
+        else:
+            candidate = np.ones(n, dtype=bool)
+
+        # map candidate patch ids to consecutive labels (following the order of first appearance), other samples get label -1
+        _, first_idx, inverse = np.unique(patch_ids[candidate], return_index=True, return_inverse=True)
+        mapping = np.empty(len(first_idx), dtype=int)
+        mapping[np.argsort(first_idx)] = np.arange(len(first_idx))
+        sample_labels = np.full(n, -1)
+        sample_labels[candidate] = mapping[inverse.flatten()]
+
+        # construct unary and pairwise energy (cost) matrix for graph-cut, the unary costs are only computed for (cell, label) pairs present in the buffer
+        # NOTE: delta_b should be set properly
+        n_label = len(first_idx)
         pairwise_cost = -self.C_inf * np.eye(n_label)
 
-        for i, idx in enumerate(valid_cells):
-            patches, distances = np.array(self.buffer_patch_id[idx]), np.array(self.buffer_dist[idx])
-            min_dist = np.min(distances)
-            unary_cost[i, patches] = np.minimum((distances - min_dist) / self.delta_b, self.C_inf)
+        # the first sample of a cell has the minimum distance
+        min_dists = dists[self.cell_start[valid_cells]]
+        sample_cost = np.minimum((dists[candidate] - min_dists[node_ids[candidate]]) / self.delta_b, self.C_inf)
+
+        # when a patch appears multiple times in a cell, the cost of the farthest sample is kept
+        unary_cost = np.full((n_node, n_label), -np.inf)
+        np.maximum.at(unary_cost, (node_ids[candidate], sample_labels[candidate]), sample_cost)
+        unary_cost[np.isinf(unary_cost)] = self.C_inf
         
         # get edge information (graph structure)
         edges = self._get_graph_edges(valid_cells)
@@ -248,37 +294,30 @@ class BufferBase(ABC):
         # do graph-cut, optimize labels for each valid cell
         labels_opt = cut_from_graph(edges, unary_cost, pairwise_cost, label_cost)
 
-        # find corresponding design and performance values of optimized labels for each valid cell
-        approx_xs, approx_ys = [], []
-        labels = [] # for a certain cell, there could be no sample belongs to that label, probably due to the randomness of sampling or improper energy definition
-        for idx, label in zip(valid_cells, labels_opt):
-            for cell_patch_id, cell_x, cell_y in zip(self.buffer_patch_id[idx], self.buffer_x[idx], self.buffer_y[idx]):
-                # since each buffer element array is sorted based on distance to origin
-                if cell_patch_id == label:
-                    approx_xs.append(cell_x)
-                    approx_ys.append(cell_y)
-                    labels.append(label)
-                    break
-            else: # TODO: check
-                approx_xs.append(self.buffer_x[idx][0])
-                approx_ys.append(self.buffer_y[idx][0])
-                labels.append(label)
-        approx_xs, approx_ys = np.array(approx_xs), np.array(approx_ys)
+        # find corresponding design and performance values of optimized labels for each valid cell,
+        # i.e. the closest sample in the cell with the optimized label, or the closest sample in the cell if no sample has that label
+        # (for a certain cell, there could be no sample belongs to that label, probably due to the randomness of sampling or improper energy definition)
+        selected_idx = self.cell_start[valid_cells].copy()
+        matched_idx = np.where(sample_labels == labels_opt[node_ids])[0]
+        matched_nodes, first_matched = np.unique(node_ids[matched_idx], return_index=True)
+        selected_idx[matched_nodes] = matched_idx[first_matched]
+        approx_xs, approx_ys = self.buffer_x[selected_idx].copy(), self.buffer_y[selected_idx].copy()
+        labels = list(labels_opt)
 
         # NOTE: uncomment code below to show visualization of graph cut
         # import matplotlib.pyplot as plt
         # from matplotlib import cm
-        # cmap = cm.get_cmap('tab20', patch_id_count)
+        # cmap = cm.get_cmap('tab20', n_label)
         # fig, axs = plt.subplots(1, 2, sharex=True, sharey=True)
-        # buffer_ys = np.vstack([np.vstack(cell_y) for cell_y in self.buffer_y if cell_y != []])
-        # buffer_patch_ids = np.concatenate([cell_patch_id for cell_patch_id in np.array(self.buffer_patch_id)[valid_cells]])
+        # buffer_ys = self.buffer_y[:n]
+        # buffer_patch_ids = sample_labels
         # colors = [cmap(patch_id) for patch_id in buffer_patch_ids]
         # axs[0].scatter(*buffer_ys.T, s=10, c=colors)
         # axs[0].set_title('Before graph cut')
         # colors = [cmap(label) for label in labels]
         # axs[1].scatter(*approx_ys.T, s=10, c=colors)
         # axs[1].set_title('After graph cut')
-        # fig.suptitle(f'Sparse approximation, # patches: {patch_id_count}, # families: {len(np.unique(labels))}')
+        # fig.suptitle(f'Sparse approximation, # patches: {n_label}, # families: {len(np.unique(labels))}')
         # plt.show()
 
         return labels, approx_xs, approx_ys
@@ -294,13 +333,8 @@ class BufferBase(ABC):
         flattened_y: np.array
             Flattened array of the performance values.
         '''
-        flattened_x, flattened_y = [], []
-        for cell_x, cell_y in zip(self.buffer_x, self.buffer_y):
-            if cell_x != []:
-                flattened_x.append(cell_x)
-            if cell_y != []:
-                flattened_y.append(cell_y)
-        return np.concatenate(flattened_x), np.concatenate(flattened_y)
+        n = self.sample_count
+        return self.buffer_x[:n].copy(), self.buffer_y[:n].copy()
 
 
 class Buffer2D(BufferBase):
@@ -327,28 +361,81 @@ class Buffer2D(BufferBase):
         return edges
 
 
-class Buffer3D(BufferBase):
+class BufferND(BufferBase):
     '''
-    3D performance buffer.
+    N-dimensional performance buffer, where each cell is a direction vector from the origin.
     '''
-    def __init__(self, cell_num, *args, origin=None, **kwargs):
+    def __init__(self, cell_num, *args, n_obj=None, origin=None, **kwargs):
         if cell_num is None: cell_num = 1000
         super().__init__(cell_num, *args, origin=origin, **kwargs)
+        self.n_obj = n_obj
         if self.origin is None:
-            self.origin = np.zeros(3)
-        # it's really hard to generate evenly distributed unit vectors in 3d space, use some tricks here
-        edge_cell_num = int(np.sqrt(2 * cell_num + 0.25) + 0.5) - 1
-        cell_vecs = generate_weights_batch(n_dim=3, delta_weight=1.0 / (edge_cell_num - 1))
-        if len(cell_vecs) < cell_num:
-            random_vecs = np.random.random((cell_num - len(cell_vecs), 3))
-            cell_vecs = np.vstack([cell_vecs, random_vecs])
-        self.cell_vecs = cell_vecs / np.linalg.norm(cell_vecs, axis=1)[:, None]
+            self.origin = np.zeros(self.n_obj)
+        self.cell_vecs = self._generate_cell_vecs()
+        # spatial index of cell vectors, nearest direction assignment takes logarithmic time in the number of cells
+        self.cell_tree = cKDTree(self.cell_vecs)
+
+    def _generate_cell_vecs(self):
+        '''
+        Generate well-spread unit cell vectors, by choosing the farthest points among the uniform weights on the simplex
+        with the smallest resolution that gives enough weights.
+
+        Returns
+        -------
+        cell_vecs: np.array
+            Unit cell vectors, shape = (cell_num, n_obj).
+        '''
+        n_partition = 1
+        while comb(n_partition + self.n_obj - 1, self.n_obj - 1, exact=True) < self.cell_num:
+            n_partition += 1
+        weights = np.maximum(generate_weights_batch(n_dim=self.n_obj, delta_weight=1.0 / n_partition), 0.0)
+        vecs = weights / np.linalg.norm(weights, axis=1)[:, None]
+
+        # farthest point sampling, starting from the first vector (an extreme direction)
+        selected = np.zeros(len(vecs), dtype=bool)
+        selected[0] = True
+        min_dists = np.linalg.norm(vecs - vecs[0], axis=1)
+        for _ in range(min(self.cell_num, len(vecs)) - 1):
+            idx = np.argmax(np.where(selected, -np.inf, min_dists))
+            selected[idx] = True
+            min_dists = np.minimum(min_dists, np.linalg.norm(vecs - vecs[idx], axis=1))
+        return vecs[selected]
 
     def _find_cell_id(self, F):
-        dots = F @ self.cell_vecs.T
-        cell_ids = np.argmax(dots, axis=1)
+        # the cell vector with the largest cosine similarity is the nearest one to the normalized performance
+        norms = np.maximum(np.linalg.norm(F, axis=1), 1e-12)
+        _, cell_ids = self.cell_tree.query(F / norms[:, None])
         return cell_ids
 
+    def _get_graph_edges(self, valid_cells):
+        # connect each cell to its nearest cells by direction, instead of triangulation which is expensive in high dimensions
+        if len(valid_cells) == 1:
+            raise Exception('only 1 non-empty cell in buffer, cannot do graph cut')
+        vertices = self.cell_vecs[valid_cells]
+        k = min(2 * (self.n_obj - 1), len(valid_cells) - 1)
+        _, neighbors = cKDTree(vertices).query(vertices, k=k + 1)
+        edges = np.column_stack([np.repeat(np.arange(len(vertices)), k), neighbors[:, 1:].flatten()])
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        return edges
+
+
+class Buffer3D(BufferND):
+    '''
+    3D performance buffer.
+    '''
+    def __init__(self, cell_num, *args, origin=None, **kwargs):
+        super().__init__(cell_num, *args, n_obj=3, origin=origin, **kwargs)
+
+    def _generate_cell_vecs(self):
+        # it's really hard to generate evenly distributed unit vectors in 3d space, use some tricks here
+        edge_cell_num = int(np.sqrt(2 * self.cell_num + 0.25) + 0.5) - 1
+        cell_vecs = generate_weights_batch(n_dim=3, delta_weight=1.0 / (edge_cell_num - 1))
+        if len(cell_vecs) < self.cell_num:
+            random_vecs = np.random.random((self.cell_num - len(cell_vecs), 3))
+            cell_vecs = np.vstack([cell_vecs, random_vecs])
+        return cell_vecs / np.linalg.norm(cell_vecs, axis=1)[:, None]
+
     def _get_graph_edges(self, valid_cells):
 
         # NOTE: uncomment code below to show visualization of buffer
@@ -359,9 +446,8 @@ class Buffer3D(BufferBase):
         # ax.view_init(azim=45)
         # for vec in self.cell_vecs:
         #     ax.plot(*np.array([self.origin, self.origin + vec]).T, color='gray', linewidth=1, alpha=0.5)
-        # for cell_y in self.buffer_y:
-        #     if cell_y == []: continue
-        #     ax.scatter(*np.array(cell_y).T)
+        # for cell_id in valid_cells:
+        #     ax.scatter(*self.buffer_y[self.cell_start[cell_id]:self.cell_start[cell_id + 1]].T)
         # plt.title(f'# samples: {self.sample_count}, # valid cells: {len(valid_cells)}')
         # plt.show()
 
@@ -402,5 +488,7 @@ def get_buffer(n_obj, *args, **kwargs):
     buffer_map = {2: Buffer2D, 3: Buffer3D}
     if n_obj in buffer_map:
         return buffer_map[n_obj](*args, **kwargs)
+    elif n_obj > 3:
+        return BufferND(*args, n_obj=n_obj, **kwargs)
     else:
         raise NotImplementedError
@@ -4,29 +4,78 @@ ParetoDiscovery multi-objective solver.
 
 import numpy as np
 from scipy.optimize import minimize
-from scipy.linalg import null_space
 from pymoo.model.algorithm import Algorithm
 from pymoo.model.duplicate import DefaultDuplicateElimination
 from pymoo.model.individual import Individual
 from pymoo.model.initialization import Initialization
 from pymoo.optimize import minimize as minimize_ea
-from multiprocess import Process, Queue, cpu_count
+from multiprocess import cpu_count
 
 from autooed.utils.sampling import lhs
 from autooed.utils.pareto import find_pareto_front
 from autooed.mobo.solver.base import Solver
+from autooed.mobo.solver.pool import SolverPool
 from autooed.mobo.solver.pareto_discovery.buffer import get_buffer
 from autooed.mobo.solver.pareto_discovery.utils import propose_next_batch, propose_next_batch_without_label, get_sample_num_from_families
 
 
-def _local_optimization(x, y, f, eval_func, bounds, constr_func, delta_s):
+class _MemoizedEvaluator:
+    '''
+    Evaluator of single design samples that computes the performance together with its jacobian (and hessian on request),
+    and memoizes the results keyed on x, so that the objective, the jacobian and the hessian at the same x share one surrogate call.
+    '''
+    def __init__(self, eval_func):
+        '''
+        Input:
+            eval_func: problem's evaluation function
+        '''
+        self.eval_func = eval_func
+        self.cache = {}
+        self.has_gradient = True
+
+    def _key(self, x):
+        return np.asarray(x, dtype=float).tobytes()
+
+    def seed(self, x, F, dF=None):
+        '''
+        Store results already evaluated at x (e.g., from a batch evaluation).
+        '''
+        self.cache[self._key(x)] = {'F': F, 'dF': dF}
+        if dF is None:
+            self.has_gradient = False
+
+    def get(self, x):
+        '''
+        Get the memoized performance and jacobian at x (None if not evaluated).
+        '''
+        values = self.cache.get(self._key(x), {})
+        return values.get('F'), values.get('dF')
+
+    def __call__(self, x, return_values_of):
+        key = self._key(x)
+        values = self.cache.get(key, {})
+        if any([val not in values for val in return_values_of]):
+            keys = ['F', 'dF'] if self.has_gradient or 'dF' in return_values_of else ['F']
+            if 'hF' in return_values_of:
+                keys = ['F', 'dF', 'hF']
+            values = dict(zip(keys, self.eval_func(np.asarray(x, dtype=float), return_values_of=keys)))
+            values.setdefault('dF', None)
+            if values['dF'] is None:
+                self.has_gradient = False
+            self.cache[key] = values
+        if len(return_values_of) == 1:
+            return values[return_values_of[0]]
+        return tuple([values[val] for val in return_values_of])
+
+
+def _local_optimization(x, y, f, evaluator, bounds, constr_func, delta_s):
     '''
     Local optimization of generated stochastic samples by minimizing distance to the target, see section 6.2.3.
     Input:
         x: a design sample, shape = (n_var,)
         y: performance of x, shape = (n_obj,)
         f: relative performance to the buffer origin, shape = (n_obj,)
-        eval_func: problem's evaluation function
+        evaluator: memoized evaluator of the problem, see _MemoizedEvaluator
         bounds: problem's lower and upper bounds, shape = (2, n_var)
         constr_func: problem's constraint evaluation function
         delta_s: scaling factor for choosing reference point in local optimization, see section 6.2.3
@@ -41,7 +90,7 @@ def _local_optimization(x, y, f, eval_func, bounds, constr_func, delta_s):
 
     # optimization objective, see eq(4)
     def fun(x):
-        fx = eval_func(x, return_values_of=['F'])
+        fx = evaluator(x, return_values_of=['F'])
         return np.linalg.norm(fx - z)
 
     # constraint function
@@ -49,13 +98,12 @@ def _local_optimization(x, y, f, eval_func, bounds, constr_func, delta_s):
         def fun_constr(x):
             return -constr_func(x)
 
-    # jacobian of the objective
-    dy = eval_func(x, return_values_of=['dF'])
-    if dy is None:
+    # jacobian of the objective (F and dF at the same x are computed by a single evaluation)
+    if not evaluator.has_gradient:
         jac = None
     else:
         def jac(x):
-            fx, dfx = eval_func(x, return_values_of=['F', 'dF'])
+            fx, dfx = evaluator(x, return_values_of=['F', 'dF'])
             return ((fx - z) / np.linalg.norm(fx - z)) @ dfx
     
     # do optimization
@@ -67,75 +115,73 @@ def _local_optimization(x, y, f, eval_func, bounds, constr_func, delta_s):
     return x_opt
 
 
-def _get_kkt_dual_variables(F, G, DF, DG):
+def _project_simplex(V):
     '''
-    Optimizing for dual variables alpha and beta in KKT conditions, see section 4.2, proposition 4.5.
+    Euclidean projection of a batch of vectors onto the probability simplex.
     Input:
-        Given a design sample,
-        F: performance value, shape = (n_obj,)
-        G: active constraints, shape = (n_active_const,)
-        DF: jacobian matrix of performance, shape = (n_obj, n_var)
-        DG: jacobian matrix of active constraints, shape = (n_active_const, n_var)
-        where n_var = D, n_obj = d, n_active_const = K' in the original paper
+        V: a batch of vectors, shape = (N, n)
     Output:
-        alpha_opt, beta_opt: optimized dual variables
+        projected vectors, shape = (N, n)
     '''
-    # NOTE: use min-norm solution for solving alpha then determine beta instead?
-    n_obj = len(F)
-    n_active_const = len(G) if G is not None else 0
+    n = V.shape[1]
+    U = -np.sort(-V, axis=1)
+    cumsum = np.cumsum(U, axis=1) - 1.0
+    cond = U - cumsum / np.arange(1, n + 1) > 0
+    rho = n - 1 - np.argmax(cond[:, ::-1], axis=1) # last index satisfying the condition
+    theta = cumsum[np.arange(len(V)), rho] / (rho + 1)
+    return np.maximum(V - theta[:, None], 0.0)
+
 
+def _get_kkt_dual_variables_batch(DF, upper_active, lower_active, n_iter=1000, tol=1e-10):
+    '''
+    Optimizing for dual variables alpha in KKT conditions for a batch of samples, see section 4.2, proposition 4.5.
+    Input:
+        DF: jacobian matrices of performance, shape = (N, n_obj, n_var)
+        upper_active: whether upper box constraints are active, shape = (N, n_var)
+        lower_active: whether lower box constraints are active, shape = (N, n_var)
+        n_iter: maximum number of iterations of projected gradient descent
+        tol: tolerance of alpha change for early stopping
+    Output:
+        alpha_opt: optimized dual variables, shape = (N, n_obj)
+    '''
     '''
     Optimization formulation:
         To optimize the last line of (2) in section 4.2, we change it to a quadratic optization problem by:
         find x to let Ax = 0 --> min_x (Ax)^2
         where x means [alpha, beta] and A means [DF, DG].
         Constraints: alpha >= 0, beta >= 0, sum(alpha) = 1.
-        NOTE: we currently ignore the constraint beta * G = 0 because G will always be 0 with only box constraints, but add that constraint will result in poor optimization solution (?)
+        Since each active box constraint only involves one design variable, the optimal beta given alpha is in closed form:
+        it cancels the negative (upper active) or positive (lower active) part of (alpha @ DF) at that variable.
+        So alpha is optimized by accelerated projected gradient descent on the simplex, for all samples at once.
+        NOTE: beta is not needed for computing the exploration directions because the hessian of box constraints is 0.
     '''
-    if n_active_const > 0: # when there are active constraints
+    N, n_obj, _ = DF.shape
 
-        def fun(x, n_obj=n_obj, DF=DF, DG=DG):
-            alpha, beta = x[:n_obj], x[n_obj:]
-            objective = alpha @ DF + beta @ DG
-            return 0.5 * objective @ objective
+    def residual(alpha):
+        v = np.einsum('nk,nkv->nv', alpha, DF)
+        r = np.where(upper_active, np.maximum(v, 0.0), v)
+        r = np.where(lower_active, np.minimum(v, 0.0), r)
+        return r
 
-        def jac(x, n_obj=n_obj, DF=DF, DG=DG):
-            alpha, beta = x[:n_obj], x[n_obj:]
-            objective = alpha @ DF + beta @ DG
-            return np.vstack([DF, DG]) @ objective
+    # step size from the lipschitz constant of the gradient
+    lipschitz = np.linalg.norm(DF @ DF.transpose(0, 2, 1), ord=2, axis=(1, 2))
+    step = 1.0 / np.maximum(lipschitz, 1e-12)
 
-        const = {'type': 'eq', 
-            'fun': lambda x, n_obj=n_obj: np.sum(x[:n_obj]) - 1.0, 
-            'jac': lambda x, n_obj=n_obj: np.concatenate([np.ones(n_obj), np.zeros_like(x[n_obj:])])}
-    
-    else: # when there's no active constraint
-        
-        def fun(x, DF=DF):
-            objective = x @ DF
-            return 0.5 * objective @ objective
-
-        def jac(x, DF=DF):
-            objective = x @ DF
-            return DF @ objective
-
-        const = {'type': 'eq', 
-                'fun': lambda x: np.sum(x) - 1.0, 
-                'jac': np.ones_like}
-
-    # specify different bounds for alpha and beta
-    bounds = np.array([[0.0, np.inf]] * (n_obj + n_active_const))
-    
     # NOTE: we use random value to initialize alpha for now, maybe consider the location of F we can get a more accurate initialization
-    alpha_init = np.random.random(len(F))
-    alpha_init /= np.sum(alpha_init)
-    beta_init = np.zeros(n_active_const) # zero initialization for beta
-    x_init = np.concatenate([alpha_init, beta_init])
+    alpha = np.random.random((N, n_obj))
+    alpha /= np.sum(alpha, axis=1, keepdims=True)
+    alpha_momentum, t = alpha.copy(), 1.0
 
-    # do optimization using SLSQP
-    res = minimize(fun, x_init, method='SLSQP', jac=jac, bounds=bounds, constraints=const)
-    x_opt = res.x
-    alpha_opt, beta_opt = x_opt[:n_obj], x_opt[n_obj:]
-    return alpha_opt, beta_opt
+    for _ in range(n_iter):
+        grad = np.einsum('nkv,nv->nk', DF, residual(alpha_momentum))
+        alpha_new = _project_simplex(alpha_momentum - step[:, None] * grad)
+        t_new = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t ** 2))
+        alpha_momentum = alpha_new + (t - 1.0) / t_new * (alpha_new - alpha)
+        converged = np.max(np.abs(alpha_new - alpha)) < tol
+        alpha, t = alpha_new, t_new
+        if converged: break
+
+    return alpha
 
 
 def _get_active_box_const(x, bounds):
@@ -157,80 +203,174 @@ def _get_active_box_const(x, bounds):
     return active_idx, upper_active_idx, lower_active_idx
 
 
-def _get_box_const_value_jacobian_hessian(x, bounds):
+def _solve_symmetric_batch(hvp, b, n_iter):
     '''
-    Getting the value, jacobian and hessian of active box constraints.
+    Approximately solve a batch of symmetric (possibly indefinite) linear systems H y = b only by matrix-vector products,
+    using MINRES on a Lanczos basis of n_iter iterations (with full reorthogonalization).
     Input:
-        x: a design sample, shape = (n_var,)
+        hvp: function computing the products of a batch of vectors, (B, n) -> (B, n)
+        b: right hand sides, shape = (B, n)
+        n_iter: number of Lanczos iterations
+    Output:
+        y: approximate solutions, shape = (B, n)
+    '''
+    B, n = b.shape
+    tiny = 1e-12
+    beta_0 = np.linalg.norm(b, axis=1)
+    Q = np.zeros((n_iter + 1, B, n))
+    Q[0] = b / np.maximum(beta_0, tiny)[:, None]
+    T = np.zeros((B, n_iter + 1, n_iter))
+
+    for j in range(n_iter):
+        w = hvp(Q[j])
+        # full reorthogonalization against the Lanczos basis, the coefficients give column j of T
+        coef = np.einsum('jbn,bn->bj', Q[:j + 1], w)
+        w -= np.einsum('jbn,bj->bn', Q[:j + 1], coef)
+        beta = np.linalg.norm(w, axis=1)
+        T[:, :j + 1, j] = coef
+        T[:, j + 1, j] = beta
+        Q[j + 1] = np.where((beta > tiny)[:, None], w / np.maximum(beta, tiny)[:, None], 0.0)
+
+    # minimize the residual in the Krylov subspace: min_c |beta_0 * e_1 - T c|
+    rhs = np.zeros((B, n_iter + 1))
+    rhs[:, 0] = beta_0
+    c = np.einsum('bij,bj->bi', np.linalg.pinv(T), rhs)
+    y = np.einsum('jbn,bj->bn', Q[:n_iter], c)
+    return y
+
+
+def _get_optimization_directions_hvp(x_opts, eval_func, bounds, DF, alpha, upper_active, active, n_krylov=10):
+    '''
+    Getting the directions to explore local pareto manifold for a batch of samples without the hessian of performance.
+    The null space in eq(3) is spanned by (d_alpha, d_beta, d_x) with sum(d_alpha) = 0, d_x = 0 at active box constraints and
+    DF^T d_alpha + DG^T d_beta + H d_x = 0, so d_x = -H^{-1} DF^T d_alpha on the free variables is solved by a Krylov method,
+    where the products with H are finite differences of the analytic jacobians, then d_beta follows from the active variables.
+    Input:
+        x_opts: locally optimized design samples, shape = (N, n_var)
+        eval_func: problem's evaluation function
         bounds: problem's lower and upper bounds, shape = (2, n_var)
+        DF: jacobian matrices of performance, shape = (N, n_obj, n_var)
+        alpha: KKT dual variables, shape = (N, n_obj)
+        upper_active: whether upper box constraints are active, shape = (N, n_var)
+        active: whether box constraints are active, shape = (N, n_var)
+        n_krylov: maximum number of hessian-vector products for each linear solve
     Output:
-        G: value of active box constraints (always 0), shape = (n_active_const,)
-        DG: jacobian matrix of active box constraints (1/-1 at active locations, otherwise 0), shape = (n_active_const, n_var)
-        HG: hessian matrix of active box constraints (always 0), shape = (n_active_const, n_var, n_var)
+        directions_all: list of local exploration directions for alpha, beta and x (design sample) of each sample
     '''
-    # get indices of active constraints
-    active_idx, upper_active_idx, _ = _get_active_box_const(x, bounds)
-    n_active_const, n_var = len(active_idx), len(x)
-
-    if n_active_const > 0:
-        G = np.zeros(n_active_const)
-        DG = np.zeros((n_active_const, n_var))
-        for i, idx in enumerate(active_idx):
-            constraint = np.zeros(n_var)
-            if idx in upper_active_idx:
-                constraint[idx] = 1 # upper active
-            else:
-                constraint[idx] = -1 # lower active
-            DG[i] = constraint
-        HG = np.zeros((n_active_const, n_var, n_var))
-        return G, DG, HG
-    else:
-        # no active constraints
-        return None, None, None
-
-
-def _get_optimization_directions(x_opt, eval_func, bounds):
+    N, n_obj, n_var = DF.shape
+    n_dir = n_obj - 1
+    if n_dir == 0:
+        return [np.zeros((n_obj + active[i].sum() + n_var, 0)) for i in range(N)]
+
+    # orthonormal basis of d_alpha satisfying sum(d_alpha) = 0, shared by all samples
+    d_alpha = np.linalg.svd(np.ones((1, n_obj)))[2][1:].T # shape = (n_obj, n_dir)
+
+    # one linear system for each pair of (sample, d_alpha basis vector)
+    x_rep, alpha_rep = np.repeat(x_opts, n_dir, axis=0), np.repeat(alpha, n_dir, axis=0)
+    free_rep = np.repeat(np.logical_not(active), n_dir, axis=0)
+    DF_d_alpha = np.einsum('nkv,kr->nrv', DF, d_alpha).reshape(N * n_dir, n_var)
+    fd_step = 1e-4 * np.mean(np.array(bounds[1]) - np.array(bounds[0]))
+
+    def hvp(V):
+        # central finite difference of the alpha-weighted jacobian along V, one surrogate evaluation for the whole batch
+        norms = np.linalg.norm(V, axis=1)
+        step = np.where(norms > 1e-12, fd_step / np.maximum(norms, 1e-12), 0.0)[:, None]
+        DF_pert = eval_func(np.vstack([x_rep + step * V, x_rep - step * V]), return_values_of=['dF'])
+        HV = np.einsum('bk,bkv->bv', alpha_rep, DF_pert[:len(V)] - DF_pert[len(V):]) / np.maximum(2.0 * step, 1e-12)
+        return HV
+
+    hvp_free = lambda V: hvp(V * free_rep) * free_rep
+    d_x = _solve_symmetric_batch(hvp_free, -DF_d_alpha * free_rep, n_iter=min(n_krylov, n_var))
+
+    # d_beta at active variables from the remaining equations, where DG has 1 (upper) or -1 (lower) entries
+    residual = DF_d_alpha + hvp(d_x)
+    sign = np.where(np.repeat(upper_active, n_dir, axis=0), 1.0, -1.0)
+    d_beta = -sign * residual
+
+    d_x, d_beta = d_x.reshape(N, n_dir, n_var), d_beta.reshape(N, n_dir, n_var)
+    eps = 1e-8
+    directions_all = []
+    for i in range(N):
+        active_idx = np.where(active[i])[0]
+        directions = np.vstack([d_alpha, d_beta[i][:, active_idx].T, d_x[i].T])
+        # orthonormalize like a null space basis
+        directions = np.linalg.qr(directions)[0]
+        # eliminate numerical error
+        directions[np.abs(directions) < eps] = 0.0
+        directions_all.append(directions)
+    return directions_all
+
+
+def _get_optimization_directions_batch(x_opts, DF, eval_func, bounds, hessian='exact'):
     '''
-    Getting the directions to explore local pareto manifold.
+    Getting the directions to explore local pareto manifold for a batch of samples.
     Input:
-        x_opt: locally optimized design sample, shape = (n_var,)
+        x_opts: locally optimized design samples, shape = (N, n_var)
+        DF: jacobian matrices of performance at x_opts (memoized by local optimization), shape = (N, n_obj, n_var)
         eval_func: problem's evaluation function
         bounds: problem's lower and upper bounds, shape = (2, n_var)
+        hessian: 'exact' for using the hessian of performance, 'hvp' for only using hessian-vector products by finite differences of jacobians
     Output:
-        directions: local exploration directions for alpha, beta and x (design sample)
+        directions_all: list of local exploration directions for alpha, beta and x (design sample) of each sample
     '''
-    # evaluate the value, jacobian and hessian of performance
-    F, DF, HF = eval_func(x_opt, return_values_of=['F', 'dF', 'hF'])
-    
-    # evaluate the value, jacobian and hessian of box constraint (NOTE: assume no other types of constraints)
-    G, DG, HG = _get_box_const_value_jacobian_hessian(x_opt, bounds)
-    
+    bounds = np.array(bounds)
+    N, n_var = x_opts.shape
+
+    n_obj = DF.shape[1]
+
+    # active box constraints (NOTE: assume no other types of constraints), upper one is taken if both are active
+    eps = 1e-8
+    upper_active = bounds[1] - x_opts < eps
+    lower_active = np.logical_and(x_opts - bounds[0] < eps, np.logical_not(upper_active))
+    active = np.logical_or(upper_active, lower_active)
+    n_active_const_all = active.sum(axis=1)
+
     # KKT dual variables optimization
-    alpha, beta = _get_kkt_dual_variables(F, G, DF, DG)
+    alpha = _get_kkt_dual_variables_batch(DF, upper_active, lower_active)
 
-    n_obj, n_var, n_active_const = len(F), len(x_opt), len(G) if G is not None else 0
+    if hessian == 'hvp':
+        return _get_optimization_directions_hvp(x_opts, eval_func, bounds, DF, alpha, upper_active, active)
 
-    # compute H in eq(3) (NOTE: the two forms below are equivalent for box constraint since HG = 0)
-    if n_active_const > 0:
-        H = HF.T @ alpha + HG.T @ beta
-    else:
-        H = HF.T @ alpha
+    # evaluate the hessian of performance for all samples at once, the jacobian is reused
+    HF = eval_func(x_opts, return_values_of=['hF'])
+
+    # compute H in eq(3) (NOTE: the hessian of box constraints HG = 0)
+    H = np.einsum('nk,nkji->nij', alpha, HF)
 
     # compute exploration directions (unnormalized) by taking the null space of image in eq(3)
     # TODO: this part is mainly copied from Adriana's implementation, to be checked
     # NOTE: seems useless to solve for d_alpha and d_beta, maybe need to consider all possible situations in null_space computation
-    alpha_const = np.concatenate([np.ones(n_obj), np.zeros(n_active_const + n_var)])
-    if n_active_const > 0:
-        comp_slack_const = np.column_stack([np.zeros((n_active_const, n_obj + n_active_const)), DG])
-        DxHx = np.vstack([alpha_const, comp_slack_const, np.column_stack([DF.T, DG.T, H])])
-    else:
-        DxHx = np.vstack([alpha_const, np.column_stack([DF.T, H])])
-    directions = null_space(DxHx)
-
-    # eliminate numerical error
-    eps = 1e-8
-    directions[np.abs(directions) < eps] = 0.0
-    return directions
+    # samples with the same number of active constraints share the matrix shape, so their SVDs are batched together
+    directions_all = [None] * N
+    for n_active_const in np.unique(n_active_const_all):
+        indices = np.where(n_active_const_all == n_active_const)[0]
+        n_sample = len(indices)
+
+        # jacobian matrix of active box constraints (1/-1 at active locations, otherwise 0), shape = (n_sample, n_active_const, n_var)
+        rows, cols = np.nonzero(active[indices])
+        DG = np.zeros((n_sample, n_active_const, n_var))
+        DG[rows, np.tile(np.arange(n_active_const), n_sample), cols] = np.where(upper_active[indices][rows, cols], 1.0, -1.0)
+
+        n_row, n_col = 1 + n_active_const + n_var, n_obj + n_active_const + n_var
+        DxHx = np.zeros((n_sample, n_row, n_col))
+        DxHx[:, 0, :n_obj] = 1.0 # alpha constraint
+        DxHx[:, 1:1 + n_active_const, n_obj + n_active_const:] = DG # complementary slackness constraint
+        DxHx[:, 1 + n_active_const:, :n_obj] = DF[indices].transpose(0, 2, 1)
+        DxHx[:, 1 + n_active_const:, n_obj:n_obj + n_active_const] = DG.transpose(0, 2, 1)
+        DxHx[:, 1 + n_active_const:, n_obj + n_active_const:] = H[indices]
+
+        # null space by batched SVD (same tolerance as scipy.linalg.null_space)
+        _, singular_values, vh = np.linalg.svd(DxHx, full_matrices=True)
+        tol = np.max(singular_values, axis=1) * max(n_row, n_col) * np.finfo(float).eps
+        n_nonzero = np.sum(singular_values > tol[:, None], axis=1)
+
+        for i, idx in enumerate(indices):
+            directions = vh[i, n_nonzero[i]:].T.copy()
+            # eliminate numerical error
+            directions[np.abs(directions) < eps] = 0.0
+            directions_all[idx] = directions
+
+    return directions_all
 
 
 def _first_order_approximation(x_opt, directions, bounds, constr_func, n_grid_sample):
@@ -296,49 +436,72 @@ def _first_order_approximation(x_opt, directions, bounds, constr_func, n_grid_sa
     return x_samples
 
 
-def _pareto_discover(xs, eval_func, bounds, constr_func, delta_s, origin, origin_constant, n_grid_sample, queue):
+def _pareto_discover(problem, xs, bounds, use_constr, delta_s, origin, origin_constant, n_grid_sample, hessian='exact'):
     '''
     Local optimization and first-order approximation.
     (We move these functions out from the ParetoDiscovery class for parallelization)
     Input:
+        problem: the surrogate problem, kept by the solver worker pool
         xs: a batch of samples x, shape = (batch_size, n_var)
-        eval_func: problem's evaluation function
         bounds: problem's lower and upper bounds, shape = (2, n_var)
-        constr_func: problem's constraint evaluation function
+        use_constr: whether the problem has constraints other than bounds
         delta_s: scaling factor for choosing reference point in local optimization, see section 6.2.3
         origin: origin of performance buffer
         origin_constant: when evaluted value surpasses the buffer origin, adjust the origin accordingly and subtract this constant
         n_grid_sample: number of samples on local manifold (grid), see section 6.3.1
-        queue: the queue storing results from all processes
-    Output (stored in queue):
+        hessian: how to compute the exploration directions, 'exact' or 'hvp' (see _get_optimization_directions_batch)
+    Output:
         x_samples_all: all valid samples from local manifold (grid)
         patch_ids: patch ids for all valid samples (same id when expanded from same x)
         sample_num: number of input samples (needed for counting global patch ids)
         new_origin: new origin point for performance buffer
     '''
-    # evaluate samples x and adjust origin accordingly
-    ys = eval_func(xs, return_values_of=['F'])
+    eval_func = problem.evaluate
+    constr_func = problem.evaluate_constraint if use_constr else None
+
+    # evaluate samples x (with jacobians for starting the local optimization) and adjust origin accordingly
+    ys, dys = eval_func(xs, return_values_of=['F', 'dF'])
     new_origin = np.minimum(origin, np.min(ys, axis=0))
     if (new_origin != origin).any():
         new_origin -= origin_constant
     fs = ys - new_origin
 
-    x_samples_all = []
-    patch_ids = []
+    x_opts, DF_opts = [], []
     for i, (x, y, f) in enumerate(zip(xs, ys, fs)):
 
+        # evaluations are shared by the objective and the jacobian in local optimization
+        evaluator = _MemoizedEvaluator(eval_func)
+        evaluator.seed(x, y, dys[i] if dys is not None else None)
+
         # local optimization by optimizing eq(4)
-        x_opt = _local_optimization(x, y, f, eval_func, bounds, constr_func, delta_s)
+        x_opt = _local_optimization(x, y, f, evaluator, bounds, constr_func, delta_s)
+        x_opts.append(x_opt)
 
-        # get directions to expand in local manifold
-        directions = _get_optimization_directions(x_opt, eval_func, bounds)
+        # the jacobian at the optimum is usually memoized by the last step of local optimization
+        DF_opts.append(evaluator.get(x_opt)[1])
+    x_opts = np.array(x_opts)
+
+    # evaluate the jacobians not memoized, for all those samples at once
+    missing = [i for i, DF_opt in enumerate(DF_opts) if DF_opt is None]
+    if len(missing) > 0:
+        DF_missing = eval_func(x_opts[missing], return_values_of=['dF'])
+        for i, DF_opt in zip(missing, DF_missing):
+            DF_opts[i] = DF_opt
+    DF_opts = np.array(DF_opts)
+
+    # get directions to expand in local manifold, for all samples at once
+    directions_all = _get_optimization_directions_batch(x_opts, DF_opts, eval_func, bounds, hessian)
+
+    x_samples_all = []
+    patch_ids = []
+    for i, (x_opt, directions) in enumerate(zip(x_opts, directions_all)):
 
         # get new valid samples from local manifold
         x_samples = _first_order_approximation(x_opt, directions, bounds, constr_func, n_grid_sample)
         x_samples_all.append(x_samples)
         patch_ids.extend([i] * len(x_samples))
 
-    queue.put([np.vstack(x_samples_all), patch_ids, len(xs), new_origin])
+    return np.vstack(x_samples_all), patch_ids, len(xs), new_origin
 
 
 class ParetoDiscoveryAlgorithm(Algorithm):
@@ -358,9 +521,11 @@ class ParetoDiscoveryAlgorithm(Algorithm):
                 buffer_origin_constant=1e-2,
                 delta_b=0.2,
                 label_cost=10,
+                label_top_k=3,
                 delta_p=10,
                 delta_s=0.3,
                 n_grid_sample=100,
+                hessian='exact',
                 n_process=cpu_count(),
                 **kwargs
                 ):
@@ -374,9 +539,11 @@ class ParetoDiscoveryAlgorithm(Algorithm):
             buffer_origin_constant: when evaluted value surpasses the buffer origin, adjust the origin accordingly and subtract this constant
             delta_b: unary energy normalization constant for sparse approximation, see section 6.4
             label_cost: for reducing number of unique labels in sparse approximation, see section 6.4
+            label_top_k: only patches among the k closest samples of some cell are candidate labels in sparse approximation
             delta_p: factor of perturbation in stochastic sampling, see section 6.2.2
             delta_s: scaling factor for choosing reference point in local optimization, see section 6.2.3
             n_grid_sample: number of samples on local manifold (grid), see section 6.3.1
+            hessian: 'exact' for using the hessian of performance to explore local manifold, 'hvp' for hessian-free approximation
             n_process: number of processes for parallelization
         '''
         super().__init__(**kwargs)
@@ -414,12 +581,15 @@ class ParetoDiscoveryAlgorithm(Algorithm):
                             'origin': buffer_origin,
                             'origin_constant': buffer_origin_constant,
                             'delta_b': delta_b,
-                            'label_cost': label_cost}
+                            'label_cost': label_cost,
+                            'label_top_k': label_top_k}
 
         self.delta_p = delta_p
         self.delta_s = delta_s
         self.n_grid_sample = n_grid_sample
+        self.hessian = hessian
         self.n_process = n_process
+        self.pool = None # persistent worker pool set by the solver, shared by all generations
         self.patch_id = 0
 
         self.constr_func = None
@@ -448,7 +618,7 @@ class ParetoDiscoveryAlgorithm(Algorithm):
 
         # initialize buffer
         self.buffer = get_buffer(self.problem.n_obj, **self.buffer_args)
-        patch_ids = np.full(self.pop_size, self.patch_id) # NOTE: patch_ids here might not make sense
+        patch_ids = np.full(len(pop_x), self.patch_id) # NOTE: patch_ids here might not make sense
         self.patch_id += 1
         self.buffer.insert(pop_x, pop_f, patch_ids)
 
@@ -487,25 +657,22 @@ class ParetoDiscoveryAlgorithm(Algorithm):
         # stochastic sampling by adding local perturbance
         xs = self._stochastic_sampling()
 
-        # parallelize core pareto discovery process by multiprocess, see _pareto_discover()
+        # parallelize core pareto discovery process by the solver worker pool, see _pareto_discover()
         # including select_direction, local_optimization, first_order_approximation in above algorithm illustration
-        x_batch = np.array_split(xs, self.n_process)
-        queue = Queue()
-        process_count = 0
-        for x in x_batch:
-            if len(x) > 0:
-                p = Process(target=_pareto_discover, 
-                    args=(x, self.problem.evaluate, [self.problem.xl, self.problem.xu], self.constr_func, self.delta_s, 
-                        self.buffer.origin, self.buffer.origin_constant, self.n_grid_sample, queue))
-                p.start()
-                process_count += 1
+        x_batch = [x for x in np.array_split(xs, self.n_process) if len(x) > 0]
+        args_list = [(x, [self.problem.xl, self.problem.xu], self.constr_func is not None, self.delta_s, 
+            self.buffer.origin, self.buffer.origin_constant, self.n_grid_sample, self.hessian) for x in x_batch]
+        if self.pool is None:
+            with SolverPool(self.problem, self.n_process) as pool:
+                results = pool.map(_pareto_discover, args_list)
+        else:
+            results = self.pool.map(_pareto_discover, args_list)
 
         # gather results (new samples, new patch ids, new origin of performance buffer) from parallel discovery
         new_origin = self.buffer.origin
         x_samples_all = []
         patch_ids_all = []
-        for _ in range(process_count):
-            x_samples, patch_ids, sample_num, origin = queue.get()
+        for x_samples, patch_ids, sample_num, origin in results:
             if x_samples is not None:
                 x_samples_all.append(x_samples)
                 patch_ids_all.append(np.array(patch_ids) + self.patch_id) # assign corresponding global patch ids to samples
@@ -619,20 +786,30 @@ class ParetoDiscovery(Solver):
     Solver based on ParetoDiscovery [Schulz et al. 2018].
     NOTE: only compatible with direct selection.
     '''
-    def __init__(self, problem, n_gen=10, pop_size=100, n_process=cpu_count(), **kwargs): # TODO: check n_gen
-        super().__init__(problem)
+    def __init__(self, problem, n_gen=10, pop_size=100, n_process=cpu_count(), hessian='exact', **kwargs): # TODO: check n_gen
+        super().__init__(problem, **kwargs)
         self.n_gen = n_gen
-        self.algo = ParetoDiscoveryAlgorithm(pop_size=pop_size, n_process=n_process)
+        self.pop_size = pop_size
+        self.n_process = n_process
+        self.algo = ParetoDiscoveryAlgorithm(pop_size=pop_size, n_process=n_process, hessian=hessian)
 
     def _solve(self, X, Y, batch_size):
-        # initialize population
+        # initialize population, merged with the final population of the previous solve if warm started
+        X_prev = self._load_population(X.shape[1], self.pop_size)
+        if X_prev is not None:
+            X = np.vstack([X, X_prev])
         X = np.vstack([X, lhs(X.shape[1], batch_size)])
         self.algo.initialization.sampling = X
 
-        res = minimize_ea(self.problem, self.algo, ('n_gen', self.n_gen))
+        with SolverPool(self.problem, self.n_process) as pool:
+            self.algo.pool = pool
+            res = minimize_ea(self.problem, self.algo, ('n_gen', self.n_gen))
+            self.algo.pool = None
 
         X_candidate, Y_candidate = res.pop.get('X'), res.pop.get('F')
         algo = res.algorithm
+        if self.warm_start:
+            self._save_population(algo.buffer.sample(self.pop_size), algo.approx_set)
         
         curr_pfront = find_pareto_front(Y)
         ref_point = np.max(np.vstack([Y, Y_candidate]), axis=0)
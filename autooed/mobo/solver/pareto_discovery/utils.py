@@ -1,5 +1,6 @@
 import numpy as np
-from pymoo.factory import get_performance_indicator
+
+from autooed.utils.hypervolume import greedy_hypervolume_selection
 
 
 def propose_next_batch(curr_pfront, ref_point, pred_pfront, pred_pset, batch_size, labels):
@@ -31,46 +32,16 @@ def propose_next_batch(curr_pfront, ref_point, pred_pfront, pred_pset, batch_siz
     '''
     #assert len(pred_pset) >= batch_size, "predicted pareto set is smaller than proposed batch size!"
 
-    curr_pfront = curr_pfront.copy()
-    hv = get_performance_indicator('hv', ref_point=ref_point)
-    idx_choices = np.ma.array(np.arange(len(pred_pset)), mask=False) # mask array for index choices
-    iter_idx_choices = np.ma.array(np.arange(len(pred_pset)), mask=False) # mask array for index choices of unvisited family samples
     next_batch_indices = []
-    family_lbls_next = []
-    num_families = len(np.unique(labels))
-    # print('Number of families is: '+str(num_families))
 
     if len(pred_pset) < batch_size:
         # print('Predicted pareto set is smaller than proposed batch size and has '+ str(len(pred_pset)) +' points.')
         next_batch_indices = [0] * (batch_size - len(pred_pset))
         batch_size = len(pred_pset)
 
-    # greedily select indices that maximize hypervolume contribution
-    for _ in range(batch_size):
-        #if all families were visited, start new cycle
-        if len(iter_idx_choices.compressed())==0:
-            iter_idx_choices = idx_choices.copy()
-        curr_hv = hv.calc(curr_pfront)
-        max_hv_contrib = 0.
-        max_hv_idx = -1
-        for idx in iter_idx_choices.compressed():
-            # calculate hypervolume contribution
-            new_hv = hv.calc(np.vstack([curr_pfront, pred_pfront[idx]]))
-            hv_contrib = new_hv - curr_hv
-            if hv_contrib > max_hv_contrib:
-                max_hv_contrib = hv_contrib
-                max_hv_idx = idx
-        if max_hv_idx == -1: # if all candidates have no hypervolume contribution, just randomly select one
-            max_hv_idx = np.random.choice(iter_idx_choices.compressed())
-
-        idx_choices.mask[max_hv_idx] = True # mask as selected
-        curr_pfront = np.vstack([curr_pfront, pred_pfront[max_hv_idx]]) # add to current pareto front
-        next_batch_indices.append(max_hv_idx)
-        family_lbls_next.append(labels[max_hv_idx])
-        #find which family to mask all family memebers as visited in this cycle
-        family_ids = np.where(labels == labels[max_hv_idx])[0]
-        for fid in family_ids:
-            iter_idx_choices.mask[fid] = True
+    # greedily select indices that maximize hypervolume contribution, visiting each family once per cycle
+    next_batch_indices += greedy_hypervolume_selection(curr_pfront, pred_pfront, ref_point, batch_size, labels=labels)
+    family_lbls_next = [labels[idx] for idx in next_batch_indices[len(next_batch_indices) - batch_size:]]
 
     X_next = pred_pset[next_batch_indices].copy()
     Y_next = pred_pfront[next_batch_indices].copy()
@@ -99,9 +70,6 @@ def propose_next_batch_without_label(curr_pfront, ref_point, pred_pfront, pred_p
     '''
     #assert len(pred_pset) >= batch_size, "predicted pareto set is smaller than proposed batch size!
 
-    curr_pfront = curr_pfront.copy()
-    hv = get_performance_indicator('hv', ref_point=ref_point)
-    idx_choices = np.ma.array(np.arange(len(pred_pset)), mask=False) # mask array for index choices
     next_batch_indices = []
 
     if len(pred_pset) < batch_size:
@@ -110,23 +78,7 @@ def propose_next_batch_without_label(curr_pfront, ref_point, pred_pfront, pred_p
         batch_size = len(pred_pset)
 
     # greedily select indices that maximize hypervolume contribution
-    for _ in range(batch_size):
-        curr_hv = hv.calc(curr_pfront)
-        max_hv_contrib = 0.
-        max_hv_idx = -1
-        for idx in idx_choices.compressed():
-            # calculate hypervolume contribution
-            new_hv = hv.calc(np.vstack([curr_pfront, pred_pfront[idx]]))
-            hv_contrib = new_hv - curr_hv
-            if hv_contrib > max_hv_contrib:
-                max_hv_contrib = hv_contrib
-                max_hv_idx = idx
-        if max_hv_idx == -1: # if all candidates have no hypervolume contribution, just randomly select one
-            max_hv_idx = np.random.choice(idx_choices.compressed())
-
-        idx_choices.mask[max_hv_idx] = True # mask as selected
-        curr_pfront = np.vstack([curr_pfront, pred_pfront[max_hv_idx]]) # add to current pareto front
-        next_batch_indices.append(max_hv_idx)
+    next_batch_indices += greedy_hypervolume_selection(curr_pfront, pred_pfront, ref_point, batch_size)
 
     X_next = pred_pset[next_batch_indices].copy()
     Y_next = pred_pfront[next_batch_indices].copy()
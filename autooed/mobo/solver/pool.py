@@ -0,0 +1,116 @@
+'''
+Persistent worker pool for parallel solvers, where the surrogate problem is sent to each worker once and only work items are sent afterwards.
+'''
+
+import traceback
+from queue import Empty
+from multiprocess import Process, Queue, cpu_count
+
+
+def _pool_worker(problem, task_queue, result_queue):
+    '''
+    Worker loop, which keeps the surrogate problem received at start-up and executes work items until receiving None.
+    '''
+    while True:
+        task = task_queue.get()
+        if task is None: break
+        idx, func, args = task
+        try:
+            result_queue.put((idx, func(problem, *args), None))
+        except Exception:
+            result_queue.put((idx, None, traceback.format_exc()))
+
+
+class SolverPool:
+    '''
+    Pool of worker processes that live for the duration of a solve.
+    Work functions are called as func(problem, *args), so that the fitted surrogate problem is not pickled again for every work item.
+    '''
+    def __init__(self, problem, n_process=cpu_count()):
+        '''
+        Parameters
+        ----------
+        problem: autooed.mobo.surrogate_problem.SurrogateProblem
+            The surrogate problem shared by all work items.
+        n_process: int
+            Number of worker processes (if 1 then work items are executed in the current process).
+        '''
+        self.problem = problem
+        self.n_process = max(1, n_process)
+        self.workers = []
+        self.task_queue, self.result_queue = None, None
+
+    def _start(self, n_task):
+        '''
+        Start the worker processes lazily, when the first parallel work items are submitted.
+        '''
+        self.task_queue, self.result_queue = Queue(), Queue()
+        for _ in range(min(self.n_process, n_task)):
+            worker = Process(target=_pool_worker, args=(self.problem, self.task_queue, self.result_queue), daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def map(self, func, args_list):
+        '''
+        Execute work items in parallel.
+
+        Parameters
+        ----------
+        func: function
+            Module-level work function, called as func(problem, *args).
+        args_list: list
+            Arguments of each work item.
+
+        Returns
+        -------
+        list
+            Results of the work items, in the same order as args_list.
+        '''
+        if self.n_process == 1 or len(args_list) <= 1:
+            return [func(self.problem, *args) for args in args_list]
+
+        if self.workers == []:
+            self._start(len(args_list))
+
+        for idx, args in enumerate(args_list):
+            self.task_queue.put((idx, func, args))
+
+        results = [None] * len(args_list)
+        n_remain = len(args_list)
+        while n_remain > 0:
+            try:
+                idx, result, error = self.result_queue.get(timeout=1)
+            except Empty:
+                if not all([worker.is_alive() for worker in self.workers]):
+                    self.close()
+                    raise Exception('solver worker exited unexpectedly')
+                continue
+            if error is not None:
+                self.close()
+                raise Exception(f'solver worker failed:\n{error}')
+            results[idx] = result
+            n_remain -= 1
+        return results
+
+    def close(self):
+        '''
+        Stop the worker processes.
+        '''
+        for worker in self.workers:
+            if worker.is_alive():
+                self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=1)
+            if worker.is_alive():
+                worker.terminate()
+        self.workers = []
+
+    def __deepcopy__(self, memo):
+        # algorithms are deep-copied by pymoo before solving, the copies share the same pool
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
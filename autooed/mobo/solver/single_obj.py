@@ -9,6 +9,7 @@ from pymoo.optimize import minimize
 
 from autooed.utils.sampling import lhs
 from autooed.mobo.solver.base import Solver
+from autooed.mobo.solver.mutation import get_solver_mutation
 
 
 class GA(Solver):
@@ -17,7 +18,7 @@ class GA(Solver):
     '''
     def __init__(self, problem, pop_size=200, **kwargs):
         super().__init__(problem)
-        self.algo = GAAlgo(pop_size=pop_size)
+        self.algo = GAAlgo(pop_size=pop_size, mutation=get_solver_mutation(self.transformation))
 
     def _solve(self, X, Y, batch_size):
 
@@ -1,3 +1,4 @@
 from autooed.mobo.surrogate_model.gp import GaussianProcess
 from autooed.mobo.surrogate_model.nn import NeuralNetwork
 from autooed.mobo.surrogate_model.bnn import BayesianNeuralNetwork
+from autooed.mobo.surrogate_model.cost import CostModel
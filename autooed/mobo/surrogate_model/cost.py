@@ -0,0 +1,90 @@
+'''
+Surrogate model that predicts the evaluation cost (i.e. running time) of given design variables.
+'''
+
+import numpy as np
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+from autooed.utils.normalization import StandardNormalization
+
+
+class CostModel:
+    '''
+    Gaussian process fitted on the log evaluation cost, so that the predicted cost is always positive.
+    '''
+    def __init__(self, problem):
+        '''
+        Initialize a cost model.
+
+        Parameters
+        ----------
+        problem: autooed.problem.Problem
+            The optimization problem.
+        '''
+        self.n_var = problem.n_var
+        self.bounds = np.array([problem.xl, problem.xu])
+        self.transformation = problem.transformation
+        self.normalization = StandardNormalization(self.bounds)
+
+        kernel = ConstantKernel(constant_value=1.0, constant_value_bounds=(1e-3, 1e3)) * \
+            Matern(length_scale=np.ones(self.n_var), length_scale_bounds=(np.sqrt(1e-3), np.sqrt(1e3)), nu=2.5) + \
+            WhiteKernel(noise_level=1e-2, noise_level_bounds=(1e-6, 1e0))
+        self.gp = GaussianProcessRegressor(kernel=kernel)
+        self.fitted = False
+
+    def fit(self, X, C, dtype='raw'):
+        '''
+        Fit the cost model from data, the model stays unfitted if there are less than 2 valid costs.
+
+        Parameters
+        ----------
+        X: np.array
+            Input design variables.
+        C: np.array
+            Evaluation costs (in seconds) of the design variables, invalid ones are NaN.
+        '''
+        assert dtype in ['raw', 'continuous'], f'Undefined data type {dtype} in cost model fitting'
+
+        C = np.array(C, dtype=float).flatten()
+        valid_idx = np.where(np.logical_and(np.isfinite(C), C > 0))[0]
+        if len(valid_idx) < 2:
+            self.fitted = False
+            return
+
+        X, C = X[valid_idx], C[valid_idx]
+        if dtype == 'raw':
+            X = self.transformation.do(X)
+
+        self.normalization.fit(X, np.log(C).reshape(-1, 1))
+        X, log_C = self.normalization.do(x=X, y=np.log(C).reshape(-1, 1))
+
+        self.gp.fit(X, log_C.flatten())
+        self.fitted = True
+
+    def predict(self, X, dtype='raw'):
+        '''
+        Predict the evaluation cost of given design variables (all ones if not fitted).
+
+        Parameters
+        ----------
+        X: np.array
+            Input design variables.
+
+        Returns
+        -------
+        np.array
+            Predicted evaluation costs (in seconds), shape (N,).
+        '''
+        assert dtype in ['raw', 'continuous'], f'Undefined data type {dtype} in cost model prediction'
+
+        if not self.fitted:
+            return np.ones(len(X))
+
+        if dtype == 'raw':
+            X = self.transformation.do(X)
+
+        X = self.normalization.do(x=X)
+        log_C = self.gp.predict(X).reshape(-1, 1)
+        C = np.exp(self.normalization.undo(y=log_C)).flatten()
+        return C
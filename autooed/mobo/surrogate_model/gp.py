@@ -41,6 +41,8 @@ class Matern(MaternKernel):
         elif self.nu == 2.5:
             K = dists * math.sqrt(5)
             K = (1. + K + K ** 2 / 3.0) * np.exp(-K)
+        elif self.nu == np.inf:
+            K = np.exp(-dists ** 2 / 2.0)
         else:  # general case; expensive to evaluate
             K = dists
             K[K == 0.0] += np.finfo(float).eps  # strict zeros result in nan
@@ -77,6 +79,8 @@ class Matern(MaternKernel):
             elif self.nu == 2.5:
                 tmp = np.sqrt(5 * D.sum(-1))[..., np.newaxis]
                 K_gradient = 5.0 / 3.0 * D * (tmp + 1) * np.exp(-tmp)
+            elif self.nu == np.inf:
+                K_gradient = K[..., np.newaxis] * D
             else:
                 # approximate gradient numerically
                 def f(theta):  # helper function
@@ -91,6 +95,58 @@ class Matern(MaternKernel):
             return K
 
 
+class CategoricalMatern(Matern):
+    '''
+    Matern kernel on continuous variables multiplied by an overlap (Hamming distance) kernel on integer-coded categorical variables.
+    '''
+    def __init__(self, length_scale=1.0, length_scale_bounds=(1e-5, 1e5), nu=1.5, cat_idx=()):
+        super().__init__(length_scale=length_scale, length_scale_bounds=length_scale_bounds, nu=nu)
+        self.cat_idx = cat_idx
+
+    def __call__(self, X, Y=None, eval_gradient=False):
+        X = np.atleast_2d(X)
+        if eval_gradient and Y is not None:
+            raise ValueError(
+                "Gradient can only be evaluated when Y is None.")
+        length_scale = np.broadcast_to(_check_length_scale(X, self.length_scale), (X.shape[1],))
+        cat_mask = np.zeros(X.shape[1], dtype=bool)
+        cat_mask[np.array(self.cat_idx, dtype=int)] = True
+        cont_mask = ~cat_mask
+        Y_ = X if Y is None else Y
+
+        # Matern kernel on continuous variables
+        if cont_mask.any():
+            cont_kernel = Matern(length_scale=length_scale[cont_mask], length_scale_bounds=self.length_scale_bounds, nu=self.nu)
+            if eval_gradient:
+                K_cont, K_cont_gradient = cont_kernel(X[:, cont_mask], eval_gradient=True)
+            else:
+                K_cont = cont_kernel(X[:, cont_mask], None if Y is None else Y[:, cont_mask])
+        else:
+            K_cont = np.ones((X.shape[0], Y_.shape[0]))
+            K_cont_gradient = np.empty((X.shape[0], Y_.shape[0], 0))
+
+        # overlap kernel on categorical variables
+        mismatch = (np.abs(X[:, np.newaxis, cat_mask] - Y_[np.newaxis, :, cat_mask]) > 1e-8).astype(float)
+        K_cat = np.exp(-np.sum(mismatch / length_scale[cat_mask], axis=-1))
+
+        K = K_cont * K_cat
+
+        if not eval_gradient:
+            return K
+
+        if self.hyperparameter_length_scale.fixed:
+            return K, np.empty((X.shape[0], X.shape[0], 0))
+
+        K_gradient = np.empty((X.shape[0], X.shape[0], X.shape[1]))
+        K_gradient[..., cont_mask] = K_cont_gradient * K_cat[..., np.newaxis]
+        K_gradient[..., cat_mask] = K[..., np.newaxis] * mismatch / length_scale[cat_mask]
+
+        if not self.anisotropic:
+            return K, K_gradient.sum(-1)[..., np.newaxis]
+        else:
+            return K, K_gradient
+
+
 def constrained_optimization(obj_func, initial_theta, bounds):
     '''
     Customized version of constrained optimization to avoid convergence warning.
@@ -121,8 +177,15 @@ class GaussianProcess(SurrogateModel):
         self.nu = nu
         self.gps = []
 
+        # integer-coded categorical variables are handled by an overlap kernel
+        self.cat_idx = self.transformation.cat_idx
+        self.cont_mask = np.ones(self.n_var, dtype=bool)
+        self.cont_mask[self.cat_idx] = False
+
         for _ in range(self.n_obj):
-            if nu > 0:
+            if len(self.cat_idx) > 0:
+                main_kernel = CategoricalMatern(length_scale=np.ones(self.n_var), length_scale_bounds=(np.sqrt(1e-3), np.sqrt(1e3)), nu=0.5 * nu if nu > 0 else np.inf, cat_idx=self.cat_idx)
+            elif nu > 0:
                 main_kernel = Matern(length_scale=np.ones(self.n_var), length_scale_bounds=(np.sqrt(1e-3), np.sqrt(1e3)), nu=0.5 * nu)
             else:
                 main_kernel = RBF(length_scale=np.ones(self.n_var), length_scale_bounds=(np.sqrt(1e-3), np.sqrt(1e3)))
@@ -172,9 +235,17 @@ class GaussianProcess(SurrogateModel):
 
             ell = np.exp(gp.kernel_.theta[1:-1]) # ell: shape (n_var,)
             sf2 = np.exp(gp.kernel_.theta[0]) # sf2: shape (1,)
-            d = np.expand_dims(cdist(X / ell, gp.X_train_ / ell), 2) # d: shape (N, N_train, 1)
             X_, X_train_ = np.expand_dims(X, 1), np.expand_dims(gp.X_train_, 0)
-            dd_N = X_ - X_train_ # numerator
+            if len(self.cat_idx) > 0:
+                # only continuous variables contribute to the distance and the derivatives
+                dd_N = (X_ - X_train_) * self.cont_mask # numerator
+                d = np.sqrt(np.sum(np.square(dd_N / ell), axis=2, keepdims=True)) # d: shape (N, N_train, 1)
+                # overlap kernel on categorical variables as a multiplicative factor
+                mismatch = np.abs(X_[..., self.cat_idx] - X_train_[..., self.cat_idx]) > 1e-8
+                K_cat = np.expand_dims(np.exp(-np.sum(mismatch / ell[self.cat_idx], axis=2)), 2) # K_cat: shape (N, N_train, 1)
+            else:
+                d = np.expand_dims(cdist(X / ell, gp.X_train_ / ell), 2) # d: shape (N, N_train, 1)
+                dd_N = X_ - X_train_ # numerator
             dd_D = d * ell ** 2 # denominator
             dd = safe_divide(dd_N, dd_D) # dd: shape (N, N_train, n_var)
 
@@ -190,6 +261,8 @@ class GaussianProcess(SurrogateModel):
             else: # RBF
                 dK = -sf2 * np.exp(-0.5 * d ** 2) * d * dd
 
+            if len(self.cat_idx) > 0:
+                dK = dK * K_cat
             dK_T = dK.transpose(0, 2, 1) # dK: shape (N, N_train, n_var), dK_T: shape (N, n_var, N_train)
                 
             if gradient:
@@ -225,6 +298,8 @@ class GaussianProcess(SurrogateModel):
                 else: # RBF
                     hK = -sf2 * np.exp(-0.5 * d ** 2) * ((1 - d ** 2) * dd ** 2 + d * hd)
 
+                if len(self.cat_idx) > 0:
+                    hK = hK * np.expand_dims(K_cat, 3) * np.outer(self.cont_mask, self.cont_mask)
                 hK_T = hK.transpose(0, 2, 3, 1) # hK: shape (N, N_train, n_var, n_var), hK_T: shape (N, n_var, n_var, N_train)
 
                 hy_mean = hK_T @ gp.alpha_ # hy_mean: shape (N, n_var, n_var)
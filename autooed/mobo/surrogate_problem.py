@@ -44,12 +44,17 @@ class SurrogateProblem(Problem):
         hessian: bool
             Whether to calculate the hessian of performance.
         '''
-        # evaluate F, dF, hF by acquisition function
-        out['F'], out['dF'], out['hF'] = self.acquisition.evaluate(X, dtype='continuous', gradient=gradient, hessian=hessian)
+        # snap integer-coded categorical variables to valid choices
+        X = self.transformation.project(X)
+
+        # evaluate F, dF, hF by acquisition function (the hessian is computed from the gradient by chain rule, so it needs the gradient)
+        out['F'], out['dF'], out['hF'] = self.acquisition.evaluate(X, dtype='continuous', gradient=gradient or hessian, hessian=hessian)
         
         # evaluate cheap constraints by real problem
         X_raw = self.transformation.undo(X)
-        out['G'] = np.array([self.problem.evaluate_constraint(x_raw) for x_raw in X_raw])
+        G = self.problem.evaluate_constraint_batch(X_raw)
+        if G is not None:
+            out['G'] = G
 
     def evaluate(self, X, *args, return_values_of="auto", return_as_dictionary=False, **kwargs):
         '''
@@ -184,11 +189,7 @@ class SurrogateProblem(Problem):
         if X.ndim == 1:
             return self.problem.evaluate_constraint(X)
         elif X.ndim == 2:
-            G = np.array([self.problem.evaluate_constraint(x) for x in X])
-            if None in G:
-                return None
-            else:
-                return G
+            return self.problem.evaluate_constraint_batch(X)
         else:
             raise NotImplementedError
 
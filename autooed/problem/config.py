@@ -71,7 +71,7 @@ def check_config(config):
     # key
     for key in config:
         assert key in ['name', 'type', 
-            'n_var', 'var_name', 'var_lb', 'var_ub', 'var_choices', 'var', 
+            'n_var', 'var_name', 'var_lb', 'var_ub', 'var_choices', 'var', 'encoding',
             'n_obj', 'obj_name', 'obj_type', 'obj_func', 
             'n_constr', 'constr_func'], f'invalid key {key} in config dictionary'
 
@@ -186,6 +186,10 @@ def check_config(config):
             elif var_info['type'] == 'categorical':
                 assert is_iterable(var_info['choices']), f'invalid choices of variable {var_name}'
                 assert len(var_info['choices']) == len(np.unique(var_info['choices'])), f'duplicates in the choices of variable {var_name}'
+
+    if 'encoding' in config and config['encoding'] is not None:
+        assert config['type'] in ['categorical', 'mixed'], 'encoding is only supported for categorical and mixed problems'
+        assert config['encoding'] in ['onehot', 'ordinal'], 'invalid encoding of categorical variables'
     
     if 'var_name' in config and config['var_name'] is not None:
         assert is_iterable(config['var_name']), 'invalid variable names'
@@ -267,12 +271,18 @@ def transform_config(config, check=False):
 
     elif config['type'] == 'categorical':
         if 'var' in config:
-            new_config['n_var'] = np.sum([len(var_info['choices']) for var_info in config['var'].values()])
+            len_choices = [len(var_info['choices']) for var_info in config['var'].values()]
         else:
-            new_config['n_var'] = len(config['var_choices']) * config['n_var']
+            len_choices = [len(config['var_choices'])] * config['n_var']
 
-        new_config['xl'] = 0
-        new_config['xu'] = 1
+        if config.get('encoding') == 'ordinal':
+            new_config['n_var'] = len(len_choices)
+            new_config['xl'] = 0
+            new_config['xu'] = [n - 1 for n in len_choices]
+        else:
+            new_config['n_var'] = np.sum(len_choices)
+            new_config['xl'] = 0
+            new_config['xu'] = 1
 
     elif config['type'] == 'mixed':
         new_config['n_var'] = 0
@@ -290,6 +300,11 @@ def transform_config(config, check=False):
                 new_config['xl'].append(0)
                 new_config['xu'].append(1)
             
+            elif var_info['type'] == 'categorical' and config.get('encoding') == 'ordinal':
+                new_config['n_var'] += 1
+                new_config['xl'].append(0)
+                new_config['xu'].append(len(var_info['choices']) - 1)
+
             elif var_info['type'] == 'categorical':
                 len_choices = len(var_info['choices'])
                 new_config['n_var'] += len_choices
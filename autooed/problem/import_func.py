@@ -1,9 +1,14 @@
 import os, sys
 import importlib
+import hashlib
 import ctypes
 import numpy as np
 
 
+# loaded c/cpp libraries, keyed by library path
+c_lib_cache = {}
+
+
 def import_python_func(path, module_name, func_name):
     '''
     Import python function from path
@@ -14,9 +19,39 @@ def import_python_func(path, module_name, func_name):
     return getattr(module, func_name)
 
 
+def compile_c_lib(path, lib_name):
+    '''
+    Compile c/cpp source to a shared library, reuse the cached library if the source is unchanged
+    '''
+    # decide compiler
+    if path.endswith('c'):
+        compiler = 'gcc'
+    elif path.endswith('cpp'):
+        compiler = 'g++'
+    else:
+        raise NotImplementedError
+
+    # cache key from source content and compiler
+    with open(path, 'rb') as fp:
+        source_hash = hashlib.sha256(fp.read() + compiler.encode()).hexdigest()[:16]
+    lib_path = os.path.join(os.path.dirname(path), f'{lib_name}_{source_hash}.so')
+    if os.path.exists(lib_path):
+        return lib_path
+
+    # compile to a temporary file first since multiple workers may compile at the same time
+    tmp_lib_path = f'{lib_path}.{os.getpid()}.tmp'
+    os.system(f'{compiler} -shared -fPIC -O2 -o "{tmp_lib_path}" "{path}"')
+    if not os.path.exists(tmp_lib_path):
+        raise Exception('Failed to compile the library, make sure you have gcc or g++ installed on your computer')
+    os.replace(tmp_lib_path, lib_path)
+    return lib_path
+
+
 def import_c_func(path, lib_name, func_name, n_in, n_out, dtype='float'):
     '''
-    Import c/cpp function from path
+    Import c/cpp function from path.
+    If the library also provides {func_name}_batch(X, n, Y) where X is (n, n_in) and Y is (n, n_out) in row-major order,
+    the batch version is attached to the returned function as its "batch" attribute.
     '''
     # type conversion
     if dtype == 'float':
@@ -34,23 +69,34 @@ def import_c_func(path, lib_name, func_name, n_in, n_out, dtype='float'):
     if path.endswith('so'):
         lib_path = path
     else:
-        # decide compiler
-        if path.endswith('c'):
-            compiler = 'gcc'
-        elif path.endswith('cpp'):
-            compiler = 'g++'
-        else:
-            raise NotImplementedError
-        # compile
-        lib_path = os.path.join(os.path.dirname(path), lib_name + '.so')
-        os.system(f'{compiler} -shared -o {lib_path} {path}')
-        if not os.path.exists(lib_path):
-            raise Exception('Failed to compile the library, make sure you have gcc or g++ installed on your computer')
-
-    c_lib = ctypes.CDLL(lib_path)
-    getattr(c_lib, func_name).argtypes = (np.ctypeslib.ndpointer(dtype=c_type, shape=(n_in,)),)
-    getattr(c_lib, func_name).restype = np.ctypeslib.ndpointer(dtype=c_type, shape=(n_out,))
-    return lambda x: getattr(c_lib, func_name)(np.array(x, dtype=py_type))
+        lib_path = compile_c_lib(path, lib_name)
+
+    if lib_path not in c_lib_cache:
+        c_lib_cache[lib_path] = ctypes.CDLL(lib_path)
+    c_lib = c_lib_cache[lib_path]
+
+    c_func = getattr(c_lib, func_name)
+    c_func.argtypes = (np.ctypeslib.ndpointer(dtype=c_type, shape=(n_in,)),)
+    c_func.restype = np.ctypeslib.ndpointer(dtype=c_type, shape=(n_out,))
+    eval_func = lambda x: c_func(np.array(x, dtype=py_type))
+
+    # optional batch calling convention
+    if hasattr(c_lib, func_name + '_batch'):
+        c_batch_func = getattr(c_lib, func_name + '_batch')
+        c_batch_func.argtypes = (np.ctypeslib.ndpointer(dtype=c_type, ndim=2, flags='C_CONTIGUOUS'), ctypes.c_int,
+            np.ctypeslib.ndpointer(dtype=c_type, ndim=2, flags='C_CONTIGUOUS'))
+        c_batch_func.restype = None
+
+        def eval_batch_func(X):
+            X = np.ascontiguousarray(np.atleast_2d(X), dtype=py_type)
+            assert X.shape[1] == n_in, f'input dimension mismatch, expected {n_in} but got {X.shape[1]}'
+            Y = np.empty((X.shape[0], n_out), dtype=py_type)
+            c_batch_func(X, X.shape[0], Y)
+            return Y
+
+        eval_func.batch = eval_batch_func
+
+    return eval_func
 
 
 class MatlabEngine:
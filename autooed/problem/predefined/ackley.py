@@ -15,11 +15,11 @@ class Ackley(Problem):
         self.b = 1/5
         self.c = 2 * np.pi
     
-    def evaluate_objective(self, x):
-        part1 = -1. * self.a * np.exp(-1. * self.b * np.sqrt((1. / self.n_var) * np.sum(x * x)))
-        part2 = -1. * np.exp((1. / self.n_var) * np.sum(np.cos(self.c * x)))
+    def evaluate_objective_batch(self, X):
+        part1 = -1. * self.a * np.exp(-1. * self.b * np.sqrt((1. / self.n_var) * np.sum(X * X, axis=1)))
+        part2 = -1. * np.exp((1. / self.n_var) * np.sum(np.cos(self.c * X), axis=1))
         f = part1 + part2 + self.a + np.exp(1)
-        return f,
+        return f[:, None]
 
     def _calc_pareto_front(self):
         return 0.
@@ -23,24 +23,24 @@ class DTLZ(Problem):
         super().__init__()
         self.k = self.n_var - self.n_obj + 1
 
-    def g1(self, x_m):
-        return 100 * (self.k + np.sum(np.square(x_m - 0.5) - np.cos(20 * np.pi * (x_m - 0.5))))
+    def g1(self, X_m):
+        return 100 * (self.k + np.sum(np.square(X_m - 0.5) - np.cos(20 * np.pi * (X_m - 0.5)), axis=1))
 
-    def g2(self, x_m):
-        return np.sum(np.square(x_m - 0.5))
+    def g2(self, X_m):
+        return np.sum(np.square(X_m - 0.5), axis=1)
 
-    def obj_func(self, x_, g, alpha=1):
+    def obj_func(self, X_, g, alpha=1):
         f = []
 
         for i in range(0, self.n_obj):
             _f = (1 + g)
-            _f *= np.prod(np.cos(np.power(x_[:x_.shape[0] - i], alpha) * np.pi / 2.0))
+            _f = _f * np.prod(np.cos(np.power(X_[:, :X_.shape[1] - i], alpha) * np.pi / 2.0), axis=1)
             if i > 0:
-                _f *= np.sin(np.power(x_[x_.shape[0] - i], alpha) * np.pi / 2.0)
+                _f = _f * np.sin(np.power(X_[:, X_.shape[1] - i], alpha) * np.pi / 2.0)
 
             f.append(_f)
 
-        f = np.array(f)
+        f = np.column_stack(f)
         return f
 
 
@@ -55,18 +55,18 @@ class DTLZ1(DTLZ):
         ref_dirs = get_reference_directions('das-dennis', n_dim=self.n_obj, **ref_kwargs)
         return 0.5 * ref_dirs
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = self.g1(x_m)
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = self.g1(X_m)
 
         f = []
         for i in range(0, self.n_obj):
             _f = 0.5 * (1 + g)
-            _f *= np.prod(x_[:x_.shape[0] - i])
+            _f = _f * np.prod(X_[:, :X_.shape[1] - i], axis=1)
             if i > 0:
-                _f *= 1 - x_[x_.shape[0] - i]
+                _f = _f * (1 - X_[:, X_.shape[1] - i])
             f.append(_f)
-        return f
+        return np.column_stack(f)
 
 
 class DTLZ2(DTLZ):
@@ -76,10 +76,10 @@ class DTLZ2(DTLZ):
         ref_dirs = get_reference_directions('das-dennis', n_dim=self.n_obj, **ref_kwargs)
         return generic_sphere(ref_dirs)
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = self.g2(x_m)
-        return self.obj_func(x_, g, alpha=1)
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = self.g2(X_m)
+        return self.obj_func(X_, g, alpha=1)
 
 
 class DTLZ3(DTLZ):
@@ -89,10 +89,10 @@ class DTLZ3(DTLZ):
         ref_dirs = get_reference_directions('das-dennis', n_dim=self.n_obj, **ref_kwargs)
         return generic_sphere(ref_dirs)
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = self.g1(x_m)
-        return self.obj_func(x_, g, alpha=1)
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = self.g1(X_m)
+        return self.obj_func(X_, g, alpha=1)
 
 
 class DTLZ4(DTLZ):
@@ -106,10 +106,10 @@ class DTLZ4(DTLZ):
         ref_dirs = get_reference_directions('das-dennis', n_dim=self.n_obj, **ref_kwargs)
         return generic_sphere(ref_dirs)
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = self.g2(x_m)
-        return self.obj_func(x_, g, alpha=self.alpha)
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = self.g2(X_m)
+        return self.obj_func(X_, g, alpha=self.alpha)
 
 
 class DTLZ5(DTLZ):
@@ -120,12 +120,12 @@ class DTLZ5(DTLZ):
         else:
             raise Exception("Not implemented yet.")
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = self.g2(x_m)
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = self.g2(X_m)
 
-        theta = 1 / (2 * (1 + g)) * (1 + 2 * g * x_)
-        theta = np.concatenate([x[:1], theta[1:]])
+        theta = 1 / (2 * (1 + g[:, None])) * (1 + 2 * g[:, None] * X_)
+        theta = np.concatenate([X[:, :1], theta[:, 1:]], axis=1)
 
         return self.obj_func(theta, g)
 
@@ -138,12 +138,12 @@ class DTLZ6(DTLZ):
         else:
             raise Exception("Not implemented yet.")
 
-    def evaluate_objective(self, x):
-        x_, x_m = x[:self.n_obj - 1], x[self.n_obj - 1:]
-        g = np.sum(np.power(x_m, 0.1))
+    def evaluate_objective_batch(self, X):
+        X_, X_m = X[:, :self.n_obj - 1], X[:, self.n_obj - 1:]
+        g = np.sum(np.power(X_m, 0.1), axis=1)
 
-        theta = 1 / (2 * (1 + g)) * (1 + 2 * g * x_)
-        theta = np.concatenate([x[:1], theta[1:]])
+        theta = 1 / (2 * (1 + g[:, None])) * (1 + 2 * g[:, None] * X_)
+        theta = np.concatenate([X[:, :1], theta[:, 1:]], axis=1)
 
         return self.obj_func(theta, g)
 
@@ -21,16 +21,24 @@ class RE(Problem, ABC):
 
 def closest_value(arr, val):
     '''
-    Get closest value to val in arr
+    Get closest value to (each element of) val in arr
     '''
-    return arr[np.argmin(np.abs(arr - val))]
+    return arr[np.argmin(np.abs(np.subtract.outer(val, arr)), axis=-1)]
 
 
 def div(x1, x2):
     '''
-    Divide x1 / x2, return 0 where x2 == 0
+    Divide x1 / x2 element-wise, return 0 where x2 == 0
     '''
-    return x1 / x2 if x2 != 0 else 0
+    x1, x2 = np.broadcast_arrays(np.asarray(x1, dtype=float), np.asarray(x2, dtype=float))
+    return np.divide(x1, x2, out=np.zeros_like(x1), where=x2 != 0)
+
+
+def constraint_violation(g):
+    '''
+    Sum of violations of constraints g >= 0, g is of shape (n_constr, N)
+    '''
+    return np.sum(np.maximum(-g, 0), axis=0)
 
 
 class RE1(RE):
@@ -46,8 +54,8 @@ class RE1(RE):
         'obj_name': ['structural volume', 'joint displacement'],
     }
 
-    def evaluate_objective(self, x):
-        x1, x2, x3, x4 = x[0], x[1], x[2], x[3]
+    def evaluate_objective_batch(self, X):
+        x1, x2, x3, x4 = X[:, 0], X[:, 1], X[:, 2], X[:, 3]
         
         F = 10
         E = 2e5
@@ -56,7 +64,7 @@ class RE1(RE):
         f1 = L * ((2 * x1) + np.sqrt(2.0) * x2 + np.sqrt(x3) + x4)
         f2 = (F * L) / E * (div(2.0, x1) + div(2.0 * np.sqrt(2.0), x2) - div(2.0 * np.sqrt(2.0), x3) + div(2.0, x4))
 
-        return f1, f2
+        return np.column_stack([f1, f2])
 
 
 class RE2(RE):
@@ -75,20 +83,17 @@ class RE2(RE):
 
     feasible_values = np.array([0.20, 0.31, 0.40, 0.44, 0.60, 0.62, 0.79, 0.80, 0.88, 0.93, 1.0, 1.20, 1.24, 1.32, 1.40, 1.55, 1.58, 1.60, 1.76, 1.80, 1.86, 2.0, 2.17, 2.20, 2.37, 2.40, 2.48, 2.60, 2.64, 2.79, 2.80, 3.0, 3.08, 3,10, 3.16, 3.41, 3.52, 3.60, 3.72, 3.95, 3.96, 4.0, 4.03, 4.20, 4.34, 4.40, 4.65, 4.74, 4.80, 4.84, 5.0, 5.28, 5.40, 5.53, 5.72, 6.0, 6.16, 6.32, 6.60, 7.11, 7.20, 7.80, 7.90, 8.0, 8.40, 8.69, 9.0, 9.48, 10.27, 11.0, 11.06, 11.85, 12.0, 13.0, 14.0, 15.0])
 
-    def evaluate_objective(self, x):
-        x1, x2, x3 = x[0], x[1], x[2]
+    def evaluate_objective_batch(self, X):
+        x1, x2, x3 = X[:, 0], X[:, 1], X[:, 2]
         x1 = closest_value(self.feasible_values, x1)
 
         f1 = (29.4 * x1) + (0.6 * x2 * x3)
         
         g = np.array([(x1 * x3) - 7.735 * div((x1 * x1), x2) - 180.0, 4.0 - div(x3, x2)])
 
-        g[g >= 0] = 0
-        g[g < 0] = -g[g < 0]
-
-        f2 = np.sum(g)
+        f2 = constraint_violation(g)
 
-        return f1, f2
+        return np.column_stack([f1, f2])
 
 
 class RE3(RE):
@@ -105,8 +110,8 @@ class RE3(RE):
         'obj_name': ['weight', 'constraint violation'],
     }
 
-    def evaluate_objective(self, x):
-        x1, x2 = x[0], x[1]
+    def evaluate_objective_batch(self, X):
+        x1, x2 = X[:, 0], X[:, 1]
 
         f1 = x1 + (120 * x2)
 
@@ -126,12 +131,9 @@ class RE3(RE):
             1 - div(sigmaB, sigmaK)
         ])
 
-        g[g >= 0] = 0
-        g[g < 0] = -g[g < 0]
+        f2 = constraint_violation(g)
 
-        f2 = np.sum(g)
-
-        return f1, f2
+        return np.column_stack([f1, f2])
         
 
 class RE4(RE):
@@ -147,8 +149,8 @@ class RE4(RE):
         'obj_name': ['cost', 'end deflection', 'constraint violation'],
     } 
 
-    def evaluate_objective(self, x):
-        x1, x2, x3, x4 = x[0], x[1], x[2], x[3]
+    def evaluate_objective_batch(self, X):
+        x1, x2, x3, x4 = X[:, 0], X[:, 1], X[:, 2], X[:, 3]
         
         P = 6000
         L = 14
@@ -182,12 +184,9 @@ class RE4(RE):
             PC - P
         ])
 
-        g[g >= 0] = 0
-        g[g < 0] = -g[g < 0]
-
-        f3 = np.sum(g)
+        f3 = constraint_violation(g)
 
-        return f1, f2, f3
+        return np.column_stack([f1, f2, f3])
 
 
 class RE5(RE):
@@ -204,8 +203,8 @@ class RE5(RE):
         'obj_name': ['mass', 'minimum stopping time', 'constraint violation'],
     }
 
-    def evaluate_objective(self, x):
-        x1, x2, x3, x4 = x[0], x[1], x[2], x[3]
+    def evaluate_objective_batch(self, X):
+        x1, x2, x3, x4 = X[:, 0], X[:, 1], X[:, 2], X[:, 3]
 
         f1 = 4.9 * 1e-5 * (x2 * x2 - x1 * x1) * (x4 - 1.0)
         f2 = div((9.82 * 1e6) * (x2 * x2 - x1 * x1), x3 * x4 * (x2 * x2 * x2 - x1 * x1 * x1))
@@ -217,12 +216,9 @@ class RE5(RE):
             div(2.66 * 1e-2 * x3 * x4 * (x2 * x2 * x2 - x1 * x1 * x1), x2 * x2 - x1 * x1) - 900.0
         ])
 
-        g[g >= 0] = 0
-        g[g < 0] = -g[g < 0]
+        f3 = constraint_violation(g)
 
-        f3 = np.sum(g)
-
-        return f1, f2, f3
+        return np.column_stack([f1, f2, f3])
 
 
 class RE6(RE):
@@ -239,19 +235,17 @@ class RE6(RE):
         'obj_name': ['ration error', 'max size', 'constraint violation'],
     }
 
-    def evaluate_objective(self, x):
-        x1, x2, x3, x4 = np.round(x[0]), np.round(x[1]), np.round(x[2]), np.round(x[3])
+    def evaluate_objective_batch(self, X):
+        x1, x2, x3, x4 = np.round(X[:, 0]), np.round(X[:, 1]), np.round(X[:, 2]), np.round(X[:, 3])
 
         f1 = np.abs(6.931 - (div(x3, x1) * div(x4, x2)))
-        f2 = np.max([x1, x2, x3, x4])
+        f2 = np.max([x1, x2, x3, x4], axis=0)
         
-        g = 0.5 - (f1 / 6.931)
-
-        g = 0 if g >= 0 else -g
+        g = np.array([0.5 - (f1 / 6.931)])
 
-        f3 = g
+        f3 = constraint_violation(g)
 
-        return f1, f2, f3
+        return np.column_stack([f1, f2, f3])
 
 
 class RE7(RE):
@@ -268,11 +262,11 @@ class RE7(RE):
         'obj_name': ['max face temperature', 'inlet distance', 'max post tip temperature'],
     }
 
-    def evaluate_objective(self, x):
-        xAlpha, xHA, xOA, xOPTT = x[0], x[1], x[2], x[3]
+    def evaluate_objective_batch(self, X):
+        xAlpha, xHA, xOA, xOPTT = X[:, 0], X[:, 1], X[:, 2], X[:, 3]
 
         f1 = 0.692 + (0.477 * xAlpha) - (0.687 * xHA) - (0.080 * xOA) - (0.0650 * xOPTT) - (0.167 * xAlpha * xAlpha) - (0.0129 * xHA * xAlpha) + (0.0796 * xHA * xHA) - (0.0634 * xOA * xAlpha) - (0.0257 * xOA * xHA) + (0.0877 * xOA * xOA) - (0.0521 * xOPTT * xAlpha) + (0.00156 * xOPTT * xHA) + (0.00198 * xOPTT * xOA) + (0.0184 * xOPTT * xOPTT)
         f2 = 0.153 - (0.322 * xAlpha) + (0.396 * xHA) + (0.424 * xOA) + (0.0226 * xOPTT) + (0.175 * xAlpha * xAlpha) + (0.0185 * xHA * xAlpha) - (0.0701 * xHA * xHA) - (0.251 * xOA * xAlpha) + (0.179 * xOA * xHA) + (0.0150 * xOA * xOA) + (0.0134 * xOPTT * xAlpha) + (0.0296 * xOPTT * xHA) + (0.0752 * xOPTT * xOA) + (0.0192 * xOPTT * xOPTT)
         f3 = 0.370 - (0.205 * xAlpha) + (0.0307 * xHA) + (0.108 * xOA) + (1.019 * xOPTT) - (0.135 * xAlpha * xAlpha) + (0.0141 * xHA * xAlpha) + (0.0998 * xHA * xHA) + (0.208 * xOA * xAlpha) - (0.0301 * xOA * xHA) - (0.226 * xOA * xOA) + (0.353 * xOPTT * xAlpha) - (0.0497 * xOPTT * xOA) - (0.423 * xOPTT * xOPTT) + (0.202 * xHA * xAlpha * xAlpha) - (0.281 * xOA * xAlpha * xAlpha) - (0.342 * xHA * xHA * xAlpha) - (0.245 * xHA * xHA * xOA) + (0.281 * xOA * xOA * xHA) - (0.184 * xOPTT * xOPTT * xAlpha) - (0.281 * xHA * xAlpha * xOA)
 
-        return f1, f2, f3
+        return np.column_stack([f1, f2, f3])
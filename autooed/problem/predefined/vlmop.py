@@ -19,11 +19,11 @@ class VLMOP2(Problem):
         'var_ub': 2,
     }
 
-    def evaluate_objective(self, x):
+    def evaluate_objective_batch(self, X):
         n = self.n_var
-        f1 = 1 - np.exp(-np.sum((x - 1 / np.sqrt(n)) ** 2))
-        f2 = 1 - np.exp(-np.sum((x + 1 / np.sqrt(n)) ** 2))
-        return f1, f2
+        f1 = 1 - np.exp(-np.sum((X - 1 / np.sqrt(n)) ** 2, axis=1))
+        f2 = 1 - np.exp(-np.sum((X + 1 / np.sqrt(n)) ** 2, axis=1))
+        return np.column_stack([f1, f2])
 
     def _calc_pareto_front(self, n_pareto_points=100):
         n = self.n_var
@@ -31,7 +31,7 @@ class VLMOP2(Problem):
         x = np.linspace(-1 / np.sqrt(n), 1 / np.sqrt(n), n_pareto_points)
         x_all = np.column_stack([x] * n)
 
-        return np.array([self.evaluate_objective(x_) for x_ in x_all])
+        return self.evaluate_objective_batch(x_all)
 
 
 class VLMOP3(Problem):
@@ -46,14 +46,14 @@ class VLMOP3(Problem):
         'var_ub': 3,
     }
 
-    def evaluate_objective(self, x):
-        x1, x2 = x[0], x[1]
+    def evaluate_objective_batch(self, X):
+        x1, x2 = X[:, 0], X[:, 1]
 
         f1 = 0.5 * (x1 ** 2 + x2 ** 2) + np.sin(x1 ** 2 + x2 ** 2)
         f2 = (3 * x1 - 2 * x2 + 4) ** 2 / 8 + (x1 - x2 + 1) ** 2 / 27 + 15
         f3 = 1 / (x1 ** 2 + x2 ** 2 + 1) - 1.1 * np.exp(-x1 ** 2 - x2 ** 2)
 
-        return f1, f2, f3
+        return np.column_stack([f1, f2, f3])
 
     def _calc_pareto_front(self):
         raise Exception("Not implemented yet.")
@@ -25,11 +25,11 @@ class ZDT1(ZDT):
         x = np.linspace(0, 1, n_pareto_points)
         return np.array([x, 1 - np.sqrt(x)]).T
 
-    def evaluate_objective(self, x):
-        f1 = x[0]
-        g = 1 + 9.0 / (self.n_var - 1) * np.sum(x[1:])
+    def evaluate_objective_batch(self, X):
+        f1 = X[:, 0]
+        g = 1 + 9.0 / (self.n_var - 1) * np.sum(X[:, 1:], axis=1)
         f2 = g * (1 - np.power((f1 / g), 0.5))
-        return f1, f2
+        return np.column_stack([f1, f2])
 
 
 class ZDT2(ZDT):
@@ -38,12 +38,12 @@ class ZDT2(ZDT):
         x = np.linspace(0, 1, n_pareto_points)
         return np.array([x, 1 - np.power(x, 2)]).T
 
-    def evaluate_objective(self, x):
-        f1 = x[0]
-        c = np.sum(x[1:])
+    def evaluate_objective_batch(self, X):
+        f1 = X[:, 0]
+        c = np.sum(X[:, 1:], axis=1)
         g = 1.0 + 9.0 * c / (self.n_var - 1)
         f2 = g * (1 - np.power((f1 * 1.0 / g), 2))
-        return f1, f2
+        return np.column_stack([f1, f2])
 
 
 class ZDT3(ZDT):
@@ -69,12 +69,12 @@ class ZDT3(ZDT):
 
         return pf
 
-    def evaluate_objective(self, x):
-        f1 = x[0]
-        c = np.sum(x[1:])
+    def evaluate_objective_batch(self, X):
+        f1 = X[:, 0]
+        c = np.sum(X[:, 1:], axis=1)
         g = 1.0 + 9.0 * c / (self.n_var - 1)
         f2 = g * (1 - np.power(f1 * 1.0 / g, 0.5) - (f1 * 1.0 / g) * np.sin(10 * np.pi * f1))
-        return f1, f2
+        return np.column_stack([f1, f2])
 
 
 class ZDT4(ZDT):
@@ -91,12 +91,10 @@ class ZDT4(ZDT):
         x = np.linspace(0, 1, n_pareto_points)
         return np.array([x, 1 - np.sqrt(x)]).T
 
-    def evaluate_objective(self, x):
-        f1 = x[0]
-        g = 1.0
-        g += 10 * (self.n_var - 1)
-        for i in range(1, self.n_var):
-            g += x[i] * x[i] - 10.0 * np.cos(4.0 * np.pi * x[i])
+    def evaluate_objective_batch(self, X):
+        f1 = X[:, 0]
+        g = 1.0 + 10 * (self.n_var - 1)
+        g = g + np.sum(X[:, 1:] * X[:, 1:] - 10.0 * np.cos(4.0 * np.pi * X[:, 1:]), axis=1)
         h = 1.0 - np.sqrt(f1 / g)
         f2 = g * h
-        return f1, f2
+        return np.column_stack([f1, f2])
@@ -18,6 +18,8 @@ class Problem(PymooProblem):
     Base class for problems, for custom problem specification, do either of the following:
     1) Inherit this with a custom config, evaluate_objective() and evaluate_constraint()
     2) Initialize this with a custom config with 'obj_func' and 'constr_func' specified
+    Optionally, evaluate_objective_batch() and evaluate_constraint_batch() can be overridden with vectorized implementations,
+    in which case evaluate_objective() can be omitted.
     '''
     config = {}
 
@@ -44,6 +46,10 @@ class Problem(PymooProblem):
         # import objective evaluation function
         if self.config['obj_func'] is not None:
             self.evaluate_objective = import_obj_func(self.config['obj_func'], self.config['n_var'], self.config['n_obj'])
+            if hasattr(self.evaluate_objective, 'batch'):
+                self.evaluate_objective_batch = self.evaluate_objective.batch
+        elif not hasattr(self, 'evaluate_objective') and self.support_batch_objective:
+            self.evaluate_objective = self._evaluate_objective_from_batch
 
         # import constraint evaluation function
         if self.config['constr_func'] is None:
@@ -54,6 +60,8 @@ class Problem(PymooProblem):
                     self.evaluate_constraint = no_constraint_evaluation
         else:
             self.evaluate_constraint = import_constr_func(self.config['constr_func'], self.config['n_var'], self.config['n_constr'])
+            if hasattr(self.evaluate_constraint, 'batch'):
+                self.evaluate_constraint_batch = self.evaluate_constraint.batch
 
     def name(self):
         return self.config['name']
@@ -88,6 +96,58 @@ class Problem(PymooProblem):
         return None
     """
 
+    @property
+    def support_batch_objective(self):
+        '''
+        Whether a vectorized evaluate_objective_batch() is implemented by the problem.
+        '''
+        return type(self).evaluate_objective_batch is not Problem.evaluate_objective_batch or 'evaluate_objective_batch' in self.__dict__
+
+    def evaluate_objective_batch(self, X):
+        '''
+        Objective evaluation of a batch of design variables, falls back to evaluate_objective() row by row.
+        Override this with a vectorized implementation when available.
+
+        Parameters
+        ----------
+        X: np.array
+            Design variables (raw), shape (N, n_var).
+
+        Returns
+        -------
+        Y: np.array
+            Objective values, shape (N, n_obj).
+        '''
+        return np.array([self.evaluate_objective(x) for x in X])
+
+    def _evaluate_objective_from_batch(self, x):
+        '''
+        Single design objective evaluation through evaluate_objective_batch().
+        '''
+        return self.evaluate_objective_batch(np.atleast_2d(x))[0]
+
+    def evaluate_constraint_batch(self, X):
+        '''
+        Constraint evaluation of a batch of design variables, falls back to evaluate_constraint() row by row.
+        Override this with a vectorized implementation when available.
+
+        Parameters
+        ----------
+        X: np.array
+            Design variables (raw), shape (N, n_var).
+
+        Returns
+        -------
+        G: np.array
+            Constraint values of shape (N, n_constr) (or (N,) for scalar constraint values), None if there is no constraint.
+        '''
+        if self.n_constr == 0:
+            return None
+        G = [self.evaluate_constraint(x) for x in X]
+        if any(g is None for g in G):
+            return None
+        return np.array(G, dtype=float)
+
     def evaluate_feasible(self, x):
         '''
         Feasibility evaluation, can be computed from constraint evaluation
@@ -95,9 +155,9 @@ class Problem(PymooProblem):
         if self.n_constr == 0:
             CV = np.zeros([x.shape[0], 1])
         else:
-            G = [self.evaluate_constraint(x_) for x_ in x]
-            assert None not in G, 'constraint evaluation function is invalid'
-            CV = Problem.calc_constraint_violation(np.atleast_2d(G))
+            G = self.evaluate_constraint_batch(x)
+            assert G is not None, 'constraint evaluation function is invalid'
+            CV = Problem.calc_constraint_violation(np.reshape(G, (x.shape[0], -1)))
         feasible = (CV <= 0).flatten()
         return feasible
 
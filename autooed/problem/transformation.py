@@ -21,20 +21,34 @@ class Transformation(ABC):
         self.n_var = self.config['n_var']
         self.n_var_T = self.n_var
 
+        # indices and number of choices of integer-coded categorical variables (in the transformed space)
+        self.cat_idx = np.zeros(0, dtype=int)
+        self.cat_n_choices = np.zeros(0, dtype=int)
+
     def do(self, X):
         '''
         Transform from original type to float.
         '''
-        X = np.array(X, dtype=object)
+        X = np.asarray(X, dtype=object)
         return self._do(X)
 
     def undo(self, X):
         '''
         Transform from float to original type.
         '''
-        X = np.array(X, dtype=float)
+        X = np.asarray(X, dtype=float)
         return self._undo(X)
 
+    def project(self, X):
+        '''
+        Project continuous variables onto the closest valid values of integer-coded categorical variables.
+        '''
+        if len(self.cat_idx) == 0:
+            return X
+        X = np.array(X, dtype=float)
+        X[..., self.cat_idx] = np.clip(np.round(X[..., self.cat_idx]), 0, self.cat_n_choices - 1)
+        return X
+
     @abstractmethod
     def _do(self, X):
         pass
@@ -44,28 +58,33 @@ class Transformation(ABC):
         pass
     
 
-class ContinuousTransformation(Transformation):
-    
+class NumericTransformation(Transformation):
+    '''
+    Transformation whose original type is already numeric, so float arrays pass through without copy.
+    '''
+    def do(self, X):
+        return self._do(np.asarray(X, dtype=float))
+
     def _do(self, X):
-        return X.astype(float)
+        return X
+
+
+class ContinuousTransformation(NumericTransformation):
+
+    def undo(self, X):
+        return np.asarray(X, dtype=float)
 
     def _undo(self, X):
         return X
 
 
-class IntegerTransformation(Transformation):
-
-    def _do(self, X):
-        return X.astype(float)
+class IntegerTransformation(NumericTransformation):
 
     def _undo(self, X):
         return np.round(X).astype(int)
 
 
-class BinaryTransformation(Transformation):
-
-    def _do(self, X):
-        return X.astype(float)
+class BinaryTransformation(NumericTransformation):
 
     def _undo(self, X):
         return np.clip(np.round(X), 0, 1).astype(int)
@@ -81,15 +100,21 @@ class CategoricalTransformation(Transformation):
         else:
             self.n_var = config['n_var']
             self.choices = np.array([config['var_choices']] * self.n_var, dtype=object)
-        self.offsets = np.cumsum([0] + [len(choices) for choices in self.choices])
+        self.encoding = 'ordinal' if config.get('encoding') == 'ordinal' else 'onehot'
+        if self.encoding == 'onehot':
+            self.offsets = np.cumsum([0] + [len(choices) for choices in self.choices])
+        else: # one integer code per variable
+            self.offsets = np.arange(self.n_var + 1)
+            self.cat_idx = np.arange(self.n_var)
+            self.cat_n_choices = np.array([len(choices) for choices in self.choices])
         self.n_var_T = self.offsets[-1]
+        self.choice_index = [_build_choice_index(choices) for choices in self.choices]
 
     def _do(self, X):
         n_sample = X.shape[0]
-        new_X = np.empty((n_sample, self.n_var_T), dtype=float)
+        new_X = np.zeros((n_sample, self.n_var_T), dtype=float)
         for i in range(self.n_var):
-            idx_begin, idx_end = self.offsets[i], self.offsets[i + 1]
-            new_X[:, idx_begin:idx_end] = (X[:, i][:, None] == np.repeat(self.choices[i][None, :], n_sample, axis=0))
+            _encode_choices(new_X, X[:, i], self.choice_index[i], self.offsets[i], self.encoding)
         return new_X
 
     def _undo(self, X):
@@ -98,7 +123,10 @@ class CategoricalTransformation(Transformation):
         for i in range(self.n_var):
             idx_begin, idx_end = self.offsets[i], self.offsets[i + 1]
             X_slice = X[:, idx_begin:idx_end]
-            new_X[:, i] = self.choices[i][np.argmax(X_slice, axis=1)]
+            if self.encoding == 'onehot':
+                new_X[:, i] = self.choices[i][np.argmax(X_slice, axis=1)]
+            else:
+                new_X[:, i] = self.choices[i][np.clip(np.round(X_slice[:, 0]), 0, len(self.choices[i]) - 1).astype(int)]
         return new_X
 
 
@@ -108,11 +136,12 @@ class MixedTransformation(Transformation):
         super().__init__(config)
         self.n_var = len(config['var'])
         self.types = [var_info['type'] for var_info in config['var'].values()]
+        self.encoding = 'ordinal' if config.get('encoding') == 'ordinal' else 'onehot'
         self.choices = []
         self.offsets = [0]
         for var_info in config['var'].values():
             if var_info['type'] == 'categorical':
-                self.offsets.append(len(var_info['choices']))
+                self.offsets.append(len(var_info['choices']) if self.encoding == 'onehot' else 1)
                 self.choices.append(np.array(var_info['choices'], dtype=object))
             else:
                 self.offsets.append(1)
@@ -121,16 +150,21 @@ class MixedTransformation(Transformation):
         self.offsets = np.cumsum(self.offsets)
         self.n_var_T = self.offsets[-1]
 
+        if self.encoding == 'ordinal':
+            cat_vars = [i for i in range(self.n_var) if self.types[i] == 'categorical']
+            self.cat_idx = self.offsets[cat_vars]
+            self.cat_n_choices = np.array([len(self.choices[i]) for i in cat_vars], dtype=int)
+
+        self.choice_index = [_build_choice_index(choices) if choices is not None else None for choices in self.choices]
+
     def _do(self, X):
         n_sample = X.shape[0]
-        new_X = np.empty((n_sample, self.n_var_T), dtype=float)
+        new_X = np.zeros((n_sample, self.n_var_T), dtype=float)
         for i in range(self.n_var):
-            idx_begin, idx_end = self.offsets[i], self.offsets[i + 1]
             if self.types[i] == 'categorical':
-                X_slice = (X[:, i][:, None] == np.repeat(self.choices[i][None, :], n_sample, axis=0))
+                _encode_choices(new_X, X[:, i], self.choice_index[i], self.offsets[i], self.encoding)
             else:
-                X_slice = X[:, i][:, None].astype(float)
-            new_X[:, idx_begin:idx_end] = X_slice
+                new_X[:, self.offsets[i]] = X[:, i].astype(float)
         return new_X
 
     def _undo(self, X):
@@ -139,8 +173,10 @@ class MixedTransformation(Transformation):
         for i in range(self.n_var):
             idx_begin, idx_end = self.offsets[i], self.offsets[i + 1]
             X_slice = X[:, idx_begin:idx_end]
-            if self.types[i] == 'categorical':
+            if self.types[i] == 'categorical' and self.encoding == 'onehot':
                 new_X[:, i] = self.choices[i][np.argmax(X_slice, axis=1)]
+            elif self.types[i] == 'categorical':
+                new_X[:, i] = self.choices[i][np.clip(np.round(X_slice[:, 0]), 0, len(self.choices[i]) - 1).astype(int)]
             elif self.types[i] == 'continuous':
                 new_X[:, i] = X_slice.T
             elif self.types[i] == 'integer':
@@ -152,6 +188,26 @@ class MixedTransformation(Transformation):
         return new_X
 
 
+def _build_choice_index(choices):
+    '''
+    Build a lookup table from each choice to its index.
+    '''
+    return {choice: idx for idx, choice in enumerate(choices)}
+
+
+def _encode_choices(new_X, X_col, choice_index, offset, encoding):
+    '''
+    Encode a column of categorical values into new_X starting from column offset (in place).
+    Values not found in the choices are encoded as all zeros (one-hot) or the first choice (ordinal).
+    '''
+    idx = np.fromiter((choice_index.get(x, -1) for x in X_col), dtype=int, count=len(X_col))
+    if encoding == 'onehot':
+        valid = idx >= 0
+        new_X[np.nonzero(valid)[0], offset + idx[valid]] = 1.0
+    else:
+        new_X[:, offset] = np.maximum(idx, 0)
+
+
 def get_transformation(config):
     '''
     '''
@@ -4,11 +4,13 @@ Agents that talk to algorithms and database for data loading, evaluation and opt
 
 import os
 import numpy as np
+from time import time
 from multiprocessing import Lock
 
 from autooed.problem import build_problem
-from autooed.core import optimize, predict, optimize_predict, evaluate
+from autooed.core import optimize, predict, optimize_predict, evaluate, evaluate_batch
 from autooed.utils.pareto import check_pareto, calc_hypervolume, calc_pred_error, convert_minimization
+from autooed.system.cache import EvaluationCache
 
 
 class LoadAgent:
@@ -29,8 +31,10 @@ class LoadAgent:
 
         self.problem_cfg = None
         self.can_eval = False
+        self.can_eval_batch = False
         self.key_map = None
         self.type_map = None
+        self.eval_cache = None
 
         self.lock = Lock()
 
@@ -44,6 +48,12 @@ class LoadAgent:
         '''
         return self.db.query_config(self.table_name)
 
+    def get_solver_state_path(self):
+        '''
+        Get the path of the file keeping the solver population between optimizations (for solver warm start).
+        '''
+        return self.db.get_solver_state_path(self.table_name)
+
     def refresh(self):
         '''
         Refresh the agent to load the up-to-date config.
@@ -63,6 +73,9 @@ class LoadAgent:
             # whether evaluation function is provided
             self.can_eval = hasattr(problem, 'evaluate_objective') or self.problem_cfg['obj_func'] is not None
 
+            # whether vectorized batch evaluation is provided
+            self.can_eval_batch = problem.support_batch_objective
+
             # mapping from keys to database column names (e.g., X -> [x1, x2, ...])
             self.key_map = {
                 'status': 'status',
@@ -71,7 +84,8 @@ class LoadAgent:
                 '_Y_pred_mean': [f'_{name}_pred_mean' for name in self.problem_cfg['obj_name']],
                 '_Y_pred_std': [f'_{name}_pred_std' for name in self.problem_cfg['obj_name']],
                 'pareto': 'pareto', 'batch': 'batch', 
-                '_order': '_order', '_hypervolume': '_hypervolume',
+                '_order': '_order', '_hypervolume': '_hypervolume', '_error': '_error',
+                '_eval_time': '_eval_time',
             }
 
             # mapping from problem domains to data types in database
@@ -94,6 +108,8 @@ class LoadAgent:
                 'batch': int,
                 '_order': int,
                 '_hypervolume': float,
+                '_error': str,
+                '_eval_time': float,
             }
 
         elif config != self.problem_cfg: # update in the middle
@@ -101,6 +117,12 @@ class LoadAgent:
             # update agent's problem config
             self.problem_cfg.update(config['problem'])
 
+        # persistent evaluation cache (opt-in)
+        if config['experiment'].get('eval_cache', False):
+            self.eval_cache = EvaluationCache(self.problem_cfg)
+        else:
+            self.eval_cache = None
+
     '''
     Utilities
     '''
@@ -189,10 +211,10 @@ class LoadAgent:
         Check if the database table is initialized with data.
         '''
         if self.check_table_exist():
-            batch, order = self.load(['batch', '_order'])
+            status, batch, order = self.load(['status', 'batch', '_order'])
             if len(batch) == 0: return False
             init_idx = np.where(batch == 0)[0]
-            return (order[init_idx] >= 0).all()
+            return np.logical_or(order[init_idx] >= 0, status[init_idx] == 'failed').all()
         else:
             return False
 
@@ -318,6 +340,19 @@ class LoadAgent:
         if len(valid_idx) == 0: return None
         return hypervolume[valid_idx].max()
 
+    def check_column_exist(self, column):
+        '''
+        Check if a column exists in the database table (tables created by older versions may lack some columns).
+        '''
+        return column in self.db.get_column_names(self.table_name)
+
+    def load_eval_time(self):
+        '''
+        Load the evaluation time (in seconds) of all rows, return None if not recorded.
+        '''
+        if not self.check_column_exist('_eval_time'): return None
+        return self.load('_eval_time')
+
     def get_column_names(self):
         '''
         Get the column names of the database table.
@@ -344,11 +379,21 @@ class EvaluateAgent(LoadAgent):
 
         self.lock = Lock()
 
+    def refresh(self):
+        '''
+        Refresh the agent to load the up-to-date config, and add the evaluation time column to tables created before time recording,
+        once before any evaluation is updated (new tables are initialized with it).
+        '''
+        super().refresh()
+        with self.lock:
+            if self.problem_cfg is not None and self.db.check_inited_table_exist(self.table_name) and not self.check_column_exist('_eval_time'):
+                self.db.add_column(self.table_name, '_eval_time', 'float')
+
     '''
     Main functions: evaluation
     '''
 
-    def update_evaluation(self, Y, rowids):
+    def update_evaluation(self, Y, rowids, eval_time=None):
         '''
         Update evaluation results to the database.
 
@@ -358,7 +403,13 @@ class EvaluateAgent(LoadAgent):
             Updated evaluated performance.
         rowids: list
             Row numbers of the evaluated performance.
+        eval_time: list
+            Evaluation time (in seconds) of each row.
         '''
+        # update data (evaluation time)
+        if eval_time is not None:
+            self.db.update_multiple_data(table=self.table_name, column=['_eval_time'], data=[list(eval_time)], rowid=rowids, transform=True)
+
         # update data (Y, status, _order)
         status = ['evaluated'] * len(rowids)
         with self.lock:
@@ -380,7 +431,60 @@ class EvaluateAgent(LoadAgent):
         pareto = check_pareto(Y_all, self.problem_cfg['obj_type']).astype(int)
         self.db.update_multiple_data(table=self.table_name, column=['pareto'], data=[pareto], rowid=rowids_all, transform=True)
 
-    def evaluate(self, rowid, eval_func=None):
+    def update_failure(self, rowids, error):
+        '''
+        Mark evaluations as failed and record the error message to the database.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of the failed evaluations.
+        error: str
+            Error message.
+        '''
+        if not self.check_column_exist('_error'): # tables created before error recording
+            self.db.add_column(self.table_name, '_error', 'text')
+        self.db.update_multiple_data(table=self.table_name, column=['status', '_error'], 
+            data=[['failed'] * len(rowids), [error] * len(rowids)], rowid=rowids, transform=True)
+
+    def reset_evaluation(self, rowids):
+        '''
+        Reset the status of interrupted evaluations to unevaluated.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of the interrupted evaluations.
+        '''
+        self.db.update_multiple_data(table=self.table_name, column=['status'], data=[['unevaluated'] * len(rowids)], rowid=rowids, transform=True)
+
+    def evaluate_cached(self, rowids):
+        '''
+        Complete evaluations instantly with the results found in the evaluation cache.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of data to evaluate.
+
+        Returns
+        -------
+        list
+            Row numbers of data whose evaluations are completed from the cache.
+        '''
+        if self.eval_cache is None or len(rowids) == 0: return []
+        rowids = sorted(rowids) # NOTE: database returns rows in ascending order
+
+        X = self.load('X', rowid=rowids)
+        Y_cached = self.eval_cache.get(X)
+        rowids_cached = [rowid for rowid, y in zip(rowids, Y_cached) if y is not None and len(y) == self.problem_cfg['n_obj']]
+        if len(rowids_cached) == 0: return []
+
+        Y = np.array([y for y in Y_cached if y is not None and len(y) == self.problem_cfg['n_obj']])
+        self.update_evaluation(Y, rowids_cached)
+        return rowids_cached
+
+    def evaluate(self, rowid, eval_func=None, problem=None):
         '''
         Evaluation of design variables given the associated rowid in database.
 
@@ -390,6 +494,8 @@ class EvaluateAgent(LoadAgent):
             Row number of data to evaluate.
         eval_func: function
             Provided evaluation function.
+        problem: autooed.problem.Problem
+            Pre-built problem (if None then build the problem for this evaluation).
         '''
         if not self.can_eval: return
         self.db.connect(force=True)
@@ -399,14 +505,86 @@ class EvaluateAgent(LoadAgent):
         self.db.update_data(table=self.table_name, column=['status'], data=['evaluating'], rowid=rowid)
 
         # run evaluation
+        start_time = time()
         if eval_func is None:
             problem_name = self.problem_cfg['name']
-            y_next = evaluate(problem_name, x_next)
+            y_next = evaluate(problem_name, x_next, problem=problem)
         else:
             y_next = np.array(eval_func(x_next))
+        eval_time = time() - start_time
+
+        # update evaluation result to database and cache
+        self.update_evaluation(np.atleast_2d(y_next), [rowid], eval_time=[eval_time])
+        if self.eval_cache is not None and eval_func is None:
+            self.eval_cache.put([x_next], np.atleast_2d(y_next))
+
+    def evaluate_batch(self, rowids, problem=None):
+        '''
+        Evaluation of a batch of design variables in a single call, given the associated rowids in database.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of data to evaluate.
+        problem: autooed.problem.Problem
+            Pre-built problem (if None then build the problem for this evaluation).
+        '''
+        if not self.can_eval_batch: return
+        self.db.connect(force=True)
+        rowids = sorted(rowids) # NOTE: database returns rows in ascending order
+
+        # load design variables
+        X_next = self.prepare_evaluation(rowids)
+
+        # run evaluation
+        start_time = time()
+        problem_name = self.problem_cfg['name']
+        Y_next = evaluate_batch(problem_name, X_next, problem=problem)
+        eval_time = time() - start_time
+
+        # update evaluation result to database and cache
+        self.complete_evaluation(rowids, Y_next, eval_time, X=X_next)
+
+    def prepare_evaluation(self, rowids):
+        '''
+        Load design variables to be evaluated (e.g., by a remote worker) and mark them as evaluating.
 
-        # update evaluation result to database
-        self.update_evaluation(np.atleast_2d(y_next), [rowid])
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of data to evaluate, in ascending order.
+
+        Returns
+        -------
+        np.array
+            Design variables to evaluate.
+        '''
+        X = self.load('X', rowid=rowids)
+        self.db.update_multiple_data(table=self.table_name, column=['status'], data=[['evaluating'] * len(rowids)], rowid=rowids, transform=True)
+        return X
+
+    def complete_evaluation(self, rowids, Y, eval_time=None, X=None):
+        '''
+        Update the result of evaluations done elsewhere (e.g., by a remote worker) to the database and cache.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of evaluated data, in ascending order.
+        Y: np.array
+            Evaluated performance.
+        eval_time: float
+            Total evaluation time (in seconds), evenly attributed to the rows.
+        X: np.array
+            Evaluated design variables (if None then load from database when needed).
+        '''
+        Y = np.atleast_2d(Y)
+        assert Y.shape == (len(rowids), self.problem_cfg['n_obj']), f'invalid shape of evaluated performance {Y.shape}'
+        eval_time = None if eval_time is None else [eval_time / len(rowids)] * len(rowids)
+        self.update_evaluation(Y, rowids, eval_time=eval_time)
+        if self.eval_cache is not None:
+            if X is None: X = self.load('X', rowid=rowids)
+            self.eval_cache.put(X, Y)
 
     '''
     Statistics
@@ -698,18 +876,23 @@ class OptimizeAgent(EvaluateAgent):
         Optimize for a batch of designs to evaluate and store the designs in the database.
         '''
         # read current data from database
-        X, Y = self.load(['X', 'Y'])
+        X, Y, status = self.load(['X', 'Y', 'status'])
+        C = self.load_eval_time()
         valid_idx = self._get_valid_idx(Y)
         if len(valid_idx) < len(Y):
-            X, Y = X[valid_idx], Y[valid_idx]
+            # designs proposed but not evaluated yet are busy, failed ones are not coming back
             invalid_idx = self._get_invalid_idx(Y)
-            X_busy = X[invalid_idx]
+            busy_idx = invalid_idx[status[invalid_idx] != 'failed']
+            X_busy = X[busy_idx] if len(busy_idx) > 0 else None
+            X, Y = X[valid_idx], Y[valid_idx]
+            if C is not None: C = C[valid_idx]
         else:
             X_busy = None
 
         # optimize for best X_next
         config = self.get_config()
-        X_next, (Y_pred_mean, Y_pred_std) = optimize_predict(config, X, Y, X_busy, batch_size=batch_size)
+        config['algorithm']['solver']['state_path'] = self.get_solver_state_path()
+        X_next, (Y_pred_mean, Y_pred_std) = optimize_predict(config, X, Y, X_busy, batch_size=batch_size, C=C)
 
         # insert optimization and prediction result to database
         if Y_pred_mean is not None and Y_pred_std is not None:
@@ -0,0 +1,514 @@
+'''
+Broker that hands out pending evaluations to remote evaluation workers over a socket, and the remote worker itself.
+Messages are python objects exchanged through multiprocessing.connection with HMAC authentication:\n
+- worker -> broker: ('hello',), broker replies ('problem', name, yaml_config)
+- worker -> broker: ('get',), broker replies ('task', rowid, X), ('wait',) or ('quit',)
+- worker -> broker: ('poll', rowid) while evaluating, broker replies ('continue',) or ('cancel', rowid) if the task is stopped or timed out
+- worker -> broker: ('result', rowid, Y, eval_time, error)
+'''
+
+import traceback
+import numpy as np
+from time import time
+from threading import Thread, Lock, Condition
+from queue import Empty
+from multiprocessing import Process, Queue, Pipe, parent_process
+from multiprocessing.connection import Listener, Client
+
+from autooed.problem import build_problem, get_yaml_problem_list, load_yaml_problem
+from autooed.problem.problem import Problem
+from autooed.core import evaluate, evaluate_batch
+
+
+def parse_address(address):
+    '''
+    Parse socket address, "host:port" for TCP socket, otherwise a path for Unix socket.
+
+    Parameters
+    ----------
+    address: str
+        Address of the broker.
+
+    Returns
+    -------
+    tuple/str
+        (host, port) for TCP socket or path for Unix socket.
+    '''
+    if ':' in address:
+        host, port = address.rsplit(':', 1)
+        return (host, int(port))
+    return address
+
+
+def _rowid_list(rowid):
+    '''
+    Get the sorted list of row numbers handled by a task.
+    '''
+    return sorted(rowid) if isinstance(rowid, list) else [rowid]
+
+
+class RemoteEvaluateTask:
+    '''
+    Evaluation task executed by a remote worker, with the same interface as autooed.system.worker.EvaluateTask.
+    '''
+    def __init__(self, pool, rowid, eval_func=None, n_retry=0):
+        '''
+        Parameters
+        ----------
+        pool: autooed.system.broker.EvaluateBroker
+            Broker handing out the task.
+        rowid: int/list
+            Row number(s) to evaluate.
+        eval_func: function
+            Provided evaluation function (not supported by remote workers, must be None).
+        n_retry: int
+            Number of times this evaluation has been retried.
+        '''
+        assert eval_func is None, 'provided evaluation function cannot be executed by remote workers'
+        self.pool = pool
+        self.rowid = rowid
+        self.eval_func = eval_func
+        self.n_retry = n_retry
+        self.priority = 0.0
+        self.started = False
+        self.finished = False
+        self.completing = False # claimed by the broker for writing the result, cannot be cancelled anymore
+        self.start_time = None
+        self.error = None
+
+    def start(self):
+        '''
+        Put the task in the pending queue of the broker.
+        '''
+        self.started = True
+        self.pool.submit(self)
+
+    def get_running_time(self):
+        '''
+        Get the time (in seconds) since a remote worker picked up the task (0 if still pending).
+        '''
+        if self.start_time is None: return 0.0
+        return time() - self.start_time
+
+    def is_alive(self):
+        '''
+        Check if the task is pending or running.
+        '''
+        if not self.started or self.finished:
+            return False
+        self.pool.poll()
+        return not self.finished
+
+    def terminate(self):
+        '''
+        Cancel the task, the result will be discarded if a remote worker is running it (unless the result is already being written).
+        '''
+        self.pool.cancel(self)
+
+
+class EvaluateBroker:
+    '''
+    Broker exposing pending evaluations to remote workers, used by schedulers in place of autooed.system.worker.EvaluateWorkerPool.
+    '''
+    def __init__(self, agent, address, authkey, timeout=10):
+        '''
+        Parameters
+        ----------
+        agent: autooed.system.agent.EvaluateAgent
+            Agent that talks to algorithms and database.
+        address: str
+            Address to listen on, "host:port" for TCP socket, otherwise a path for Unix socket.
+        authkey: str
+            Authentication key shared with remote workers.
+        timeout: float
+            Maximum time (in seconds) a worker request waits for a pending task before being told to ask again.
+        '''
+        self.agent = agent
+        self.address = address
+        self.timeout = timeout
+
+        name = agent.problem_cfg['name']
+        yaml_cfg = load_yaml_problem(name) if name in get_yaml_problem_list() else None
+        self.problem_info = ('problem', name, yaml_cfg)
+
+        self.lock = Lock()
+        self.task_available = Condition(self.lock)
+        self.pending = []
+        self.tasks = []
+        self.done_conn_recv, self.done_conn_send = Pipe(duplex=False)
+
+        self.active = True
+        self.listener = Listener(parse_address(address), authkey=authkey.encode())
+        Thread(target=self._accept_loop, daemon=True).start()
+
+    '''
+    Scheduler side
+    '''
+
+    def create_task(self, rowid, eval_func=None, n_retry=0):
+        '''
+        Create an evaluation task to be started later.
+
+        Parameters
+        ----------
+        rowid: int/list
+            Row number(s) to evaluate.
+        eval_func: function
+            Provided evaluation function (must be None).
+        n_retry: int
+            Number of times this evaluation has been retried.
+
+        Returns
+        -------
+        RemoteEvaluateTask
+            The evaluation task.
+        '''
+        return RemoteEvaluateTask(self, rowid, eval_func, n_retry)
+
+    def submit(self, task):
+        '''
+        Put a task in the pending queue and wake up a waiting remote worker.
+        '''
+        with self.lock:
+            self.pending.append(task)
+            self.tasks.append(task)
+            self.task_available.notify()
+
+    def poll(self):
+        '''
+        Consume the notifications of finished tasks.
+        '''
+        while self.done_conn_recv.poll():
+            self.done_conn_recv.recv()
+
+    def get_wait_objects(self):
+        '''
+        Get objects that become ready when a task finishes, for multiprocessing.connection.wait().
+        '''
+        with self.lock:
+            return [self.done_conn_recv] if self.tasks != [] else []
+
+    def cancel(self, task):
+        '''
+        Cancel a pending or running task, a task whose result is already being written finishes normally.
+        '''
+        with self.lock:
+            if task.completing: return
+            if task in self.pending:
+                self.pending.remove(task)
+            if task in self.tasks:
+                self.tasks.remove(task)
+            task.finished = True
+
+    def quit(self):
+        '''
+        Stop the broker, connected remote workers are told to quit when they ask for the next task.
+        '''
+        with self.lock:
+            self.active = False
+            for task in self.tasks:
+                task.finished = True
+            self.pending, self.tasks = [], []
+            self.task_available.notify_all()
+        self.listener.close()
+
+    '''
+    Remote worker side
+    '''
+
+    def _accept_loop(self):
+        '''
+        Accept connections from remote workers.
+        '''
+        while self.active:
+            try:
+                conn = self.listener.accept()
+            except Exception:
+                if not self.active: break
+                continue
+            Thread(target=self._handle_worker, args=(conn,), daemon=True).start()
+
+    def _get_task(self):
+        '''
+        Wait for a pending task and mark it as running, return None if not available before timeout.
+        '''
+        with self.lock:
+            if self.pending == [] and self.active:
+                self.task_available.wait(timeout=self.timeout)
+            if self.pending == [] or not self.active:
+                return None
+            task = self.pending.pop(0)
+            task.start_time = time()
+            return task
+
+    def _finish_task(self, task, Y, eval_time, error):
+        '''
+        Write the evaluation result to the database through the agent, then wake up the scheduler.
+        '''
+        # claim the task, so that it cannot be cancelled while the result is written
+        with self.lock:
+            if task.finished or task.completing: return # cancelled or already finished
+            task.completing = True
+        if error is None:
+            try:
+                self.agent.complete_evaluation(_rowid_list(task.rowid), Y, eval_time)
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+        with self.lock:
+            task.error = error
+            task.finished = True
+            if task in self.tasks:
+                self.tasks.remove(task)
+        self.done_conn_send.send(None)
+
+    def _handle_worker(self, conn):
+        '''
+        Serve requests of a remote worker.
+        '''
+        task = None
+        try:
+            while True:
+                msg = conn.recv()
+                if msg[0] == 'hello':
+                    conn.send(self.problem_info)
+
+                elif msg[0] == 'get':
+                    task = self._get_task()
+                    if task is None:
+                        conn.send(('wait',) if self.active else ('quit',))
+                        if not self.active: break
+                        continue
+                    rowids = _rowid_list(task.rowid)
+                    try:
+                        X = self.agent.prepare_evaluation(rowids)
+                    except Exception as e:
+                        self._finish_task(task, None, None, f'{type(e).__name__}: {e}')
+                        task = None
+                        conn.send(('wait',))
+                        continue
+                    conn.send(('task', task.rowid if not isinstance(task.rowid, list) else rowids, X))
+
+                elif msg[0] == 'poll':
+                    if task is None or (task.finished and not task.completing):
+                        # tell the remote worker to abandon the cancelled task
+                        conn.send(('cancel', msg[1]))
+                        task = None
+                    else:
+                        conn.send(('continue',))
+
+                elif msg[0] == 'result':
+                    _, _, Y, eval_time, error = msg
+                    if task is not None:
+                        self._finish_task(task, Y, eval_time, error)
+                    task = None
+
+        except (EOFError, OSError):
+            pass
+
+        finally:
+            if task is not None:
+                self._finish_task(task, None, None, 'remote evaluation worker disconnected')
+            conn.close()
+
+
+def build_remote_problem(name, yaml_cfg=None):
+    '''
+    Build the problem on a remote worker, from local definitions or the yaml config sent by the broker.
+
+    Parameters
+    ----------
+    name: str
+        Name of the problem.
+    yaml_cfg: dict
+        Config of the custom yaml problem (None for python problems).
+
+    Returns
+    -------
+    autooed.problem.Problem
+        The problem.
+    '''
+    try:
+        return build_problem(name)
+    except Exception:
+        if yaml_cfg is None: raise
+        return Problem(config=yaml_cfg)
+
+
+def _remote_evaluate_loop(name, yaml_cfg, task_queue, done_conn):
+    '''
+    Evaluation process of a remote worker: build the problem once, then evaluate the designs received from the task queue.
+
+    Parameters
+    ----------
+    name: str
+        Name of the problem.
+    yaml_cfg: dict
+        Config of the custom yaml problem (None for python problems).
+    task_queue: multiprocessing.Queue
+        Queue of (rowid, X) to evaluate (None for quitting).
+    done_conn: multiprocessing.connection.Connection
+        Connection for sending the error of building the problem (None if succeeded), then (Y, eval_time, error) of each evaluation.
+    '''
+    try:
+        problem = build_remote_problem(name, yaml_cfg)
+    except Exception as e:
+        traceback.print_exc()
+        done_conn.send(f'{type(e).__name__}: {e}')
+        return
+    done_conn.send(None)
+
+    worker = parent_process()
+    while True:
+        try:
+            task = task_queue.get(timeout=1.0)
+        except Empty:
+            if not worker.is_alive(): break # the worker is killed
+            continue
+        if task is None: break
+        rowid, X = task
+        Y, error = None, None
+        start_time = time()
+        try:
+            if isinstance(rowid, list):
+                Y = np.atleast_2d(evaluate_batch(name, X, problem=problem))
+            else:
+                Y = np.atleast_2d(evaluate(name, X[0], problem=problem))
+        except Exception as e:
+            traceback.print_exc()
+            error = f'{type(e).__name__}: {e}'
+        done_conn.send((Y, time() - start_time, error))
+
+
+class RemoteEvaluator:
+    '''
+    Evaluation process of a remote worker, which can be killed when the broker cancels the running evaluation.
+    '''
+    def __init__(self, name, yaml_cfg=None):
+        '''
+        Parameters
+        ----------
+        name: str
+            Name of the problem.
+        yaml_cfg: dict
+            Config of the custom yaml problem (None for python problems).
+        '''
+        self.name = name
+        self.yaml_cfg = yaml_cfg
+        self.process = None
+        self.start()
+
+    def start(self):
+        '''
+        Start the evaluation process and wait until the problem is built.
+        '''
+        self.task_queue = Queue()
+        self.done_conn, done_conn_child = Pipe(duplex=False)
+        self.process = Process(target=_remote_evaluate_loop, args=(self.name, self.yaml_cfg, self.task_queue, done_conn_child), daemon=True)
+        self.process.start()
+        try:
+            error = self.done_conn.recv()
+        except EOFError:
+            error = 'evaluation process exited unexpectedly'
+        if error is not None:
+            self.quit()
+            raise Exception(f'failed to build problem {self.name}: {error}')
+
+    def submit(self, rowid, X):
+        '''
+        Send designs to evaluate.
+        '''
+        self.task_queue.put((rowid, X))
+
+    def wait(self, timeout):
+        '''
+        Wait for the evaluation result.
+
+        Returns
+        -------
+        tuple
+            (Y, eval_time, error) of the evaluation, None if not finished before timeout.
+        '''
+        if self.done_conn.poll(timeout):
+            try:
+                return self.done_conn.recv()
+            except EOFError:
+                pass
+        elif self.process.is_alive():
+            return None
+        # the process died during evaluation, start a new one for the next evaluations
+        self.restart()
+        return None, 0.0, 'evaluation process exited unexpectedly'
+
+    def restart(self):
+        '''
+        Kill the evaluation process (e.g., running a cancelled evaluation) and start a new one.
+        '''
+        self.quit()
+        self.start()
+
+    def quit(self):
+        '''
+        Kill the evaluation process.
+        '''
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+
+def run_remote_worker(address, authkey, poll_interval=1.0, log=print):
+    '''
+    Connect to a broker and evaluate the designs it hands out until the broker quits.
+    Evaluations run in a separate process, the broker is polled while evaluating and a cancelled evaluation is abandoned by killing that process.
+
+    Parameters
+    ----------
+    address: str
+        Address of the broker, "host:port" for TCP socket, otherwise a path for Unix socket.
+    authkey: str
+        Authentication key shared with the broker.
+    poll_interval: float
+        Interval (in seconds) of polling the broker for cancellation while evaluating.
+    log: function
+        Function for printing logs.
+    '''
+    conn = Client(parse_address(address), authkey=authkey.encode())
+    evaluator = None
+    try:
+        conn.send(('hello',))
+        _, name, yaml_cfg = conn.recv()
+        evaluator = RemoteEvaluator(name, yaml_cfg)
+        log(f'connected to broker {address}, problem {name}')
+
+        while True:
+            conn.send(('get',))
+            msg = conn.recv()
+            if msg[0] == 'quit': break
+            if msg[0] == 'wait': continue
+
+            _, rowid, X = msg
+            evaluator.submit(rowid, X)
+            result, cancelled = None, False
+            while result is None:
+                result = evaluator.wait(poll_interval)
+                if result is not None: break
+                conn.send(('poll', rowid))
+                if conn.recv()[0] == 'cancel':
+                    evaluator.restart()
+                    cancelled = True
+                    break
+
+            if cancelled:
+                log(f'evaluation for row {rowid} cancelled')
+                continue
+            Y, eval_time, error = result
+            conn.send(('result', rowid, Y, eval_time, error))
+            log(f'evaluation for row {rowid} {"finished" if error is None else "failed"}')
+
+    except EOFError:
+        pass
+
+    finally:
+        if evaluator is not None:
+            evaluator.quit()
+        conn.close()
+        log('disconnected from broker')
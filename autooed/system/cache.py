@@ -0,0 +1,145 @@
+'''
+Persistent evaluation cache shared by all experiments, keyed by the problem and the design.
+'''
+
+import os
+import json
+import sqlite3
+import hashlib
+import numpy as np
+
+from autooed.utils.path import get_root_dir
+
+
+def canonicalize_design(x):
+    '''
+    Convert a design into a list of plain python values, so that identical designs have the identical representation.
+
+    Parameters
+    ----------
+    x: np.array
+        Design variables (raw).
+
+    Returns
+    -------
+    list
+        Canonicalized design.
+    '''
+    result = []
+    for val in np.array(x, dtype=object).flatten():
+        if isinstance(val, (bool, np.bool_)):
+            result.append(int(val))
+        elif isinstance(val, (int, np.integer)):
+            result.append(int(val))
+        elif isinstance(val, (float, np.floating)):
+            val = float(val)
+            # integer-valued floats and round-off noise should not create different keys
+            result.append(int(val) if val.is_integer() else float(f'{val:.12g}'))
+        else:
+            result.append(str(val))
+    return result
+
+
+class EvaluationCache:
+    '''
+    On-disk cache of evaluation results, backed by a sqlite file.
+    The cache only keeps paths and keys as states, so it can be safely passed to evaluation worker processes.
+    '''
+    def __init__(self, problem_cfg, path=None):
+        '''
+        Parameters
+        ----------
+        problem_cfg: dict
+            Problem config, whose name and hash (together with the content of the objective evaluation program, if any) are part of the cache key.
+        path: str
+            Path of the cache file (if None then use eval_cache.db under the root directory).
+        '''
+        self.path = os.path.join(get_root_dir(), 'eval_cache.db') if path is None else path
+        self.problem_name = problem_cfg['name']
+        cfg_str = json.dumps(problem_cfg, sort_keys=True, default=str)
+        self.cfg_hash = hashlib.sha256(cfg_str.encode()).hexdigest()
+        self.obj_func_path = problem_cfg.get('obj_func')
+        self.obj_func_stat = None
+        self.obj_func_hash = None
+
+    def _get_problem_hash(self):
+        '''
+        Get the hash of the problem, covering the content of the objective evaluation program of custom problems,
+        so that editing the program does not keep serving results of the old one (files imported by the program are not covered).
+        The program is only re-hashed when its modification time or size changes.
+        '''
+        if self.obj_func_path is None or not os.path.isfile(self.obj_func_path):
+            return self.cfg_hash
+        stat = os.stat(self.obj_func_path)
+        if self.obj_func_stat != (stat.st_mtime_ns, stat.st_size):
+            with open(self.obj_func_path, 'rb') as fp:
+                self.obj_func_hash = hashlib.sha256(fp.read()).hexdigest()
+            self.obj_func_stat = (stat.st_mtime_ns, stat.st_size)
+        return hashlib.sha256(f'{self.cfg_hash}|{self.obj_func_hash}'.encode()).hexdigest()
+
+    def _connect(self):
+        '''
+        Connect to the cache file and make sure the cache table exists.
+        '''
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('create table if not exists eval_cache (key text primary key, problem text, y text)')
+        return conn
+
+    def _get_key(self, x, problem_hash):
+        '''
+        Get the cache key of a design.
+        '''
+        design_str = json.dumps(canonicalize_design(x))
+        return hashlib.sha256(f'{self.problem_name}|{problem_hash}|{design_str}'.encode()).hexdigest()
+
+    def get(self, X):
+        '''
+        Look up the evaluation results of designs.
+
+        Parameters
+        ----------
+        X: np.array
+            Designs (raw).
+
+        Returns
+        -------
+        list
+            Cached performance (np.array) of each design, None if not cached.
+        '''
+        problem_hash = self._get_problem_hash()
+        keys = [self._get_key(x, problem_hash) for x in X]
+        conn = self._connect()
+        try:
+            result = []
+            for key in keys:
+                row = conn.execute('select y from eval_cache where key=?', (key,)).fetchone()
+                result.append(None if row is None else np.array(json.loads(row[0]), dtype=float))
+        finally:
+            conn.close()
+        return result
+
+    def put(self, X, Y):
+        '''
+        Store the evaluation results of designs.
+
+        Parameters
+        ----------
+        X: np.array
+            Designs (raw).
+        Y: np.array
+            Performance of the designs.
+        '''
+        problem_hash = self._get_problem_hash()
+        data = []
+        for x, y in zip(X, np.atleast_2d(Y)):
+            y = np.array(y, dtype=float)
+            if np.isnan(y).any(): continue
+            data.append((self._get_key(x, problem_hash), self.problem_name, json.dumps(y.tolist())))
+        if len(data) == 0: return
+
+        conn = self._connect()
+        try:
+            conn.executemany('insert or replace into eval_cache values (?, ?, ?)', data)
+            conn.commit()
+        finally:
+            conn.close()
@@ -10,6 +10,7 @@ from multiprocessing import cpu_count
 from autooed.problem import get_problem_config, check_problem_exist
 from autooed.mobo import check_algorithm_exist
 from autooed.mobo.hyperparams import get_hp_classes, get_hp_value
+from autooed.system.priority import get_eval_priority_names
 
 
 '''
@@ -21,6 +22,13 @@ config_map = {
         'init_sample_path': 'Path of provided initial samples',
         'n_worker': 'Number of evaluation workers',
         'batch_size': 'Batch size',
+        'eval_timeout': 'Evaluation timeout (seconds)',
+        'n_eval_retry': 'Number of retries of failed evaluations',
+        'eval_priority': 'Priority of waiting evaluations',
+        'eval_cache': 'Whether to cache evaluation results on disk',
+        'eval_broker': 'Address of the broker for remote evaluation workers',
+        'eval_broker_authkey': 'Authentication key of the broker',
+        'n_pipeline': 'Number of designs proposed ahead in auto mode',
     },
     'problem': {
         'name': 'Problem name',
@@ -115,7 +123,7 @@ def check_config(config):
     exp_cfg = config['experiment']
 
     for key in exp_cfg:
-        assert key in ['n_random_sample', 'init_sample_path', 'batch_size', 'n_iter', 'n_worker'], f'invalid key {key} in experiment config dictionary'
+        assert key in ['n_random_sample', 'init_sample_path', 'batch_size', 'n_iter', 'n_worker', 'eval_timeout', 'n_eval_retry', 'eval_priority', 'eval_cache', 'eval_broker', 'eval_broker_authkey', 'n_pipeline'], f'invalid key {key} in experiment config dictionary'
 
     assert 'n_random_sample' in exp_cfg or 'init_sample_path' in exp_cfg, 'either number of random initial samples or path to initial samples need to be provided'
     init_sample_exist = False
@@ -138,6 +146,25 @@ def check_config(config):
     if 'n_worker' in exp_cfg and exp_cfg['n_worker'] is not None:
         assert type(exp_cfg['n_worker']) == int and exp_cfg['n_worker'] > 0, 'number of evaluation workers must be a positive integer'
 
+    if 'eval_timeout' in exp_cfg and exp_cfg['eval_timeout'] is not None:
+        assert type(exp_cfg['eval_timeout']) in [int, float] and exp_cfg['eval_timeout'] > 0, 'evaluation timeout must be a positive number'
+
+    if 'n_eval_retry' in exp_cfg and exp_cfg['n_eval_retry'] is not None:
+        assert type(exp_cfg['n_eval_retry']) == int and exp_cfg['n_eval_retry'] >= 0, 'number of evaluation retries must be a non-negative integer'
+
+    if 'eval_priority' in exp_cfg and exp_cfg['eval_priority'] is not None:
+        assert exp_cfg['eval_priority'] in get_eval_priority_names(), f'undefined evaluation priority {exp_cfg["eval_priority"]}'
+
+    if 'eval_cache' in exp_cfg and exp_cfg['eval_cache'] is not None:
+        assert type(exp_cfg['eval_cache']) == bool, 'whether to cache evaluation results must be a boolean'
+
+    if 'eval_broker' in exp_cfg and exp_cfg['eval_broker'] is not None:
+        assert type(exp_cfg['eval_broker']) == str, 'address of the evaluation broker must be a string of "host:port" or a socket path'
+        assert type(exp_cfg.get('eval_broker_authkey')) == str and len(exp_cfg['eval_broker_authkey']) > 0, 'authentication key of the evaluation broker must be provided as a non-empty string'
+
+    if 'n_pipeline' in exp_cfg and exp_cfg['n_pipeline'] is not None:
+        assert type(exp_cfg['n_pipeline']) == int and exp_cfg['n_pipeline'] >= 0, 'number of designs proposed ahead must be a non-negative integer'
+
     # algorithm
     assert 'algorithm' in config, 'algorithm settings are not specified'
     assert isinstance(config['algorithm'], dict), 'algorithm settings must be specified as a dictionary'
@@ -164,6 +191,9 @@ def check_config(config):
         assert 'name' in algo_cfg['async'], 'asynchronous strategy name is not provided'
         assert algo_cfg['async']['name'] in get_hp_classes('async'), f'undefined asynchronous strategy {algo_cfg["async"]["name"]}'
 
+    if exp_cfg.get('n_pipeline'):
+        assert algo_cfg.get('async') is not None, 'asynchronous strategy must be specified for proposing designs ahead'
+
     if 'surrogate' in algo_cfg and algo_cfg['surrogate'] is not None:
         assert isinstance(algo_cfg['surrogate'], dict), 'surrogate settings must be provided as a dictionary'
         if algo_cfg['name'] == 'custom':
@@ -231,6 +261,27 @@ def complete_config(config, check=False):
     if 'n_worker' not in exp_cfg or exp_cfg['n_worker'] is None:
         exp_cfg['n_worker'] = exp_cfg['batch_size']
 
+    if 'eval_timeout' not in exp_cfg:
+        exp_cfg['eval_timeout'] = None
+
+    if 'n_eval_retry' not in exp_cfg or exp_cfg['n_eval_retry'] is None:
+        exp_cfg['n_eval_retry'] = 0
+
+    if 'eval_priority' not in exp_cfg or exp_cfg['eval_priority'] is None:
+        exp_cfg['eval_priority'] = 'fifo'
+
+    if 'eval_cache' not in exp_cfg or exp_cfg['eval_cache'] is None:
+        exp_cfg['eval_cache'] = False
+
+    if 'eval_broker' not in exp_cfg:
+        exp_cfg['eval_broker'] = None
+
+    if 'eval_broker_authkey' not in exp_cfg:
+        exp_cfg['eval_broker_authkey'] = None
+
+    if 'n_pipeline' not in exp_cfg or exp_cfg['n_pipeline'] is None:
+        exp_cfg['n_pipeline'] = 0
+
     # algorithm
     if 'n_process' not in algo_cfg or algo_cfg['n_process'] is None:
         algo_cfg['n_process'] = cpu_count()
@@ -7,6 +7,7 @@ import sys
 import sqlite3
 import numpy as np
 import yaml
+import json
 from multiprocessing import Lock, Process, Queue, Value
 from collections.abc import Iterable
 
@@ -27,6 +28,11 @@ table_descriptions = {
         config text not null
         ''',
 
+    '_scheduler_state': '''
+        name varchar(50) not null primary key,
+        state text not null
+        ''',
+
 }
 
 
@@ -313,6 +319,7 @@ class Database:
 
             # in case not removed completely
             self.execute(f'delete from _config where name="{name}"')
+            self.execute(f'delete from _scheduler_state where name="{name}"')
             self.execute(f'delete from _empty_table where name="{name}"')
 
             self.execute(f'insert into _empty_table values ("{name}")')
@@ -353,12 +360,13 @@ class Database:
             description.append(f'"_{obj_name}_pred_mean" float')
             description.append(f'"_{obj_name}_pred_std" float')
         description += ['pareto boolean', 'batch int not null']
-        description += ['_order int default -1', '_hypervolume float']
+        description += ['_order int default -1', '_hypervolume float', '_error text', '_eval_time float']
         
         with SafeLock(self.lock):
             self.execute(f'create table "{name}" ({",".join(description)})')
             self.execute(f'delete from _empty_table where name="{name}"')
             self.commit()
+        self.remove_solver_state(name)
 
     def remove_table(self, name):
         '''
@@ -375,7 +383,9 @@ class Database:
             if self.check_inited_table_exist(name):
                 self.execute(f'drop table "{name}"')
                 self.execute(f'delete from _config where name="{name}"')
+                self.execute(f'delete from _scheduler_state where name="{name}"')
                 self.commit()
+                self.remove_solver_state(name)
             elif self.check_table_exist(name, block=False):
                 self.execute(f'delete from _empty_table where name="{name}"')
                 self.commit()
@@ -436,6 +446,74 @@ class Database:
             config = yaml.load(config_str[0], Loader=yaml.FullLoader)
             return config
 
+    '''
+    scheduler state
+    '''
+
+    def update_scheduler_state(self, name, state):
+        '''
+        Journal the scheduler state of a database table.
+
+        Parameters
+        ----------
+        name: str
+            Name of the database table.
+        state: dict
+            Scheduler state (json serializable).
+        '''
+        state_str = json.dumps(state)
+        with SafeLock(self.lock):
+            self.execute('insert or replace into _scheduler_state (name, state) values (?, ?)', (name, state_str))
+            self.commit()
+
+    def query_scheduler_state(self, name):
+        '''
+        Query the journaled scheduler state of a given database table.
+
+        Parameters
+        ----------
+        name: str
+            Name of the database table.
+
+        Returns
+        -------
+        dict
+            Scheduler state (None if not found).
+        '''
+        state_str = self.execute('select state from _scheduler_state where name=?', (name,), fetchone=True)
+        if state_str is None:
+            return None
+        else:
+            return json.loads(state_str[0])
+
+    '''
+    solver state
+    '''
+
+    def get_solver_state_path(self, name):
+        '''
+        Get the path of the file keeping the solver population of a database table between optimizations (for solver warm start).
+
+        Parameters
+        ----------
+        name: str
+            Name of the database table.
+        '''
+        return os.path.join(os.path.dirname(self.data_path), 'solver_state', f'{name}.npz')
+
+    def remove_solver_state(self, name):
+        '''
+        Remove the solver population kept for a database table, so that a new table with the same name does not warm start from it.
+
+        Parameters
+        ----------
+        name: str
+            Name of the database table.
+        '''
+        state_path = self.get_solver_state_path(name)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
     '''
     basic operations
     '''
@@ -741,6 +819,25 @@ class Database:
         query = f'select count(*) from "{table}"'
         return self.execute(query, fetchone=True)[0]
 
+    def add_column(self, table, column, description):
+        '''
+        Add a column to a database table, nothing is done if the column already exists (e.g., added by another process).
+
+        Parameters
+        ----------
+        table: str
+            Name of the database table.
+        column: str
+            Name of the column to add.
+        description: str
+            Type and constraints of the column, e.g., "text" or "int default -1".
+        '''
+        with SafeLock(self.lock):
+            # check under the lock, adding an existing column raises in the database daemon
+            if column in self.get_column_names(table): return
+            self.execute(f'alter table "{table}" add column "{column}" {description}')
+            self.commit()
+
     def get_column_names(self, table):
         '''
         Get the column names of a database table.
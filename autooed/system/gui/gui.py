@@ -2,6 +2,7 @@ import os
 import shutil
 import yaml
 from time import time, sleep
+from threading import Event
 import numpy as np
 import matplotlib.pyplot as plt
 import tkinter as tk
@@ -218,7 +219,7 @@ class GUIController:
         try:
             scheduler.set_config(config)
         except Exception as e:
-            scheduler.stop_all()
+            scheduler.quit()
             self.database.remove_table(table_name)
             tk.messagebox.showinfo('Error', 'Invalid values in configuration: ' + str(e), parent=window)
             return
@@ -231,6 +232,9 @@ class GUIController:
         self.problem_cfg.update(self.config['problem'])
         self.agent = agent
         self.scheduler = scheduler
+        self.scheduler_updated = Event()
+        self.scheduler_updated.set()
+        self.scheduler.subscribe(self.scheduler_updated.set)
 
         # initialize window
         self._quit_init(quit_db=False)
@@ -299,18 +303,20 @@ class GUIController:
         '''
         Refresh current GUI status and redraw if data has changed
         '''
-        self.scheduler.refresh()
-        
-        # change button status when scheduler is free
-        if not self.scheduler.is_optimizing() and self.agent.check_initialized():
-            if not self.scheduler.is_evaluating_manual():
-                self.controller['panel_control'].enable_manual()
-            if self.agent.can_eval and not self.scheduler.is_evaluating_auto():
-                self.controller['panel_control'].enable_auto()
-
-        # log display
-        log_list = self.scheduler.logger.read()
-        self.controller['panel_log'].log(log_list)
+        # scheduling is driven by the scheduler itself, only update status when it notifies
+        if self.scheduler_updated.is_set():
+            self.scheduler_updated.clear()
+
+            # change button status when scheduler is free
+            if not self.scheduler.is_optimizing() and self.agent.check_initialized():
+                if not self.scheduler.is_evaluating_manual():
+                    self.controller['panel_control'].enable_manual()
+                if self.agent.can_eval and not self.scheduler.is_evaluating_auto():
+                    self.controller['panel_control'].enable_auto()
+
+            # log display
+            log_list = self.scheduler.logger.read()
+            self.controller['panel_log'].log(log_list)
 
         # check if database has changed
         checksum = self.database.get_checksum()
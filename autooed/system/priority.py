@@ -0,0 +1,112 @@
+'''
+Priorities of waiting evaluations, which decide the order of evaluations when workers are limited.
+'''
+
+import numpy as np
+
+from autooed.utils.pareto import convert_minimization, find_pareto_front, calc_hypervolume
+
+
+class EvaluatePriority:
+    '''
+    Base class of evaluation priority, higher score means earlier evaluation.
+    Evaluations with equal scores are launched in submission order, manual ones before auto ones.
+    '''
+    def __init__(self, agent):
+        '''
+        Parameters
+        ----------
+        agent: autooed.system.agent.LoadAgent
+            Agent that talks to algorithms and database.
+        '''
+        self.agent = agent
+
+    def score(self, rowids):
+        '''
+        Score designs to evaluate.
+
+        Parameters
+        ----------
+        rowids: list
+            Row numbers of the designs to evaluate.
+
+        Returns
+        -------
+        np.array
+            Priority scores of the designs.
+        '''
+        return np.zeros(len(rowids))
+
+
+class FIFOPriority(EvaluatePriority):
+    '''
+    Evaluate in submission order.
+    '''
+    pass
+
+
+class AgePriority(EvaluatePriority):
+    '''
+    Evaluate the oldest designs (i.e. smallest row numbers) first.
+    '''
+    def score(self, rowids):
+        return -np.array(rowids, dtype=float)
+
+
+class UncertaintyPriority(EvaluatePriority):
+    '''
+    Evaluate the designs with the largest predicted uncertainty first.
+    '''
+    def score(self, rowids):
+        Y_pred_std = self.agent.load('_Y_pred_std')[np.array(rowids) - 1]
+        scores = np.sum(Y_pred_std, axis=1)
+        return np.nan_to_num(scores, nan=0.0)
+
+
+class HypervolumeImprovementPriority(EvaluatePriority):
+    '''
+    Evaluate the designs with the largest optimistic hypervolume improvement (or objective improvement when n_obj == 1) first,
+    where the optimistic performance is the predicted mean minus the predicted standard deviation (in minimization form).
+    '''
+    def score(self, rowids):
+        obj_type = self.agent.problem_cfg['obj_type']
+        Y, Y_pred_mean, Y_pred_std = self.agent.load(['Y', '_Y_pred_mean', '_Y_pred_std'])
+        scores = np.zeros(len(rowids))
+
+        Y_valid = convert_minimization(Y[~np.isnan(Y).any(axis=1)], obj_type)
+        if len(Y_valid) == 0: return scores
+
+        idx = np.array(rowids) - 1
+        Y_opt = convert_minimization(Y_pred_mean[idx], obj_type) - Y_pred_std[idx]
+
+        if Y.shape[1] == 1:
+            scores = np.maximum(Y_valid.min() - Y_opt[:, 0], 0.0)
+        else:
+            pfront = find_pareto_front(Y_valid)
+            ref_point = np.max(Y_valid, axis=0)
+            hv = calc_hypervolume(pfront, ref_point)
+            for i, y_opt in enumerate(Y_opt):
+                if np.isnan(y_opt).any(): continue
+                scores[i] = calc_hypervolume(np.vstack([pfront, y_opt]), ref_point) - hv
+
+        return np.nan_to_num(scores, nan=0.0)
+
+
+def get_eval_priority(name):
+    '''
+    Get evaluation priority by name.
+    '''
+    eval_priority = {
+        'fifo': FIFOPriority,
+        'age': AgePriority,
+        'uncertainty': UncertaintyPriority,
+        'hvi': HypervolumeImprovementPriority,
+    }
+    return eval_priority[name]
+
+
+def get_eval_priority_names():
+    '''
+    Get names of all available evaluation priorities.
+    '''
+    return ['fifo', 'age', 'uncertainty', 'hvi']
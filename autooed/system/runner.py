@@ -0,0 +1,148 @@
+'''
+Headless runner that runs an experiment in auto mode without GUI.
+'''
+
+import numpy as np
+from time import strftime
+from threading import Event
+
+from autooed.system.config import complete_config
+from autooed.system.database import Database
+from autooed.system.agent import OptimizeAgent
+from autooed.system.scheduler import OptimizeScheduler
+from autooed.system.stop_criterion import get_stop_criterion
+
+
+class HeadlessRunner:
+    '''
+    Runner that creates or resumes an experiment in the database and runs it in auto mode until stopping criteria are met.
+    '''
+    def __init__(self, table_name, config=None, stop_criterion={}):
+        '''
+        Parameters
+        ----------
+        table_name: str
+            Name of the experiment (i.e. database table name).
+        config: dict
+            Experiment config (if None then load the config of an existing experiment).
+        stop_criterion: dict
+            Stopping criteria as a dictionary from criterion name to its value, e.g., {'n_sample': 100, 'time': 3600}.
+        '''
+        assert len(stop_criterion) > 0, 'at least one stopping criterion needs to be specified for auto mode'
+        self.table_name = table_name
+        self.config = config
+        self.stop_criterion_cfg = stop_criterion
+
+        self.database = None
+        self.agent = None
+        self.scheduler = None
+        self.updated = Event()
+
+    def log(self, text):
+        '''
+        Print log with timestamp.
+        '''
+        print(f'[{strftime("%Y-%m-%d %H:%M:%S")}] {text}', flush=True)
+
+    def _setup(self):
+        '''
+        Create or resume the experiment, return whether it is resumed.
+        '''
+        self.database = Database()
+
+        resume = self.database.check_inited_table_exist(name=self.table_name)
+        if resume:
+            if self.config is None:
+                self.config = self.database.query_config(self.table_name)
+                assert self.config is not None, f'cannot find config of experiment {self.table_name}'
+            else:
+                self.config = complete_config(self.config, check=True)
+        else:
+            assert self.config is not None, f'experiment {self.table_name} does not exist, config needs to be provided'
+            self.config = complete_config(self.config, check=True)
+            if not self.database.check_table_exist(name=self.table_name):
+                self.database.create_table(self.table_name)
+
+        self.agent = OptimizeAgent(self.database, self.table_name)
+        self.scheduler = OptimizeScheduler(self.agent)
+        self.scheduler.subscribe(self.updated.set)
+        self.scheduler.set_config(self.config)
+        assert self.agent.can_eval, 'evaluation function is not provided, cannot run in auto mode'
+
+        if resume and not self.scheduler.is_evaluating() and not self.scheduler.auto_scheduling:
+            # re-evaluate designs whose evaluations were interrupted but not journaled by the scheduler (failed ones are not retried)
+            Y, status = self.agent.load(['Y', 'status'])
+            rowids = (np.where(np.isnan(Y).any(axis=1) & (status != 'failed'))[0] + 1).tolist() if len(Y) > 0 else []
+            if len(rowids) > 0:
+                self.log(f'resuming evaluation for row {",".join([str(r) for r in rowids])}')
+                self.scheduler.evaluate_manual(rowids)
+
+        return resume
+
+    def _wait(self, finished):
+        '''
+        Wait for scheduler updates and print logs until finished() returns True.
+        '''
+        n_valid_sample = None
+        while True:
+            self.updated.wait()
+            self.updated.clear()
+
+            for text in self.scheduler.logger.read():
+                self.log(text)
+
+            if self.agent.check_table_exist():
+                curr_n_valid_sample = self.agent.get_n_valid_sample()
+                if curr_n_valid_sample != n_valid_sample:
+                    n_valid_sample = curr_n_valid_sample
+                    self._log_progress(n_valid_sample)
+
+            if finished():
+                break
+
+    def _log_progress(self, n_valid_sample):
+        '''
+        Log the number of evaluated samples and the current best performance.
+        '''
+        if n_valid_sample == 0: return
+        if self.agent.problem_cfg['n_obj'] == 1:
+            self.log(f'{n_valid_sample} samples evaluated, optimum: {self.agent.get_optimum()}')
+        else:
+            self.log(f'{n_valid_sample} samples evaluated, hypervolume: {self.agent.get_max_hv()}')
+
+    def run(self):
+        '''
+        Run the experiment in auto mode until stopping criteria are met.
+        '''
+        resume = self._setup()
+        self.log(f'{"resumed" if resume else "created"} experiment {self.table_name}')
+
+        try:
+            if self.scheduler.auto_scheduling:
+                # auto mode resumed by the scheduler from the journaled state, with the progress of its stopping criteria
+                self.log('auto mode resumed with the stopping criteria of the interrupted run')
+            else:
+                # wait for initialization (or resumed evaluations) to finish
+                self._wait(lambda: self.agent.check_initialized() and not self.scheduler.is_evaluating())
+
+                # run auto mode
+                stop_criterion = [get_stop_criterion(name)(self.agent, value) for name, value in self.stop_criterion_cfg.items()]
+                self.scheduler.optimize_auto(stop_criterion=stop_criterion)
+
+            self._wait(lambda: not self.scheduler.auto_scheduling and not self.scheduler.is_optimizing() and not self.scheduler.is_evaluating())
+            self.log('experiment finished')
+
+        except KeyboardInterrupt:
+            self.log('experiment interrupted')
+
+        finally:
+            self.quit()
+
+    def quit(self):
+        '''
+        Quit the scheduler and database.
+        '''
+        if self.scheduler is not None:
+            self.scheduler.quit()
+        if self.database is not None:
+            self.database.quit()
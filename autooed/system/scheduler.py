@@ -3,10 +3,295 @@ Schedulers for scheduling evaluation and optimization in a parallel scenario.
 '''
 
 import numpy as np
-from multiprocessing import Process, Queue
+from time import time
+from functools import wraps
+from threading import Thread, Lock, RLock
+from multiprocessing import Process, Queue, Pipe
+from multiprocessing.connection import wait
 
 from autooed.problem import build_problem, get_problem_config
 from autooed.utils.initialization import get_initial_samples
+from autooed.system.worker import EvaluateWorkerPool
+from autooed.system.broker import EvaluateBroker
+from autooed.system.priority import get_eval_priority
+from autooed.system.stop_criterion import get_stop_criterion, get_name
+
+
+def _rowid_str(rowid):
+    '''
+    Format the row number(s) handled by a worker for logging.
+    '''
+    if isinstance(rowid, list):
+        return ",".join([str(r) for r in rowid])
+    return str(rowid)
+
+
+def _contain_rowid(rowid_, rowid):
+    '''
+    Check if the row number(s) handled by a worker contain the given row number.
+    '''
+    if isinstance(rowid_, list):
+        return rowid in rowid_
+    return rowid_ == rowid
+
+
+def _flatten_rowid(worker_list):
+    '''
+    Get all row numbers handled by a list of workers.
+    '''
+    rowids = []
+    for _, rowid in worker_list:
+        rowids.extend(rowid if isinstance(rowid, list) else [rowid])
+    return rowids
+
+
+def _count_rowid(worker_list):
+    '''
+    Count the number of rows handled by a list of workers.
+    '''
+    return sum([len(rowid) if isinstance(rowid, list) else 1 for _, rowid in worker_list])
+
+
+def create_eval_workers(pool, rowids, eval_func=None, scores=None, n_task=1, max_batch_size=None):
+    '''
+    Create evaluation tasks for given row numbers. If the problem supports batch evaluation, the rows with the highest scores
+    (at most max_batch_size of them) are split into at most n_task batch tasks that can run in parallel,
+    while the remaining rows (e.g., designs proposed ahead) are single tasks waiting for the next free workers.
+
+    Parameters
+    ----------
+    pool: autooed.system.worker.EvaluateWorkerPool
+        Pool of evaluation workers executing the tasks.
+    rowids: list
+        Row numbers of data to evaluate.
+    eval_func: function
+        Provided evaluation function.
+    scores: np.array
+        Priority scores of the rows (if None then all zeros), a batch task takes the highest score of its rows.
+    n_task: int
+        Maximum number of batch tasks, usually the number of free workers.
+    max_batch_size: int
+        Maximum number of rows evaluated in batch tasks (if None then all rows).
+
+    Returns
+    -------
+    list
+        List of [task, rowid] pairs, where rowid is a list of row numbers for a batch task.
+    '''
+    if scores is None:
+        scores = np.zeros(len(rowids))
+    scores = np.array(scores, dtype=float)
+
+    workers = []
+    if eval_func is None and pool.agent.can_eval_batch and len(rowids) > 1:
+        order = np.argsort(-scores, kind='stable')
+        n_batch = len(rowids) if max_batch_size is None else max(min(len(rowids), max_batch_size), 1)
+        for indices in np.array_split(order[:n_batch], min(max(n_task, 1), n_batch)):
+            indices = np.sort(indices)
+            if len(indices) > 1:
+                rowid = [rowids[i] for i in indices]
+                task = pool.create_task(rowid)
+            else:
+                rowid = rowids[indices[0]]
+                task = pool.create_task(rowid, eval_func)
+            task.priority = float(np.max(scores[indices]))
+            workers.append([task, rowid])
+        indices_single = np.sort(order[n_batch:])
+    else:
+        indices_single = np.arange(len(rowids))
+
+    for i in indices_single:
+        task = pool.create_task(rowids[i], eval_func)
+        task.priority = float(scores[i])
+        workers.append([task, rowids[i]])
+    return workers
+
+
+def evaluate_cached(agent, logger, rowids):
+    '''
+    Complete the evaluations found in the evaluation cache instead of dispatching them to workers.
+
+    Parameters
+    ----------
+    agent: autooed.system.agent.EvaluateAgent
+        Agent that talks to algorithms and database.
+    logger: autooed.system.scheduler.Logger
+        Logger of the scheduler.
+    rowids: list
+        Row numbers of data to evaluate.
+
+    Returns
+    -------
+    list
+        Row numbers of data that still need evaluation.
+    '''
+    rowids_cached = agent.evaluate_cached(rowids)
+    if len(rowids_cached) > 0:
+        logger.add(f'evaluation for row {_rowid_str(rowids_cached)} found in cache')
+    return [rowid for rowid in rowids if rowid not in rowids_cached]
+
+
+def push_eval_workers(workers_wait, workers, front=False):
+    '''
+    Insert evaluation tasks to the waiting list, which is kept in descending order of priority.
+
+    Parameters
+    ----------
+    workers_wait: list
+        List of [task, rowid] pairs of waiting evaluations, modified in place.
+    workers: list
+        List of [task, rowid] pairs to insert.
+    front: bool
+        Whether to insert before (instead of after) the waiting tasks with equal priority.
+    '''
+    for worker_info in sorted(workers, key=lambda w: -w[0].priority):
+        priority = worker_info[0].priority
+        idx = 0
+        while idx < len(workers_wait) and (workers_wait[idx][0].priority > priority or (not front and workers_wait[idx][0].priority == priority)):
+            idx += 1
+        workers_wait.insert(idx, worker_info)
+
+
+def check_eval_workers(workers_run, workers_wait, logger, agent, eval_timeout=None, n_eval_retry=0):
+    '''
+    Check running evaluation tasks, terminate those exceeding the timeout, and retry or mark failed the ones with errors.
+
+    Parameters
+    ----------
+    workers_run: list
+        List of [task, rowid] pairs of running evaluations, completed ones are removed in place.
+    workers_wait: list
+        List of [task, rowid] pairs of waiting evaluations, retried ones are put in front of those with equal priority in place.
+    logger: autooed.system.scheduler.Logger
+        Logger of the scheduler.
+    agent: autooed.system.agent.EvaluateAgent
+        Agent that talks to algorithms and database.
+    eval_timeout: float
+        Maximum running time (in seconds) of an evaluation (if None then no timeout).
+    n_eval_retry: int
+        Maximum number of retries of a failed evaluation.
+
+    Returns
+    -------
+    list
+        List of [task, rowid] pairs of evaluations that are completed (succeeded or failed without retry left).
+    '''
+    completed_workers, retried_workers, retry_workers = [], [], []
+
+    for worker_info in workers_run:
+        eval_worker, rowid = worker_info
+        if eval_timeout is not None and eval_worker.is_alive() and eval_worker.get_running_time() > eval_timeout:
+            eval_worker.terminate()
+            eval_worker.error = f'evaluation timed out after {eval_timeout} seconds'
+        if eval_worker.is_alive(): continue
+
+        if eval_worker.error is None:
+            logger.add(f'evaluation for row {_rowid_str(rowid)} finished')
+            completed_workers.append(worker_info)
+        elif eval_worker.n_retry < n_eval_retry:
+            logger.add(f'evaluation for row {_rowid_str(rowid)} failed ({eval_worker.error}), retrying ({eval_worker.n_retry + 1}/{n_eval_retry})')
+            retry_worker = eval_worker.pool.create_task(eval_worker.rowid, eval_worker.eval_func, n_retry=eval_worker.n_retry + 1)
+            retry_worker.priority = eval_worker.priority
+            retried_workers.append(worker_info)
+            retry_workers.append([retry_worker, rowid])
+        else:
+            logger.add(f'evaluation for row {_rowid_str(rowid)} failed ({eval_worker.error})')
+            rowids = rowid if isinstance(rowid, list) else [rowid]
+            agent.update_failure(rowids, eval_worker.error)
+            completed_workers.append(worker_info)
+
+    for worker_info in completed_workers + retried_workers:
+        workers_run.remove(worker_info)
+    push_eval_workers(workers_wait, retry_workers, front=True)
+
+    return completed_workers
+
+
+def stop_eval_workers(workers_run, workers_wait, logger, agent, rowid=None):
+    '''
+    Stop evaluation tasks. When a single row of a batch task is stopped, the other rows of the batch are not stopped with it,
+    instead they are reset to unevaluated and put back to the waiting list as a new task.
+
+    Parameters
+    ----------
+    workers_run: list
+        List of [task, rowid] pairs of running evaluations, stopped ones are removed in place.
+    workers_wait: list
+        List of [task, rowid] pairs of waiting evaluations, stopped ones are removed in place.
+    logger: autooed.system.scheduler.Logger
+        Logger of the scheduler.
+    agent: autooed.system.agent.EvaluateAgent
+        Agent that talks to algorithms and database.
+    rowid: int
+        Row number of the evaluation to stop (if None then stop all evaluations).
+    '''
+    if rowid is None:
+        for eval_worker, rowid_ in workers_run:
+            if eval_worker.is_alive():
+                eval_worker.terminate()
+                logger.add(f'evaluation for row {_rowid_str(rowid_)} stopped')
+        workers_run.clear()
+        workers_wait.clear()
+        return
+
+    requeue_workers = []
+
+    for worker_list, running in [(workers_run, True), (workers_wait, False)]:
+        for worker_info in worker_list:
+            eval_worker, rowid_ = worker_info
+            if not _contain_rowid(rowid_, rowid) or (running and not eval_worker.is_alive()): continue
+
+            if running:
+                eval_worker.terminate()
+                logger.add(f'evaluation for row {rowid} stopped')
+            worker_list.remove(worker_info)
+
+            # put the other rows of the batch back to waiting
+            if isinstance(rowid_, list) and len(rowid_) > 1:
+                rowids_other = [r for r in rowid_ if r != rowid]
+                if running:
+                    agent.reset_evaluation(rowids_other)
+                rowid_other = rowids_other if len(rowids_other) > 1 else rowids_other[0]
+                requeue_worker = eval_worker.pool.create_task(rowid_other, eval_worker.eval_func)
+                requeue_worker.priority = eval_worker.priority
+                requeue_workers.append([requeue_worker, rowid_other])
+                logger.add(f'evaluation for row {_rowid_str(rowid_other)} put back to waiting')
+            break
+
+    push_eval_workers(workers_wait, requeue_workers, front=True)
+
+
+def get_eval_wait_timeout(workers_run, eval_timeout=None):
+    '''
+    Get the time (in seconds) until the earliest running evaluation times out.
+
+    Parameters
+    ----------
+    workers_run: list
+        List of [task, rowid] pairs of running evaluations.
+    eval_timeout: float
+        Maximum running time (in seconds) of an evaluation (if None then no timeout).
+
+    Returns
+    -------
+    float
+        Time until the earliest timeout (None if no timeout applies).
+    '''
+    if eval_timeout is None or workers_run == []: return None
+    return max(min([eval_timeout - worker.get_running_time() for worker, _ in workers_run]), 0.0)
+
+
+def scheduler_command(func):
+    '''
+    Decorator of scheduler commands, which run while holding the scheduler lock and wake up the event loop afterwards.
+    '''
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            result = func(self, *args, **kwargs)
+        self._notify()
+        return result
+    return wrapper
 
 
 class Logger:
@@ -15,6 +300,7 @@ class Logger:
     '''
     def __init__(self):
         self.logs = []
+        self.lock = Lock()
 
     def add(self, log):
         '''
@@ -25,7 +311,8 @@ class Logger:
         log: str
             Text to log.
         '''
-        self.logs.append(log)
+        with self.lock:
+            self.logs.append(log)
 
     def read(self, clear=True):
         '''
@@ -41,9 +328,10 @@ class Logger:
         logs: list
             List of logs since last read.
         '''
-        logs = self.logs.copy()
-        if clear:
-            self.logs = []
+        with self.lock:
+            logs = self.logs.copy()
+            if clear:
+                self.logs = []
         return logs
 
 
@@ -61,12 +349,15 @@ class EvaluateScheduler:
         self.agent = agent
         self.logger = Logger()
 
+        self.eval_pool = EvaluateWorkerPool(agent)
         self.eval_workers_run = []
         self.eval_workers_wait = []
 
         self.n_worker = 0
+        self.eval_timeout = None
+        self.n_eval_retry = 0
 
-    def evaluate(self, eval_func, rowids, n_worker):
+    def evaluate(self, eval_func, rowids, n_worker, eval_timeout=None, n_eval_retry=0):
         '''
         Evaluate certain rows of data.
 
@@ -78,12 +369,19 @@ class EvaluateScheduler:
             Row numbers of data to evaluate.
         n_worker: int
             Number of evaluation workers that can evaluatein parallel.
+        eval_timeout: float
+            Maximum running time (in seconds) of an evaluation (if None then no timeout).
+        n_eval_retry: int
+            Maximum number of retries of a failed evaluation.
         '''
         if not (self.agent.can_eval or eval_func is not None): return
         self.n_worker = n_worker
-        for rowid in rowids:
-            worker = Process(target=self.agent.evaluate, args=(rowid, eval_func))
-            self.eval_workers_wait.append([worker, rowid])
+        self.eval_timeout = eval_timeout
+        self.n_eval_retry = n_eval_retry
+        if eval_func is None:
+            rowids = evaluate_cached(self.agent, self.logger, rowids)
+        n_free_worker = n_worker - len(self.eval_workers_run) - len(self.eval_workers_wait)
+        push_eval_workers(self.eval_workers_wait, create_eval_workers(self.eval_pool, rowids, eval_func, n_task=n_free_worker))
 
     def is_evaluating(self):
         '''
@@ -100,23 +398,15 @@ class EvaluateScheduler:
         bool
             Whether ongoing evaluations have finished.
         '''
-        completed_workers = []
-
-        # check if eval workers finished
-        for worker_info in self.eval_workers_run:
-            eval_worker, rowid = worker_info
-            if not eval_worker.is_alive():
-                self.logger.add(f'evaluation for row {rowid} finished')
-                completed_workers.append(worker_info)
-
-        for worker_info in completed_workers:
-            self.eval_workers_run.remove(worker_info)
+        # check if eval workers finished, timed out or failed
+        completed_workers = check_eval_workers(self.eval_workers_run, self.eval_workers_wait, self.logger, self.agent,
+            self.eval_timeout, self.n_eval_retry)
         
         # launch waiting eval workers
         while len(self.eval_workers_run) < self.n_worker and self.eval_workers_wait != []:
             worker, rowid = self.eval_workers_wait.pop(0)
             worker.start()
-            self.logger.add(f'evaluation for row {rowid} started')
+            self.logger.add(f'evaluation for row {_rowid_str(rowid)} started')
             self.eval_workers_run.append([worker, rowid])
 
         eval_finished = len(completed_workers) > 0 and self.eval_workers_run == []
@@ -137,46 +427,21 @@ class EvaluateScheduler:
         rowid: int
             Row number of the evaluation to stop (if None then stop all evaluations)
         '''
-        stop_all = rowid is None
-        worker_run_stopped = None
-        worker_wait_stopped = None
-
-        # stop running workers
-        for worker_info in self.eval_workers_run:
-            worker, rowid_ = worker_info
-            if (stop_all or rowid_ == rowid) and worker.is_alive():
-                worker.terminate()
-                self.logger.add(f'evaluation for row {rowid_} stopped')
-                if not stop_all:
-                    worker_run_stopped = worker_info
-                    break
-        
-        # stop waiting workers
-        for worker_info in self.eval_workers_wait:
-            worker, rowid_ = worker_info
-            if not stop_all and rowid_ == rowid:
-                worker_wait_stopped = worker_info
-                break
-        
-        if stop_all:
-            self.eval_workers_run = []
-            self.eval_workers_wait = []
-        else:
-            if worker_run_stopped is not None:
-                self.eval_workers_run.remove(worker_run_stopped)
-            if worker_wait_stopped is not None:
-                self.eval_workers_wait.remove(worker_wait_stopped)
+        stop_eval_workers(self.eval_workers_run, self.eval_workers_wait, self.logger, self.agent, rowid)
 
     def quit(self):
         '''
         Quit the scheduler.
         '''
         self.stop_evaluate()
+        self.eval_pool.quit()
 
 
 class OptimizeScheduler:
     '''
     Scheduler for evaluation and optimization.
+    Scheduling is driven by an event loop in a background thread, which wakes up as soon as a worker finishes
+    or a command is issued, launches follow-up work, then notifies the subscribers (e.g., GUI).
     '''
     def __init__(self, agent):
         '''
@@ -192,10 +457,15 @@ class OptimizeScheduler:
         self.opt_queue = Queue()
         self.n_optimizing_sample = 0
         self.pred_workers = []
+        self.eval_pool = EvaluateWorkerPool(agent)
+        self.eval_broker = None
         self.eval_workers_manual_run = []
         self.eval_workers_manual_wait = []
         self.eval_workers_auto_run = []
         self.eval_workers_auto_wait = []
+        self.eval_priority = None
+        self.eval_manual_cached = False
+        self.eval_auto_cached = False
 
         self.initializing = False
 
@@ -203,9 +473,94 @@ class OptimizeScheduler:
         self.stop_criterion = []
         self.auto_scheduling = False
 
+        # event loop
+        self.lock = RLock()
+        self.subscribers = []
+        self.notify_conn_recv, self.notify_conn_send = Pipe(duplex=False)
+        self.running = True
+        self.event_thread = Thread(target=self._event_loop, daemon=True)
+        self.event_thread.start()
+
+    '''
+    Event loop
+    '''
+
+    def subscribe(self, callback):
+        '''
+        Subscribe to scheduler updates.
+
+        Parameters
+        ----------
+        callback: function
+            Function called without arguments (from the event loop thread) after the scheduler status is updated.
+        '''
+        self.subscribers.append(callback)
+
+    def _notify(self):
+        '''
+        Wake up the event loop.
+        '''
+        self.notify_conn_send.send(None)
+
+    def _publish(self):
+        '''
+        Notify the subscribers that the scheduler status is updated.
+        '''
+        for callback in self.subscribers:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.add(f'error in scheduler subscriber: {e}')
+
+    def _get_wait_objects(self):
+        '''
+        Get objects to wait on, which become ready when a command is issued or a worker finishes.
+        '''
+        objects = [self.notify_conn_recv]
+        objects.extend([worker.sentinel for worker in self.opt_workers])
+        objects.extend([worker.sentinel for worker, _ in self.pred_workers])
+        objects.extend(self.eval_pool.get_wait_objects())
+        if self.eval_broker is not None:
+            objects.extend(self.eval_broker.get_wait_objects())
+        return objects
+
+    def _get_wait_timeout(self):
+        '''
+        Get the maximum time to wait, so that the event loop wakes up when a running evaluation times out.
+        '''
+        if self.config is None: return None
+        eval_timeout = self.config['experiment'].get('eval_timeout')
+        wait_timeout = get_eval_wait_timeout(self.eval_workers_manual_run + self.eval_workers_auto_run, eval_timeout)
+        return wait_timeout
+
+    def _event_loop(self):
+        '''
+        Main loop of scheduling, react to finished workers and issued commands.
+        '''
+        while self.running:
+            with self.lock:
+                wait_objects = self._get_wait_objects()
+                wait_timeout = self._get_wait_timeout()
+            ready_objects = wait(wait_objects, timeout=wait_timeout)
+            if self.notify_conn_recv in ready_objects:
+                while self.notify_conn_recv.poll():
+                    self.notify_conn_recv.recv()
+            if not self.running: break
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.add(f'error in scheduling: {e}')
+            self._publish()
+
+    '''
+    Commands
+    '''
+
+    @scheduler_command
     def set_config(self, config):
         '''
         Set config, update agent's config and start initialization if available.
+        Resume from the journaled state if an existing experiment is loaded for the first time.
         '''
         if not self.agent.check_table_exist() and not self.initializing: # check if initializing
 
@@ -217,13 +572,38 @@ class OptimizeScheduler:
 
             self.config = config.copy()
             self.agent.set_config(self.config)
+            self.eval_priority = get_eval_priority(self.config['experiment'].get('eval_priority', 'fifo'))(self.agent)
+            self._set_eval_broker()
 
             rowids_unevaluated = self.agent.initialize(X_init_evaluated, X_init_unevaluated, Y_init_evaluated)
             if rowids_unevaluated is not None:
                 self.evaluate_manual(rowids_unevaluated)
         else:
+            resume = self.config is None
             self.config = config.copy()
             self.agent.set_config(self.config)
+            self.eval_priority = get_eval_priority(self.config['experiment'].get('eval_priority', 'fifo'))(self.agent)
+            self._set_eval_broker()
+            if resume:
+                self._resume_state()
+
+    def _set_eval_broker(self):
+        '''
+        Start or stop the broker for remote evaluation workers according to the config.
+        '''
+        address = self.config['experiment'].get('eval_broker')
+        if self.eval_broker is not None and self.eval_broker.address != address:
+            self.eval_broker.quit()
+            self.eval_broker = None
+        if address is not None and self.eval_broker is None:
+            self.eval_broker = EvaluateBroker(self.agent, address, self.config['experiment']['eval_broker_authkey'])
+            self.logger.add(f'broker for remote evaluation workers listening on {address}')
+
+    def _get_eval_pool(self):
+        '''
+        Get the pool executing new evaluation tasks, i.e. the broker for remote workers if enabled, otherwise the local worker pool.
+        '''
+        return self.eval_pool if self.eval_broker is None else self.eval_broker
 
     def _optimize(self, batch_size=None):
         '''
@@ -241,12 +621,25 @@ class OptimizeScheduler:
         else:
             self.n_optimizing_sample += batch_size
 
+    def _get_auto_batch_size(self):
+        '''
+        Get the number of designs to propose in auto mode, so that a batch of designs is being evaluated
+        while n_pipeline extra designs are proposed ahead and wait for the next free workers.
+        '''
+        n_pipeline = self.config['experiment'].get('n_pipeline', 0)
+        n_evaluating_sample = _count_rowid(self.eval_workers_manual_run) + _count_rowid(self.eval_workers_auto_run)
+        if n_pipeline > 0:
+            n_evaluating_sample += _count_rowid(self.eval_workers_auto_wait)
+        return self.config['experiment']['batch_size'] + n_pipeline - n_evaluating_sample - self.n_optimizing_sample
+
+    @scheduler_command
     def optimize_manual(self):
         '''
         Optimize in manual mode.
         '''
         self._optimize()
 
+    @scheduler_command
     def optimize_auto(self, stop_criterion=[]):
         '''
         Optimize in auto mode.
@@ -261,8 +654,9 @@ class OptimizeScheduler:
         self.stop_criterion = stop_criterion
         for criterion in self.stop_criterion:
             criterion.start()
-        self._optimize()
+        self._optimize(batch_size=self.config['experiment']['batch_size'] + self.config['experiment'].get('n_pipeline', 0))
 
+    @scheduler_command
     def predict(self, rowids):
         '''
         Predict the performance of given row numbers.
@@ -277,7 +671,28 @@ class OptimizeScheduler:
         worker.start()
         self.pred_workers.append([worker, rowids])
 
-    def evaluate_manual(self, rowids):
+    def _score_evaluation(self, rowids, priority=None):
+        '''
+        Compute priority scores of the rows to evaluate.
+        '''
+        if priority is not None:
+            return np.full(len(rowids), float(priority))
+        if self.eval_priority is None:
+            return np.zeros(len(rowids))
+        return self.eval_priority.score(rowids)
+
+    def _create_eval_workers(self, rowids, scores):
+        '''
+        Create evaluation tasks, where batch tasks are split among the free workers and hold at most batch_size rows,
+        so that the designs proposed ahead are left as single tasks waiting for the next free workers.
+        '''
+        n_free_worker = self.config['experiment']['n_worker'] - \
+            len(self.eval_workers_manual_run + self.eval_workers_manual_wait + self.eval_workers_auto_run + self.eval_workers_auto_wait)
+        return create_eval_workers(self._get_eval_pool(), rowids, scores=scores, n_task=n_free_worker,
+            max_batch_size=self.config['experiment']['batch_size'])
+
+    @scheduler_command
+    def evaluate_manual(self, rowids, priority=None):
         '''
         Evaluate the performance of given row numbers in manual mode.
 
@@ -285,13 +700,20 @@ class OptimizeScheduler:
         ----------
         rowids: list
             Row numbers of the data to evaluate.
+        priority: float
+            User-specified priority of these evaluations (if None then scored by the evaluation priority in config).
         '''
         if not self.agent.can_eval: return
-        for rowid in rowids:
-            worker = Process(target=self.agent.evaluate, args=(rowid,))
-            self.eval_workers_manual_wait.append([worker, rowid])
+        rowids_uncached = evaluate_cached(self.agent, self.logger, rowids)
+        if len(rowids_uncached) < len(rowids):
+            self.eval_manual_cached = True
+        rowids = rowids_uncached
+        if len(rowids) == 0: return
+        scores = self._score_evaluation(rowids, priority)
+        push_eval_workers(self.eval_workers_manual_wait, self._create_eval_workers(rowids, scores))
 
-    def evaluate_auto(self, rowids):
+    @scheduler_command
+    def evaluate_auto(self, rowids, priority=None):
         '''
         Evaluate the performance of given row numbers in auto mode.
 
@@ -299,11 +721,21 @@ class OptimizeScheduler:
         ----------
         rowids: list
             Row numbers of the data to evaluate.
+        priority: float
+            User-specified priority of these evaluations (if None then scored by the evaluation priority in config).
         '''
         if not self.agent.can_eval: return
-        for rowid in rowids:
-            worker = Process(target=self.agent.evaluate, args=(rowid,))
-            self.eval_workers_auto_wait.append([worker, rowid])
+        rowids_uncached = evaluate_cached(self.agent, self.logger, rowids)
+        if len(rowids_uncached) < len(rowids):
+            self.eval_auto_cached = True
+        rowids = rowids_uncached
+        if len(rowids) == 0: return
+        scores = self._score_evaluation(rowids, priority)
+        push_eval_workers(self.eval_workers_auto_wait, self._create_eval_workers(rowids, scores))
+
+    '''
+    Status
+    '''
 
     def is_optimizing(self):
         '''
@@ -356,9 +788,11 @@ class OptimizeScheduler:
         for worker in self.opt_workers:
             if not worker.is_alive():
                 try:
-                    rowids = self.opt_queue.get(block=False)
+                    rowids = self.opt_queue.get(timeout=1)
                 except:
-                    raise Exception('optimization worker finished without returning rowids of the design to evaluate')
+                    self.logger.add('error: optimization worker finished without returning rowids of the design to evaluate')
+                    completed_workers.append(worker)
+                    continue
                 rowids_list.append(rowids)
                 self.logger.add(f'optimization for row {",".join([str(r) for r in rowids])} finished')
                 completed_workers.append(worker)
@@ -367,6 +801,8 @@ class OptimizeScheduler:
 
         for worker in completed_workers:
             self.opt_workers.remove(worker)
+        if self.opt_workers == []:
+            self.n_optimizing_sample = 0
 
         if rowids_list != []:
             rowids_list = np.concatenate(rowids_list).tolist()
@@ -407,50 +843,125 @@ class OptimizeScheduler:
         bool
             Whether ongoing auto evaluations have finished.
         '''
-        completed_workers_manual, completed_workers_auto = [], []
-
-        # check if manual eval workers finished
-        for worker_info in self.eval_workers_manual_run:
-            eval_worker, rowid = worker_info
-            if not eval_worker.is_alive():
-                self.logger.add(f'evaluation for row {rowid} finished')
-                completed_workers_manual.append(worker_info)
+        eval_timeout, n_eval_retry = self.config['experiment'].get('eval_timeout'), self.config['experiment'].get('n_eval_retry', 0)
 
-        for worker_info in completed_workers_manual:
-            self.eval_workers_manual_run.remove(worker_info)
+        # check if manual eval workers finished, timed out or failed
+        completed_workers_manual = check_eval_workers(self.eval_workers_manual_run, self.eval_workers_manual_wait, self.logger, self.agent,
+            eval_timeout, n_eval_retry)
         
-        # check if auto eval workers finished
-        for worker_info in self.eval_workers_auto_run:
-            eval_worker, rowid = worker_info
-            if not eval_worker.is_alive():
-                self.logger.add(f'evaluation for row {rowid} finished')
-                completed_workers_auto.append(worker_info)
-
-        for worker_info in completed_workers_auto:
-            self.eval_workers_auto_run.remove(worker_info)
-
-        # launch waiting manual eval workers
-        while len(self.eval_workers_manual_run) + len(self.eval_workers_auto_run) < self.config['experiment']['n_worker'] and self.eval_workers_manual_wait != []:
-            worker, rowid = self.eval_workers_manual_wait.pop(0)
-            worker.start()
-            self.logger.add(f'evaluation for row {rowid} started')
-            self.eval_workers_manual_run.append([worker, rowid])
-
-        # launch waiting auto eval workers
-        while len(self.eval_workers_manual_run) + len(self.eval_workers_auto_run) < self.config['experiment']['n_worker'] and self.eval_workers_auto_wait != []:
-            worker, rowid = self.eval_workers_auto_wait.pop(0)
+        # check if auto eval workers finished, timed out or failed
+        completed_workers_auto = check_eval_workers(self.eval_workers_auto_run, self.eval_workers_auto_wait, self.logger, self.agent,
+            eval_timeout, n_eval_retry)
+
+        # launch waiting eval workers with the highest priority, manual ones first when tied
+        while len(self.eval_workers_manual_run) + len(self.eval_workers_auto_run) < self.config['experiment']['n_worker'] and \
+            (self.eval_workers_manual_wait != [] or self.eval_workers_auto_wait != []):
+            if self.eval_workers_auto_wait == [] or \
+                (self.eval_workers_manual_wait != [] and self.eval_workers_manual_wait[0][0].priority >= self.eval_workers_auto_wait[0][0].priority):
+                workers_wait, workers_run = self.eval_workers_manual_wait, self.eval_workers_manual_run
+            else:
+                workers_wait, workers_run = self.eval_workers_auto_wait, self.eval_workers_auto_run
+            worker, rowid = workers_wait.pop(0)
             worker.start()
-            self.logger.add(f'evaluation for row {rowid} started')
-            self.eval_workers_auto_run.append([worker, rowid])
+            self.logger.add(f'evaluation for row {_rowid_str(rowid)} started')
+            workers_run.append([worker, rowid])
 
-        eval_manual_finished = len(completed_workers_manual) > 0
-        eval_auto_finished = len(completed_workers_auto) > 0
+        # evaluations completed from the cache also count as finished
+        eval_manual_finished = len(completed_workers_manual) > 0 or self.eval_manual_cached
+        eval_auto_finished = len(completed_workers_auto) > 0 or self.eval_auto_cached
+        self.eval_manual_cached, self.eval_auto_cached = False, False
         return eval_manual_finished, eval_auto_finished
 
     def refresh(self):
         '''
-        Refresh optimization, prediction and evaluation status.
+        Refresh optimization, prediction and evaluation status (called by the event loop), then journal the state.
+        '''
+        with self.lock:
+            if not self.running: return
+            self._refresh()
+            self._save_state()
+
+    '''
+    Checkpoint
+    '''
+
+    def _get_state(self):
+        '''
+        Get the scheduler state to journal, i.e. the pending evaluations and the progress of auto mode.
         '''
+        state = {
+            'auto_scheduling': self.auto_scheduling,
+            'stop_criterion': [],
+            'eval_manual': _flatten_rowid(self.eval_workers_manual_run + self.eval_workers_manual_wait),
+            'eval_auto': _flatten_rowid(self.eval_workers_auto_run + self.eval_workers_auto_wait),
+            'n_optimizing_sample': self.n_optimizing_sample,
+        }
+        if self.auto_scheduling:
+            state['stop_criterion'] = [{'name': get_name(type(criterion)), 'value': criterion.value, 'state': criterion.get_state()} \
+                for criterion in self.stop_criterion]
+        return state
+
+    def _save_state(self):
+        '''
+        Journal the scheduler state to the database.
+        '''
+        if self.config is None or not self.agent.check_table_exist(): return
+        try:
+            self.agent.db.update_scheduler_state(self.agent.table_name, self._get_state())
+        except Exception as e:
+            self.logger.add(f'failed to save scheduler state: {e}')
+
+    def _resume_state(self):
+        '''
+        Reconcile rows left by an interrupted run with the journaled state, re-enqueue pending evaluations and resume auto mode.
+        '''
+        state = self.agent.db.query_scheduler_state(self.agent.table_name)
+        if state is None: return
+
+        status, Y = self.agent.load(['status', 'Y'])
+        unfinished = lambda rowid: rowid <= len(Y) and np.isnan(Y[rowid - 1]).any() and status[rowid - 1] != 'failed'
+        rowids_manual = [rowid for rowid in state['eval_manual'] if unfinished(rowid)]
+        rowids_auto = [rowid for rowid in state['eval_auto'] if unfinished(rowid)]
+
+        # rows marked as evaluating without being journaled are not running anymore
+        rowids_pending = rowids_manual + rowids_auto if self.agent.can_eval else []
+        rowids_stale = [rowid for rowid in (np.where(status == 'evaluating')[0] + 1).tolist() if rowid not in rowids_pending]
+        if len(rowids_stale) > 0:
+            self.agent.reset_evaluation(rowids_stale)
+        if not self.agent.can_eval: return
+
+        # re-enqueue pending evaluations
+        if len(rowids_manual) > 0:
+            self.logger.add(f'resuming evaluation for row {_rowid_str(rowids_manual)}')
+            self.evaluate_manual(rowids_manual)
+        if len(rowids_auto) > 0:
+            self.logger.add(f'resuming evaluation for row {_rowid_str(rowids_auto)}')
+            self.evaluate_auto(rowids_auto)
+
+        # resume auto mode with the progress of stopping criteria
+        if state['auto_scheduling'] and self.agent.check_initialized():
+            self.stop_criterion = []
+            for criterion_state in state['stop_criterion']:
+                criterion = get_stop_criterion(criterion_state['name'])(self.agent, criterion_state['value'])
+                criterion.start()
+                criterion.set_state(criterion_state['state'])
+                self.stop_criterion.append(criterion)
+            self.auto_scheduling = True
+            self.logger.add('auto mode resumed')
+
+            # re-launch the optimization lost by the interruption
+            n_evaluating_sample = _count_rowid(self.eval_workers_manual_run + self.eval_workers_manual_wait) + \
+                _count_rowid(self.eval_workers_auto_run + self.eval_workers_auto_wait)
+            batch_size = self.config['experiment']['batch_size'] + self.config['experiment'].get('n_pipeline', 0) - n_evaluating_sample
+            if batch_size > 0:
+                self._optimize(batch_size=batch_size)
+
+    def _refresh(self):
+        '''
+        Refresh optimization, prediction and evaluation status and launch follow-up work.
+        '''
+        if self.config is None: return
+
         opt_rowids = self._refresh_optimize()
         opt_finished = opt_rowids != []
         pred_finished = self._refresh_predict()
@@ -461,24 +972,39 @@ class OptimizeScheduler:
                 self.evaluate_auto(opt_rowids)
             else:
                 self.evaluate_manual(opt_rowids)
+            # launch the evaluations immediately
+            eval_manual_finished_, eval_auto_finished_ = self._refresh_evaluate()
+            eval_manual_finished = eval_manual_finished or eval_manual_finished_
+            eval_auto_finished = eval_auto_finished or eval_auto_finished_
 
         if self.auto_scheduling and eval_auto_finished:
             for criterion in self.stop_criterion:
                 stop = criterion.check()
                 self.auto_scheduling = self.auto_scheduling and (not stop)
 
+            n_pipeline = self.config['experiment'].get('n_pipeline', 0)
             if self.auto_scheduling:
-                n_running_eval_workers = len(self.eval_workers_manual_run) + len(self.eval_workers_auto_run)
-                batch_size = self.config['experiment']['batch_size'] - n_running_eval_workers - self.n_optimizing_sample
+                # with pipelining, the freed workers have already started the designs proposed ahead,
+                # so the refill is proposed in background without leaving workers idle
+                batch_size = self._get_auto_batch_size()
                 if batch_size > 0:
                     self._optimize(batch_size=batch_size)
-                elif batch_size == 0:
+                elif batch_size == 0 or n_pipeline > 0:
                     pass
                 else:
                     raise Exception('number of running evaluation workers exceeds the maximum set')
             else:
                 self.logger.add('stopping criterion met')
+                if n_pipeline > 0 and self.eval_workers_auto_wait != []:
+                    rowids = _flatten_rowid(self.eval_workers_auto_wait)
+                    self.eval_workers_auto_wait = []
+                    self.logger.add(f'designs proposed ahead for row {_rowid_str(rowids)} are left unevaluated')
 
+    '''
+    Stopping
+    '''
+
+    @scheduler_command
     def stop_optimize(self):
         '''
         Stop the running optimization worker.
@@ -493,6 +1019,7 @@ class OptimizeScheduler:
         self.opt_workers = []
         self.n_optimizing_sample = 0
 
+    @scheduler_command
     def stop_predict(self):
         '''
         Stop the running prediction worker(s).
@@ -505,6 +1032,7 @@ class OptimizeScheduler:
 
         self.pred_workers = []
 
+    @scheduler_command
     def stop_evaluate_manual(self, rowid=None):
         '''
         Stop the running manual evaluation worker(s).
@@ -514,36 +1042,9 @@ class OptimizeScheduler:
         rowid: list
             Row numbers of the manual evaluations to be stopped (if None then stop all manual workers).
         '''
-        stop_all = rowid is None
-        worker_run_stopped = None
-        worker_wait_stopped = None
-
-        # stop running workers
-        for worker_info in self.eval_workers_manual_run:
-            worker, rowid_ = worker_info
-            if (stop_all or rowid_ == rowid) and worker.is_alive():
-                worker.terminate()
-                self.logger.add(f'evaluation for row {rowid_} stopped')
-                if not stop_all:
-                    worker_run_stopped = worker_info
-                    break
-        
-        # stop waiting workers
-        for worker_info in self.eval_workers_manual_wait:
-            worker, rowid_ = worker_info
-            if not stop_all and rowid_ == rowid:
-                worker_wait_stopped = worker_info
-                break
-        
-        if stop_all:
-            self.eval_workers_manual_run = []
-            self.eval_workers_manual_wait = []
-        else:
-            if worker_run_stopped is not None:
-                self.eval_workers_manual_run.remove(worker_run_stopped)
-            if worker_wait_stopped is not None:
-                self.eval_workers_manual_wait.remove(worker_wait_stopped)
+        stop_eval_workers(self.eval_workers_manual_run, self.eval_workers_manual_wait, self.logger, self.agent, rowid)
 
+    @scheduler_command
     def stop_evaluate_auto(self, rowid=None):
         '''
         Stop the running auto evaluation worker(s).
@@ -555,35 +1056,7 @@ class OptimizeScheduler:
         '''
         self.auto_scheduling = False
 
-        stop_all = rowid is None
-        worker_run_stopped = None
-        worker_wait_stopped = None
-
-        # stop running workers
-        for worker_info in self.eval_workers_auto_run:
-            worker, rowid_ = worker_info
-            if (stop_all or rowid_ == rowid) and worker.is_alive():
-                worker.terminate()
-                self.logger.add(f'evaluation for row {rowid_} stopped')
-                if not stop_all:
-                    worker_run_stopped = worker_info
-                    break
-        
-        # stop waiting workers
-        for worker_info in self.eval_workers_auto_wait:
-            worker, rowid_ = worker_info
-            if not stop_all and rowid_ == rowid:
-                worker_wait_stopped = worker_info
-                break
-        
-        if stop_all:
-            self.eval_workers_auto_run = []
-            self.eval_workers_auto_wait = []
-        else:
-            if worker_run_stopped is not None:
-                self.eval_workers_auto_run.remove(worker_run_stopped)
-            if worker_wait_stopped is not None:
-                self.eval_workers_auto_wait.remove(worker_wait_stopped)
+        stop_eval_workers(self.eval_workers_auto_run, self.eval_workers_auto_wait, self.logger, self.agent, rowid)
 
     def stop_evaluate(self, rowid=None):
         '''
@@ -597,6 +1070,7 @@ class OptimizeScheduler:
         self.stop_evaluate_manual(rowid=rowid)
         self.stop_evaluate_auto(rowid=rowid)
 
+    @scheduler_command
     def stop_all(self):
         '''
         Stop all workers.
@@ -607,6 +1081,14 @@ class OptimizeScheduler:
 
     def quit(self):
         '''
-        Quit the scheduler.
+        Quit the scheduler, the state before quitting is journaled so that it can be resumed next time.
         '''
+        with self.lock:
+            self._save_state()
+            self.running = False
         self.stop_all()
+        with self.lock:
+            self.eval_pool.quit()
+            if self.eval_broker is not None:
+                self.eval_broker.quit()
+        self._notify()
@@ -9,14 +9,17 @@ class StopCriterion:
     '''
     Base class of stopping criterion.
     '''
-    def __init__(self, agent, *args, **kwargs):
+    def __init__(self, agent, value=None, *args, **kwargs):
         '''
         Parameters
         ----------
         agent: autooed.system.agent.LoadAgent
             Agent that talks to algorithms and database.
+        value: object
+            Value of the criterion given by user.
         '''
         self.agent = agent
+        self.value = value
         self.started = False
 
     def start(self):
@@ -37,6 +40,18 @@ class StopCriterion:
         '''
         return None
 
+    def get_state(self):
+        '''
+        Get the progress of the criterion as a dict, for checkpointing.
+        '''
+        return {}
+
+    def set_state(self, state):
+        '''
+        Restore the progress of the criterion from a checkpoint (after start).
+        '''
+        pass
+
 
 class TimeStopCriterion(StopCriterion):
     '''
@@ -51,7 +66,7 @@ class TimeStopCriterion(StopCriterion):
         max_time: float
             Maximum time (in seconds).
         '''
-        super().__init__(agent)
+        super().__init__(agent, max_time)
         self.start_time = None
         self.max_time = max_time
 
@@ -69,6 +84,15 @@ class TimeStopCriterion(StopCriterion):
             return self.max_time
         return self.max_time - (time() - self.start_time)
 
+    def get_state(self):
+        if not self.started:
+            return {}
+        return {'elapsed_time': time() - self.start_time}
+
+    def set_state(self, state):
+        if 'elapsed_time' in state:
+            self.start_time = time() - state['elapsed_time']
+
 
 class NIterStopCriterion(StopCriterion):
     '''
@@ -83,7 +107,7 @@ class NIterStopCriterion(StopCriterion):
         max_iter: int
             Maximum iteration of optimization.
         '''
-        super().__init__(agent)
+        super().__init__(agent, max_iter)
         self.n_iter = None
         self.max_iter = max_iter
 
@@ -102,6 +126,12 @@ class NIterStopCriterion(StopCriterion):
             return self.max_iter
         return self.max_iter - self.n_iter
 
+    def get_state(self):
+        return {'n_iter': self.n_iter}
+
+    def set_state(self, state):
+        self.n_iter = state.get('n_iter', self.n_iter)
+
 
 class NSampleStopCriterion(StopCriterion):
     '''
@@ -116,7 +146,7 @@ class NSampleStopCriterion(StopCriterion):
         max_sample: int
             Maximum number of samples.
         '''
-        super().__init__(agent)
+        super().__init__(agent, max_sample)
         self.max_sample = max_sample
 
     def check(self):
@@ -143,7 +173,7 @@ class HVConvStopCriterion(StopCriterion):
             Maximum iteration for measuring the hypervolume convergence. 
             I.e., convergence happens if hypervolume stops to improve for max_iter iterations.
         '''
-        super().__init__(agent)
+        super().__init__(agent, max_iter)
         n_obj = agent.problem_cfg['n_obj']
         assert n_obj > 1, 'Hypervolume convergence stopping criterion only works for n_obj > 1'
         self.last_hv = None
@@ -171,6 +201,13 @@ class HVConvStopCriterion(StopCriterion):
     def load(self):
         return self.max_iter
 
+    def get_state(self):
+        return {'last_hv': None if self.last_hv is None else float(self.last_hv), 'n_iter': self.n_iter}
+
+    def set_state(self, state):
+        self.last_hv = state.get('last_hv', self.last_hv)
+        self.n_iter = state.get('n_iter', self.n_iter)
+
 
 class OptStopCriterion(StopCriterion):
     '''
@@ -185,7 +222,7 @@ class OptStopCriterion(StopCriterion):
         optimum: float
             Optimum value.
         '''
-        super().__init__(agent)
+        super().__init__(agent, optimum)
         n_obj = agent.problem_cfg['n_obj']
         assert n_obj == 1, 'Optimum stopping criterion only works for n_obj == 1'
         self.obj_type = self.agent.problem_cfg['obj_type']
@@ -221,7 +258,7 @@ class OptConvStopCriterion(StopCriterion):
             Maximum iteration for measuring the optimum convergence. 
             I.e., convergence happens if optimum stops to improve for max_iter iterations.
         '''
-        super().__init__(agent)
+        super().__init__(agent, max_iter)
         n_obj = agent.problem_cfg['n_obj']
         assert n_obj == 1, 'Optimum convergence stopping criterion only works for n_obj == 1'
         self.last_optimum = None
@@ -249,6 +286,13 @@ class OptConvStopCriterion(StopCriterion):
     def load(self):
         return self.max_iter
 
+    def get_state(self):
+        return {'last_optimum': None if self.last_optimum is None else float(self.last_optimum), 'n_iter': self.n_iter}
+
+    def set_state(self, state):
+        self.last_optimum = state.get('last_optimum', self.last_optimum)
+        self.n_iter = state.get('n_iter', self.n_iter)
+
 
 def get_stop_criterion(name):
     '''
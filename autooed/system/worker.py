@@ -0,0 +1,274 @@
+'''
+Pool of long-lived evaluation workers that avoid spawning a process and building the problem for every evaluation.
+'''
+
+import traceback
+from time import time
+from multiprocessing import Process, Queue, Pipe
+
+from autooed.problem import build_problem
+
+
+def _evaluate_loop(agent, eval_func, task_queue, done_conn):
+    '''
+    Main loop of an evaluation worker: build the problem once, then evaluate the row numbers received from the task queue.
+
+    Parameters
+    ----------
+    agent: autooed.system.agent.EvaluateAgent
+        Agent that talks to algorithms and database.
+    eval_func: function
+        Provided evaluation function (if None then use the problem's evaluation function).
+    task_queue: multiprocessing.Queue
+        Queue of row number(s) to evaluate (None for quitting).
+    done_conn: multiprocessing.connection.Connection
+        Connection for sending row number(s) of finished evaluations and the error message (None if succeeded).
+    '''
+    problem = build_problem(agent.problem_cfg['name']) if eval_func is None else None
+
+    while True:
+        rowid = task_queue.get()
+        if rowid is None: break
+        error = None
+        try:
+            if isinstance(rowid, list):
+                agent.evaluate_batch(rowid, problem=problem)
+            else:
+                agent.evaluate(rowid, eval_func, problem=problem)
+        except Exception as e:
+            traceback.print_exc()
+            error = f'{type(e).__name__}: {e}'
+        done_conn.send((rowid, error))
+
+
+class EvaluateWorker:
+    '''
+    Long-lived evaluation worker process.
+    '''
+    def __init__(self, agent, eval_func):
+        '''
+        Parameters
+        ----------
+        agent: autooed.system.agent.EvaluateAgent
+            Agent that talks to algorithms and database.
+        eval_func: function
+            Provided evaluation function.
+        '''
+        self.eval_func = eval_func
+        self.task_queue = Queue()
+        self.done_conn, done_conn_child = Pipe(duplex=False)
+        self.process = Process(target=_evaluate_loop, args=(agent, eval_func, self.task_queue, done_conn_child), daemon=True)
+        self.process.start()
+        self.task = None
+
+    def poll(self):
+        '''
+        Check if the current task is finished and release it.
+        '''
+        if self.task is None: return
+        finished = False
+        while self.done_conn.poll():
+            try:
+                _, self.task.error = self.done_conn.recv()
+            except EOFError:
+                break
+            finished = True
+        if not finished and not self.process.is_alive():
+            self.task.error = 'evaluation worker exited unexpectedly'
+            finished = True
+        if finished:
+            self.task.finished = True
+            self.task = None
+
+    def submit(self, task):
+        '''
+        Send a task to the worker.
+        '''
+        self.task = task
+        self.task_queue.put(task.rowid)
+
+    def is_idle(self):
+        '''
+        Check if the worker has no task assigned.
+        '''
+        return self.task is None
+
+    def is_alive(self):
+        '''
+        Check if the worker process is alive.
+        '''
+        return self.process.is_alive()
+
+    def quit(self):
+        '''
+        Quit the worker gracefully after the current task.
+        '''
+        self.task_queue.put(None)
+
+    def terminate(self):
+        '''
+        Terminate the worker immediately.
+        '''
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class EvaluateTask:
+    '''
+    Evaluation task with the same interface as multiprocessing.Process (start, is_alive, terminate), executed by a worker in the pool.
+    '''
+    def __init__(self, pool, rowid, eval_func=None, n_retry=0):
+        '''
+        Parameters
+        ----------
+        pool: autooed.system.worker.EvaluateWorkerPool
+            Worker pool executing the task.
+        rowid: int/list
+            Row number(s) to evaluate.
+        eval_func: function
+            Provided evaluation function.
+        n_retry: int
+            Number of times this evaluation has been retried.
+        '''
+        self.pool = pool
+        self.rowid = rowid
+        self.eval_func = eval_func
+        self.n_retry = n_retry
+        self.priority = 0.0
+        self.started = False
+        self.finished = False
+        self.start_time = None
+        self.error = None
+
+    def start(self):
+        '''
+        Start the task on an idle worker.
+        '''
+        self.started = True
+        self.start_time = time()
+        self.pool.submit(self)
+
+    def get_running_time(self):
+        '''
+        Get the time (in seconds) since the task started.
+        '''
+        if self.start_time is None: return 0.0
+        return time() - self.start_time
+
+    def is_alive(self):
+        '''
+        Check if the task is still running.
+        '''
+        if not self.started or self.finished:
+            return False
+        self.pool.poll()
+        return not self.finished
+
+    def terminate(self):
+        '''
+        Stop the task by terminating the worker running it (a new worker will be spawned when needed).
+        '''
+        if self.started and not self.finished:
+            self.pool.terminate(self)
+        self.finished = True
+
+
+class EvaluateWorkerPool:
+    '''
+    Pool of long-lived evaluation workers, grown on demand up to the number of concurrently started tasks.
+    '''
+    def __init__(self, agent):
+        '''
+        Parameters
+        ----------
+        agent: autooed.system.agent.EvaluateAgent
+            Agent that talks to algorithms and database.
+        '''
+        self.agent = agent
+        self.workers = []
+
+    def create_task(self, rowid, eval_func=None, n_retry=0):
+        '''
+        Create an evaluation task to be started later.
+
+        Parameters
+        ----------
+        rowid: int/list
+            Row number(s) to evaluate.
+        eval_func: function
+            Provided evaluation function.
+        n_retry: int
+            Number of times this evaluation has been retried.
+
+        Returns
+        -------
+        EvaluateTask
+            The evaluation task.
+        '''
+        return EvaluateTask(self, rowid, eval_func, n_retry)
+
+    def _get_idle_worker(self, eval_func):
+        '''
+        Get an idle worker with the same evaluation function, spawn a new one if not available.
+        '''
+        idle_workers = [worker for worker in self.workers if worker.is_idle()]
+        for worker in idle_workers:
+            if worker.eval_func is eval_func:
+                return worker
+
+        # replace an idle worker with a different evaluation function if any
+        if len(idle_workers) > 0:
+            idle_workers[0].quit()
+            self.workers.remove(idle_workers[0])
+
+        worker = EvaluateWorker(self.agent, eval_func)
+        self.workers.append(worker)
+        return worker
+
+    def submit(self, task):
+        '''
+        Submit a task to an idle worker.
+        '''
+        self.poll()
+        worker = self._get_idle_worker(task.eval_func)
+        worker.submit(task)
+
+    def poll(self):
+        '''
+        Collect finished tasks from workers.
+        '''
+        for worker in self.workers.copy():
+            worker.poll()
+            # clean up workers that died unexpectedly
+            if not worker.is_alive():
+                self.workers.remove(worker)
+
+    def get_wait_objects(self):
+        '''
+        Get objects that become ready when a running task finishes, for multiprocessing.connection.wait().
+        '''
+        objects = []
+        for worker in self.workers:
+            if not worker.is_idle():
+                objects.extend([worker.done_conn, worker.process.sentinel])
+        return objects
+
+    def terminate(self, task):
+        '''
+        Terminate the worker running the given task.
+        '''
+        for worker in self.workers:
+            if worker.task is task:
+                worker.terminate()
+                self.workers.remove(worker)
+                break
+
+    def quit(self):
+        '''
+        Terminate all workers.
+        '''
+        for worker in self.workers:
+            if worker.task is not None:
+                worker.task.finished = True
+            worker.terminate()
+        self.workers = []
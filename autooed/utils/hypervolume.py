@@ -0,0 +1,338 @@
+'''
+Hypervolume computation (for minimization), exact by sweeping for 2 and 3 objectives and by WFG for up to 6 objectives,
+and approximated by Monte Carlo sampling for more objectives.
+'''
+
+from bisect import bisect_left
+from heapq import heapify, heappush, heappop
+import numpy as np
+
+
+# maximum number of objectives for exact hypervolume computation
+MAX_EXACT_N_OBJ = 6
+
+
+def _get_valid_points(Y, ref_point):
+    '''
+    Get the points that strictly dominate the reference point, other points contribute no hypervolume.
+    '''
+    Y = np.array(Y, dtype=float)
+    if Y.size == 0:
+        return np.empty((0, len(ref_point)))
+    Y = np.atleast_2d(Y)
+    return Y[(Y < ref_point).all(axis=1)]
+
+
+def find_nondominated(Y):
+    '''
+    Find the unique non-dominated points (for minimization).
+
+    Parameters
+    ----------
+    Y: np.array
+        Performance values, shape = (n, n_obj).
+
+    Returns
+    -------
+    np.array
+        Non-dominated points.
+    '''
+    if len(Y) <= 1: return Y
+    Y = np.unique(Y, axis=0)
+    # a point can only be dominated by points with smaller sum
+    Y = Y[np.argsort(Y.sum(axis=1), kind='stable')]
+    keep = np.ones(len(Y), dtype=bool)
+    for i in range(len(Y)):
+        if not keep[i]: continue
+        keep[i + 1:] &= ~(Y[i] <= Y[i + 1:]).all(axis=1)
+    return Y[keep]
+
+
+def _hv_2d(Y, ref_point):
+    '''
+    2D hypervolume by sweeping along the first objective, O(n log n).
+    '''
+    Y = Y[np.lexsort((Y[:, 1], Y[:, 0]))]
+    # running minimum of the second objective gives the staircase of non-dominated points
+    y_min = np.minimum.accumulate(Y[:, 1])
+    y_prev = np.concatenate([[ref_point[1]], y_min[:-1]])
+    return np.sum((ref_point[0] - Y[:, 0]) * np.maximum(y_prev - y_min, 0.0))
+
+
+def _hv_3d(Y, ref_point):
+    '''
+    3D hypervolume by sweeping along the third objective while maintaining the 2D staircase of the swept points, O(n log n) searches.
+    '''
+    Y = Y[np.argsort(Y[:, 2], kind='stable')]
+    rx, ry, rz = ref_point
+    xs, ys = [], [] # staircase sorted by increasing x (and decreasing y)
+    area, volume = 0.0, 0.0
+
+    def contribution(i, x_next):
+        return (x_next - xs[i]) * (ry - ys[i])
+
+    for k in range(len(Y)):
+        px, py, pz = Y[k]
+        i = bisect_left(xs, px)
+
+        # skip if dominated by the left neighbor in 2D
+        if not (i > 0 and ys[i - 1] <= py):
+            # points dominated by the new point in 2D are contiguous after it
+            j = i
+            while j < len(xs) and ys[j] >= py:
+                j += 1
+            x_right = xs[j] if j < len(xs) else rx
+
+            # old contribution of the left neighbor and removed points, replaced by the new ones
+            old_area, new_area = 0.0, (x_right - px) * (ry - py)
+            if i > 0:
+                old_area += contribution(i - 1, xs[i] if i < len(xs) else rx)
+                new_area += contribution(i - 1, px)
+            for m in range(i, j):
+                old_area += contribution(m, xs[m + 1] if m + 1 < len(xs) else rx)
+            area += new_area - old_area
+
+            xs[i:j], ys[i:j] = [px], [py]
+
+        z_next = Y[k + 1, 2] if k + 1 < len(Y) else rz
+        volume += area * (z_next - pz)
+
+    return volume
+
+
+def _hv_exact(Y, ref_point):
+    '''
+    Exact hypervolume of valid points.
+    '''
+    n_obj = len(ref_point)
+    if len(Y) == 0:
+        return 0.0
+    elif n_obj == 1:
+        return float(ref_point[0] - np.min(Y[:, 0]))
+    elif n_obj == 2:
+        return float(_hv_2d(Y, ref_point))
+    elif n_obj == 3:
+        return float(_hv_3d(Y, ref_point))
+    else:
+        return float(_hv_wfg(find_nondominated(Y), ref_point))
+
+
+def _hv_wfg(Y, ref_point):
+    '''
+    Hypervolume by the WFG algorithm, where the points are sorted by the last objective in decreasing order,
+    so that the limit set of each point has a constant last objective and the recursion drops one dimension.
+    Reference: While, Lyndon, et al. "A fast way of calculating exact hypervolumes." IEEE TEVC 16.1 (2011): 86-95.
+    '''
+    if len(Y) == 0:
+        return 0.0
+    if len(Y) == 1:
+        return np.prod(ref_point - Y[0])
+
+    Y = Y[np.argsort(-Y[:, -1], kind='stable')]
+    volume = 0.0
+    for k in range(len(Y)):
+        # inclusive hypervolume of the point minus the part dominated by the points with better last objective
+        incl = np.prod(ref_point - Y[k])
+        if k + 1 < len(Y):
+            limit_set = np.maximum(Y[k + 1:, :-1], Y[k, :-1])
+            limit_set = limit_set[(limit_set < ref_point[:-1]).all(axis=1)]
+            depth = ref_point[-1] - Y[k, -1]
+            if len(ref_point) - 1 <= 3:
+                incl -= depth * _hv_exact(limit_set, ref_point[:-1])
+            else:
+                incl -= depth * _hv_wfg(find_nondominated(limit_set), ref_point[:-1])
+        volume += incl
+    return volume
+
+
+def calc_hypervolume_mc(Y, ref_point, n_sample=100000, seed=None, batch_size=10000):
+    '''
+    Estimate hypervolume by Monte Carlo sampling in the bounding box of the points and the reference point.
+
+    Parameters
+    ----------
+    Y: np.array
+        Performance values (minimization), shape = (n, n_obj).
+    ref_point: np.array
+        Reference point.
+    n_sample: int
+        Number of Monte Carlo samples.
+    seed: int
+        Random seed.
+    batch_size: int
+        Number of samples checked at once.
+
+    Returns
+    -------
+    hv: float
+        Estimated hypervolume.
+    error: float
+        Standard error of the estimate (the true value lies within 2 * error with about 95% probability).
+    '''
+    ref_point = np.array(ref_point, dtype=float)
+    Y = find_nondominated(_get_valid_points(Y, ref_point))
+    if len(Y) == 0:
+        return 0.0, 0.0
+
+    lower = np.min(Y, axis=0)
+    box_volume = np.prod(ref_point - lower)
+    rng = np.random.default_rng(seed)
+
+    n_dominated = 0
+    for start in range(0, n_sample, batch_size):
+        samples = rng.uniform(lower, ref_point, size=(min(batch_size, n_sample - start), len(ref_point)))
+        dominated = np.zeros(len(samples), dtype=bool)
+        for y in Y:
+            dominated |= (y <= samples).all(axis=1)
+        n_dominated += np.sum(dominated)
+
+    p = n_dominated / n_sample
+    return box_volume * p, box_volume * np.sqrt(p * (1.0 - p) / n_sample)
+
+
+def calc_hypervolume(Y, ref_point, n_mc_sample=100000, seed=None):
+    '''
+    Calculate hypervolume of points with respect to a reference point (minimization),
+    exact for at most MAX_EXACT_N_OBJ objectives, Monte Carlo estimate otherwise.
+
+    Parameters
+    ----------
+    Y: np.array
+        Performance values (minimization), shape = (n, n_obj).
+    ref_point: np.array
+        Reference point.
+    n_mc_sample: int
+        Number of Monte Carlo samples when the exact computation is not used.
+    seed: int
+        Random seed of Monte Carlo sampling.
+
+    Returns
+    -------
+    float
+        Hypervolume.
+    '''
+    ref_point = np.array(ref_point, dtype=float).flatten()
+    if len(ref_point) > MAX_EXACT_N_OBJ:
+        return calc_hypervolume_mc(Y, ref_point, n_sample=n_mc_sample, seed=seed)[0]
+    return _hv_exact(_get_valid_points(Y, ref_point), ref_point)
+
+
+def calc_hypervolume_contribution(y, Y, ref_point):
+    '''
+    Calculate the exclusive hypervolume contribution of a point to a set of points (minimization),
+    i.e., the hypervolume of the box between the point and the reference point minus the part already dominated by the set.
+
+    Parameters
+    ----------
+    y: np.array
+        Performance of the point, shape = (n_obj,).
+    Y: np.array
+        Performance of the set of points, shape = (n, n_obj).
+    ref_point: np.array
+        Reference point.
+
+    Returns
+    -------
+    float
+        Hypervolume contribution.
+    '''
+    ref_point = np.array(ref_point, dtype=float).flatten()
+    y = np.array(y, dtype=float).flatten()
+    if not (y < ref_point).all(): return 0.0
+    Y = _get_valid_points(Y, ref_point)
+    if (Y <= y).all(axis=1).any(): return 0.0
+    # the part of the box dominated by the set is the hypervolume of the limit set
+    limit_set = np.maximum(Y, y)
+    return float(np.prod(ref_point - y) - calc_hypervolume(limit_set, ref_point))
+
+
+def greedy_hypervolume_selection(Y, Y_candidate, ref_point, batch_size, costs=None, labels=None):
+    '''
+    Greedily select candidates that maximize the hypervolume contribution (per unit cost if costs are given) to the current points and the selected candidates.
+    Contributions can only decrease as more points are selected (submodularity), so outdated contributions are upper bounds
+    and only the candidate on top of the priority queue needs to be re-evaluated (lazy greedy).
+    Candidates dominated by the current points never contribute, thus are pruned up front.
+
+    Parameters
+    ----------
+    Y: np.array
+        Performance of the current points (minimization), shape = (n, n_obj).
+    Y_candidate: np.array
+        Performance of the candidates (minimization), shape = (n_candidate, n_obj).
+    ref_point: np.array
+        Reference point.
+    batch_size: int
+        Number of candidates to select (at most n_candidate).
+    costs: np.array
+        Positive costs of the candidates, shape = (n_candidate,). If None then contributions are not divided by costs.
+    labels: np.array
+        Family labels of the candidates, shape = (n_candidate,). If given then candidates are selected in cycles,
+        where each family can be selected at most once per cycle, and a new cycle starts when all remaining candidates are visited.
+
+    Returns
+    -------
+    list
+        Indices of the selected candidates, in the order of selection.
+        If no remaining candidate contributes, a random one (or the cheapest one if costs are given) is selected.
+    '''
+    ref_point = np.array(ref_point, dtype=float).flatten()
+    Y_candidate = np.array(Y_candidate, dtype=float).reshape(-1, len(ref_point))
+    n_candidate = len(Y_candidate)
+    if labels is not None: labels = np.array(labels)
+    front = find_nondominated(_get_valid_points(Y, ref_point))
+
+    # prune candidates that cannot contribute, since the current points only grow
+    valid = (Y_candidate < ref_point).all(axis=1)
+    if len(front) > 0:
+        valid_idx = np.where(valid)[0]
+        for start in range(0, len(valid_idx), 1000):
+            idx = valid_idx[start:start + 1000]
+            valid[idx] = ~(front[None, :, :] <= Y_candidate[idx, None, :]).all(axis=2).any(axis=1)
+
+    # priority queue of (-upper bound of contribution, index, front version when the contribution was computed)
+    queue = [(-np.inf, i, -1) for i in np.where(valid)[0]]
+    heapify(queue)
+    version = 0
+
+    selected = np.zeros(n_candidate, dtype=bool)
+    visited = np.zeros(n_candidate, dtype=bool) # candidates of families visited in the current cycle
+    next_indices = []
+
+    for _ in range(min(batch_size, n_candidate)):
+        if labels is not None and (selected | visited).all():
+            visited[:] = False # start a new cycle
+
+        best_idx = -1
+        deferred = [] # entries of visited families, kept for later cycles
+        while len(queue) > 0:
+            neg_value, i, i_version = heappop(queue)
+            if selected[i]: continue
+            if visited[i]:
+                deferred.append((neg_value, i, i_version))
+                continue
+            if i_version == version: # up-to-date contribution is the largest
+                best_idx = i
+                break
+            value = calc_hypervolume_contribution(Y_candidate[i], front, ref_point)
+            if costs is not None: value /= costs[i]
+            if value > 0: # candidates without contribution are dropped
+                heappush(queue, (-value, i, version))
+        for entry in deferred:
+            heappush(queue, entry)
+
+        if best_idx == -1: # no remaining candidate contributes
+            choices = np.where(~(selected | visited))[0]
+            best_idx = choices[np.argmin(costs[choices])] if costs is not None else np.random.choice(choices)
+
+        selected[best_idx] = True
+        next_indices.append(best_idx)
+        if labels is not None:
+            visited[labels == labels[best_idx]] = True
+
+        # update the current non-dominated points
+        y = Y_candidate[best_idx]
+        if (y < ref_point).all() and not (front <= y).all(axis=1).any():
+            front = np.vstack([front[~(y <= front).all(axis=1)], y])
+            version += 1
+
+    return next_indices
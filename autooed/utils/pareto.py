@@ -4,7 +4,8 @@ Pareto-related tools.
 
 import numpy as np
 from collections.abc import Iterable
-from pymoo.performance_indicator.hv import Hypervolume
+
+from autooed.utils import hypervolume
 
 
 def convert_minimization(Y, obj_type=None):
@@ -68,7 +69,7 @@ def calc_hypervolume(Y, ref_point, obj_type=None):
     '''
     Y = convert_minimization(Y, obj_type)
 
-    return Hypervolume(ref_point=ref_point).calc(Y)
+    return hypervolume.calc_hypervolume(Y, ref_point)
 
 
 def calc_pred_error(Y, Y_pred_mean, average=False):
@@ -2,9 +2,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 from mpl_toolkits.mplot3d import Axes3D
-from pymoo.factory import get_performance_indicator
 
 from autooed.utils.pareto import convert_minimization
+from autooed.utils.hypervolume import calc_hypervolume
 
 
 def parallel_transform(Y):
@@ -59,10 +59,9 @@ def plot_performance_metric(Y, obj_type):
     elif Y.shape[1] > 1:
         Y = convert_minimization(Y, obj_type)
         ref_point = np.max(Y, axis=0)
-        indicator = get_performance_indicator('hv', ref_point=ref_point)
         hv_list = []
         for i in range(1, len(Y)):
-            hv = indicator.calc(Y[:i])
+            hv = calc_hypervolume(Y[:i], ref_point)
             hv_list.append(hv)
         plt.plot(np.arange(1, len(Y)), hv_list)
         plt.title('Hypervolume')
@@ -0,0 +1,148 @@
+'''
+Round trip of remote evaluation on localhost: start a broker on 127.0.0.1 for a temporary ZDT1 experiment, connect one remote worker,
+evaluate a batch and a single row, stop a running evaluation, then kill the worker in the middle of an evaluation and check that the row ends up failed.
+The temporary experiment is removed from the database afterwards.
+
+Usage: python examples/remote_worker_localhost.py
+'''
+
+import os
+import sys
+import socket
+import numpy as np
+from time import time, sleep
+from multiprocessing import Process, Value
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autooed.system.config import complete_config
+from autooed.system.database import Database
+from autooed.system.agent import OptimizeAgent
+from autooed.system.broker import run_remote_worker
+from autooed.system.scheduler import Logger, check_eval_workers
+import autooed.system.broker as broker
+
+
+TABLE_NAME = '_remote_worker_localhost'
+AUTHKEY = 'remote_worker_localhost'
+TIMEOUT = 60
+
+
+def get_free_address():
+    '''
+    Get a free TCP address on localhost.
+    '''
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'127.0.0.1:{sock.getsockname()[1]}'
+
+
+def run_worker(address, n_hang):
+    '''
+    Remote worker whose next n_hang single-row evaluations hang until they are killed.
+    '''
+    evaluate = broker.evaluate
+
+    def hanging_evaluate(*args, **kwargs):
+        with n_hang.get_lock():
+            hang = n_hang.value > 0
+            if hang: n_hang.value -= 1
+        parent_pid = os.getppid()
+        while hang:
+            if os.getppid() != parent_pid: os._exit(1) # the worker is killed
+            sleep(0.1)
+        return evaluate(*args, **kwargs)
+
+    broker.evaluate = hanging_evaluate
+    run_remote_worker(address, AUTHKEY, poll_interval=0.2, log=lambda text: print(f'[worker] {text}', flush=True))
+
+
+def wait_until(condition, message):
+    '''
+    Wait until the condition holds, fail after timeout.
+    '''
+    start_time = time()
+    while not condition():
+        assert time() - start_time < TIMEOUT, f'timed out waiting until {message}'
+        sleep(0.05)
+
+
+def run_task(agent, eval_broker, logger, rowid):
+    '''
+    Evaluate row(s) through the broker as the scheduler does, return the task.
+    '''
+    task = eval_broker.create_task(rowid)
+    workers_run = [[task, rowid]]
+    task.start()
+    wait_until(lambda: check_eval_workers(workers_run, [], logger, agent) != [], f'evaluation for row {rowid} is completed')
+    return task
+
+
+def main():
+    config = complete_config({
+        'problem': {'name': 'ZDT1'},
+        'algorithm': {'name': 'tsemo'},
+        'experiment': {'n_random_sample': 6},
+    }, check=True)
+
+    database = Database()
+    if database.check_table_exist(name=TABLE_NAME):
+        database.remove_table(TABLE_NAME)
+    database.create_table(TABLE_NAME)
+
+    eval_broker, worker = None, None
+    n_hang = Value('i', 0)
+
+    try:
+        agent = OptimizeAgent(database, TABLE_NAME)
+        agent.set_config(config)
+        n_var = agent.problem_cfg['n_var']
+        rowids = agent.initialize(None, np.random.random((6, n_var)), None)
+
+        address = get_free_address()
+        eval_broker = broker.EvaluateBroker(agent, address, AUTHKEY, timeout=1)
+        logger = Logger()
+        worker = Process(target=run_worker, args=(address, n_hang))
+        worker.start()
+
+        # a batch and a single row
+        run_task(agent, eval_broker, logger, rowids[:3])
+        run_task(agent, eval_broker, logger, rowids[3])
+        Y, status = agent.load(['Y', 'status'], rowid=rowids[:4])
+        assert not np.isnan(Y).any() and (status == 'evaluated').all(), 'batch or single evaluation is not completed'
+        print('batch and single evaluations completed')
+
+        # stop a hanging evaluation, the worker must abandon it to take the next one
+        n_hang.value = 1
+        task = eval_broker.create_task(rowids[4])
+        task.start()
+        wait_until(lambda: task.start_time is not None, 'the hanging evaluation is picked up')
+        task.terminate()
+        run_task(agent, eval_broker, logger, rowids[4])
+        assert agent.load('status', rowid=rowids[4]) == 'evaluated', 'worker did not abandon the stopped evaluation'
+        print('stopped evaluation abandoned by the worker')
+
+        # kill the worker in the middle of an evaluation
+        n_hang.value = 1
+        task = eval_broker.create_task(rowids[5])
+        task.start()
+        wait_until(lambda: task.start_time is not None, 'the evaluation is picked up')
+        worker.kill()
+        workers_run = [[task, rowids[5]]]
+        wait_until(lambda: check_eval_workers(workers_run, [], logger, agent) != [], 'the killed evaluation is completed')
+        assert agent.load('status', rowid=rowids[5]) == 'failed', 'evaluation of the killed worker is not failed'
+        print(f'evaluation of the killed worker failed: {task.error}')
+
+    finally:
+        if worker is not None and worker.is_alive():
+            worker.kill()
+        if eval_broker is not None:
+            eval_broker.quit()
+        database.remove_table(TABLE_NAME)
+        database.quit()
+
+    print('remote evaluation round trip passed')
+
+
+if __name__ == '__main__':
+    main()
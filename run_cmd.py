@@ -27,7 +27,7 @@ if __name__ == '__main__':
 
     # generate initial random samples
     X = generate_random_initial_samples(problem, args.n_init_sample)
-    Y = np.array([problem.evaluate_objective(x) for x in X])
+    Y = problem.evaluate_objective_batch(X)
 
     # optimization
     while len(X) < args.n_total_sample:
@@ -36,7 +36,7 @@ if __name__ == '__main__':
         X_next = algorithm.optimize(X, Y, None, args.batch_size)
 
         # evaluate proposed samples
-        Y_next = np.array([problem.evaluate_objective(x) for x in X_next])
+        Y_next = problem.evaluate_objective_batch(X_next)
 
         # combine into dataset
         X = np.vstack([X, X_next])
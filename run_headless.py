@@ -0,0 +1,60 @@
+import os
+import warnings
+from argparse import ArgumentParser
+from pymoo.configuration import Configuration
+from multiprocessing import freeze_support
+
+from autooed.system.config import load_config
+from autooed.system.runner import HeadlessRunner
+
+
+def set_environment():
+    '''
+    Set environment variables
+    '''
+    os.environ['OMP_NUM_THREADS'] = '1'
+    warnings.filterwarnings('ignore')
+    Configuration.show_compile_hint = False
+
+
+def parse_stop_criterion(stop_criterion_list):
+    '''
+    Parse stopping criteria from a list of strings in "name=value" format
+    '''
+    stop_criterion = {}
+    for stop_criterion_str in stop_criterion_list:
+        assert '=' in stop_criterion_str, f'invalid stopping criterion {stop_criterion_str}, should be in "name=value" format'
+        name, value = stop_criterion_str.split('=', 1)
+        value = float(value)
+        stop_criterion[name] = int(value) if value.is_integer() else value
+    return stop_criterion
+
+
+def get_args():
+    '''
+    Get arguments from command line
+    '''
+    parser = ArgumentParser()
+
+    parser.add_argument('--name', type=str, required=True,
+        help='name of the experiment to create or resume')
+    parser.add_argument('--config', type=str, default=None,
+        help='path of the experiment config file (optional when resuming an existing experiment)')
+    parser.add_argument('--stop-criterion', type=str, nargs='+', required=True,
+        help='stopping criteria in "name=value" format, name can be time, n_iter, n_sample, hv_conv, opt, opt_conv')
+
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    set_environment()
+    args = get_args()
+    config = load_config(args.config) if args.config is not None else None
+    stop_criterion = parse_stop_criterion(args.stop_criterion)
+    HeadlessRunner(args.name, config, stop_criterion).run()
+
+
+if __name__ == '__main__':
+    freeze_support()
+    main()
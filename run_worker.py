@@ -0,0 +1,41 @@
+import os
+import warnings
+from argparse import ArgumentParser
+from pymoo.configuration import Configuration
+
+from autooed.system.broker import run_remote_worker
+
+
+def set_environment():
+    '''
+    Set environment variables
+    '''
+    os.environ['OMP_NUM_THREADS'] = '1'
+    warnings.filterwarnings('ignore')
+    Configuration.show_compile_hint = False
+
+
+def get_args():
+    '''
+    Get arguments from command line
+    '''
+    parser = ArgumentParser()
+
+    parser.add_argument('--address', type=str, required=True,
+        help='address of the evaluation broker, "host:port" for TCP socket, otherwise a path for Unix socket')
+    parser.add_argument('--authkey', type=str, default=os.environ.get('AUTOOED_BROKER_AUTHKEY'),
+        help='authentication key of the evaluation broker (default from environment variable AUTOOED_BROKER_AUTHKEY)')
+
+    args = parser.parse_args()
+    assert args.authkey is not None, 'authentication key of the evaluation broker is not provided'
+    return args
+
+
+def main():
+    set_environment()
+    args = get_args()
+    run_remote_worker(args.address, args.authkey)
+
+
+if __name__ == '__main__':
+    main()